@@ -0,0 +1,124 @@
+import argparse
+import random
+import time
+import networkx as nx
+import osmnx as ox
+from src.utils.graph_index import GraphIndex
+from src.classes.fleet import FleetState
+from src.classes.vehicle import Vehicle
+
+# ================== SETUP ==================
+GRAPH_FILE = "./data/simpl_balikpapan_kota_drive.graphml"
+
+
+class BenchShared:
+    paused = False
+    speed = 1.0
+
+    def __init__(self, index, fleet):
+        self.graph_index = index
+        self.fleet = fleet
+
+
+# ------------------ before: Vehicle.update per truk ------------------
+class LegacyTruck:
+    """Loop pergerakan lama Vehicle.update (per truk, path.index, dict edge lookup)"""
+
+    def __init__(self, G, path, speed):
+        self.G = G
+        self.path = path
+        self.current = path[0]
+        self.target_node = path[1]
+        self.progress = 0.0
+        self.speed = speed
+        self.daily_dist = 0.0
+        self.total_dist = 0.0
+
+    def update(self, dt, shared):
+        if not self.path or self.target_node is None:
+            return
+        if self.target_node not in self.path:
+            return
+
+        edge_data = self.G.get_edge_data(self.current, self.target_node)
+        if not edge_data:
+            return
+        length = edge_data[0].get("length", 1)
+
+        distance = self.speed * shared.speed * dt
+        self.progress += distance / length
+        self.daily_dist += distance / 1000
+        self.total_dist += distance / 1000
+
+        if self.progress >= 1.0:
+            idx = self.path.index(self.target_node)
+            self.current = self.target_node
+            if idx + 1 < len(self.path):
+                self.target_node = self.path[idx + 1]
+            else:
+                self.target_node = None
+                self.path = []
+            self.progress = 0.0
+
+
+def random_paths(G, count, min_len):
+    nodes = list(G.nodes())
+    paths = []
+    while len(paths) < count:
+        try:
+            path = nx.shortest_path(G, random.choice(nodes), random.choice(nodes))
+        except nx.NetworkXNoPath:
+            continue
+        if len(path) >= min_len:
+            paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pergerakan armada: Vehicle.update per truk vs FleetState.step")
+    parser.add_argument("--graph", default=GRAPH_FILE)
+    parser.add_argument("--vehicles", type=int, default=500)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    G = ox.load_graphml(args.graph)
+    index = GraphIndex(G)
+    paths = random_paths(G, args.vehicles, 20)
+
+    fleet = FleetState(index, carry_leftover=False)
+    shared = BenchShared(index, fleet)
+    vehicles = []
+    for path in paths:
+        v = Vehicle(G, shared=shared)
+        v.set_path(path)
+        v.state = "to_tps"
+        vehicles.append(v)
+    legacy = [LegacyTruck(G, path, v.speed) for path, v in zip(paths, vehicles)]
+
+    t0 = time.perf_counter()
+    for _ in range(args.frames):
+        for truck in legacy:
+            truck.update(args.dt, shared)
+    before_ms = (time.perf_counter() - t0) * 1000 / args.frames
+
+    t0 = time.perf_counter()
+    for _ in range(args.frames):
+        fleet.step(args.dt, shared)
+    after_ms = (time.perf_counter() - t0) * 1000 / args.frames
+
+    mismatches = sum(
+        (t.current, t.target_node) != (v.current, v.target_node) or abs(t.progress - v.progress) > 1e-9
+        for t, v in zip(legacy, vehicles)
+    )
+
+    print(f"Graph: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges | {args.vehicles} vehicles, {args.frames} frames")
+    print(f"{'before':>10} {before_ms:10.3f} ms/frame  (Vehicle.update per truk)")
+    print(f"{'after':>10} {after_ms:10.3f} ms/frame  (FleetState.step)")
+    print(f"Speedup: {before_ms / after_ms:.1f}x | position mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
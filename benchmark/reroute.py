@@ -0,0 +1,96 @@
+import argparse
+import random
+import statistics
+import time
+import networkx as nx
+import osmnx as ox
+from src.utils.graph_index import GraphIndex
+from src.utils.shortest_paths import shortest_path_excluding
+
+# ================== SETUP ==================
+GRAPH_FILE = "./data/simpl_balikpapan_kota_drive.graphml"
+
+
+# ------------------ before: copy graph + remove edges ------------------
+def legacy_shortest_path_excluding_edges(G, source, target, exclude_edges):
+    """Implementasi lama AIModel._shortest_path_excluding_edges (G.copy per reroute)"""
+    if source == target:
+        return [source]
+
+    G2 = G.copy()
+    for e in list(exclude_edges):
+        u_str, v_str = e.split("-", 1)
+        u, v = int(u_str), int(v_str)
+        if G2.has_edge(u, v):
+            G2.remove_edge(u, v)
+        if G2.has_edge(v, u):
+            G2.remove_edge(v, u)
+
+    try:
+        return nx.shortest_path(G2, source, target, weight="length")
+    except nx.NetworkXNoPath:
+        return None
+
+
+# ------------------ after: masked search di CSR ------------------
+def masked_shortest_path_excluding_edges(index, source, target, exclude_edges):
+    banned = set()
+    for edge_id in exclude_edges:
+        u_str, _, v_str = edge_id.partition("-")
+        banned.update(index.edges_of_id(edge_id))
+        banned.update(index.edges_of_id(f"{v_str}-{u_str}"))
+    return shortest_path_excluding(index, index.length_list, source, target, banned)
+
+
+def time_calls(fn, cases):
+    samples = []
+    results = []
+    for args in cases:
+        t0 = time.perf_counter()
+        results.append(fn(*args))
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark latency reroute: G.copy() vs masked-edge search")
+    parser.add_argument("--graph", default=GRAPH_FILE)
+    parser.add_argument("--cases", type=int, default=50)
+    parser.add_argument("--avoid", type=int, default=10, help="Jumlah edge yang dihindari per reroute")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    G = ox.load_graphml(args.graph)
+    t0 = time.perf_counter()
+    index = GraphIndex(G)
+    index_ms = (time.perf_counter() - t0) * 1000
+
+    nodes = list(G.nodes())
+    edges = [f"{u}-{v}" for u, v in G.edges()]
+    cases = [
+        (random.choice(nodes), random.choice(nodes), set(random.sample(edges, args.avoid)))
+        for _ in range(args.cases)
+    ]
+
+    before, before_paths = time_calls(lambda s, t, ex: legacy_shortest_path_excluding_edges(G, s, t, ex), cases)
+    after, after_paths = time_calls(lambda s, t, ex: masked_shortest_path_excluding_edges(index, s, t, ex), cases)
+
+    def path_length(p):
+        if not p:
+            return None
+        return round(sum(min(d['length'] for d in G[a][b].values()) for a, b in zip(p, p[1:])), 6)
+
+    mismatches = sum(path_length(a) != path_length(b) for a, b in zip(before_paths, after_paths))
+
+    print(f"Graph: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges | {args.cases} reroutes, {args.avoid} avoided edges each")
+    print(f"GraphIndex build (sekali): {index_ms:.2f} ms")
+    print(f"{'':>10} {'mean':>10} {'median':>10} {'p95':>10}   (ms)")
+    for name, samples in (("before", before), ("after", after)):
+        p95 = sorted(samples)[int(len(samples) * 0.95) - 1]
+        print(f"{name:>10} {statistics.mean(samples):10.3f} {statistics.median(samples):10.3f} {p95:10.3f}")
+    print(f"Speedup (mean): {statistics.mean(before) / statistics.mean(after):.1f}x | path length mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
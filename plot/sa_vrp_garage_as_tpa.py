@@ -1,19 +1,46 @@
 import random
 import math
+import itertools
+import os
+import tempfile
 import time
+import numpy as np
 import networkx as nx
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from src.utils.graph_index import GraphIndex
+from src.utils.distance_cache import load_trees
 
 w1 = 0.0000001     # total distance
 w2 = 0.1    # avg overtime penalty
 w3 = 0.0001   # unserved TPS penalty
 w4 = 0.00003    # workload imbalance penalty
 
+UNREACHABLE = 1e8  # jarak pengganti jika tidak ada jalur antar titik
+MIN_BATCH = 8  # di bawah ini evaluasi tetangga satu per satu lebih cepat dari versi array
+
 # ------------------ shortest path cache ------------------
-def make_sp_len_dict(graph):
-    """Precompute shortest path lengths between all nodes (faster than lru_cache for repeated queries)"""
-    sp_len = dict(nx.all_pairs_dijkstra_path_length(graph, weight='length'))
-    return sp_len
+def make_poi_trees(graph, poi_nodes):
+    """
+    Pohon Dijkstra hanya dari titik penting (TPS + garasi/TPA), bukan all-pairs
+    seluruh kota. Predecessor (next_node) disimpan untuk ekspansi route.
+    Dibaca dari cache disk (data/saved) jika graph dan POI yang sama sudah pernah dihitung.
+    """
+    return load_trees(GraphIndex(graph), poi_nodes)
+
+def make_distance_matrix(trees, poi_nodes):
+    """Matriks jarak padat (k x k) antar poi_nodes: dist[i, j] = jarak poi i -> poi j"""
+    k = len(poi_nodes)
+    dist = np.full((k, k), UNREACHABLE, dtype=np.float64)
+    node_idx = trees.index.node_idx
+    known = [i for i, n in enumerate(poi_nodes) if n in node_idx and trees.has_root(n)]
+    if known:
+        rows = [trees.root_row[poi_nodes[j]] for j in known]
+        cols = [node_idx[poi_nodes[i]] for i in known]
+        # trees.dist[root, n] = jarak n -> root, jadi perlu ditranspose
+        sub = trees.dist[np.ix_(rows, cols)].T
+        dist[np.ix_(known, known)] = np.where(np.isfinite(sub), sub, UNREACHABLE)
+    np.fill_diagonal(dist, 0.0)
+    return dist
 
 # ------------------ split trips ------------------
 def split_into_trips(tps_sequence, demand_per_tps, capacity, garage_node):
@@ -31,90 +58,36 @@ def split_into_trips(tps_sequence, demand_per_tps, capacity, garage_node):
         route.append(garage_node)
     return route
 
-# ------------------ evaluate ------------------
-def evaluate_solution(graph, routes_per_vehicle, TPS_nodes, demand_per_tps,
-                      vehicle_speeds, operational_time, sp_len_dict):
-    distances_per_vehicle = []
-    total_distance = 0.0
-    unserved = set(TPS_nodes)
-
-    for vidx, tps_seq in enumerate(routes_per_vehicle):
-        garage_node = evaluate_solution.garage_choice[vidx]
-        capacity = evaluate_solution.capacities[vidx]
-        speed = vehicle_speeds[vidx] if vidx < len(vehicle_speeds) else vehicle_speeds[-1]
-
-        trip_route = split_into_trips(tps_seq, demand_per_tps, capacity, garage_node)
-
-        dist = 0.0
-        for i in range(len(trip_route)-1):
-            u, v = trip_route[i], trip_route[i+1]
-            dist += sp_len_dict.get(u, {}).get(v, 1e8)
-            if u in unserved:
-                unserved.discard(u)
-
-        distances_per_vehicle.append(dist)
-        total_distance += dist
-
-    # overtime
-    overtime_list = []
-    for vidx, dist in enumerate(distances_per_vehicle):
-        speed = vehicle_speeds[vidx] if vidx < len(vehicle_speeds) else vehicle_speeds[-1]
-        time_spent = dist / max(speed, 1e-6)
-        overtime_list.append(max(0.0, time_spent - operational_time))
-    avg_overtime = sum(overtime_list)/len(overtime_list)
-
-    # workload std dev
-    mean_load = sum(distances_per_vehicle)/len(distances_per_vehicle)
-    std_dev = math.sqrt(sum((d-mean_load)**2 for d in distances_per_vehicle)/len(distances_per_vehicle))
-
-    distance_penalty = (w1*total_distance)
-    overtime_penalty = (w2*avg_overtime)
-    unserved_penalty = (w3*len(unserved))
-    imbalance_penalty = (w4*std_dev)
-
-    print("Distance Penalty:", distance_penalty)
-    print("Overtime Penalty:", overtime_penalty)
-    print("Unserved Penalty:", unserved_penalty)
-    print("Imbalance Penalty:", imbalance_penalty)
-
-    cost = (w1*total_distance) + (w2*avg_overtime) + (w3*len(unserved)) + (w4*std_dev)
-
-    breakdown = {
-        "total_distance": total_distance,
-        "avg_overtime": avg_overtime,
-        "unserved_tps": len(unserved),
-        "std_dev": std_dev
-    }
-
-    return cost, breakdown, distances_per_vehicle
-
-# attributes
-evaluate_solution.garage_choice = []
-evaluate_solution.capacities = []
-
 # ------------------ neighbor ------------------
-def random_neighbor(routes):
-    new_routes = [r.copy() for r in routes]
+def random_neighbor(routes, rng=random):
+    """
+    Swap/relocate acak. Return (new_routes, changed): hanya route yang berubah
+    yang di-copy, route lain dipakai bersama dengan solusi lama.
+    """
+    new_routes = list(routes)
     nonempty = [i for i,r in enumerate(new_routes) if len(r)>0]
     if len(nonempty) < 1:
-        return new_routes
+        return new_routes, ()
 
-    op = random.random()
+    op = rng.random()
     if op < 0.5 and len(nonempty)>=2:  # swap
-        r1,r2 = random.sample(nonempty,2)
-        i,j = random.randrange(len(new_routes[r1])), random.randrange(len(new_routes[r2]))
+        r1,r2 = rng.sample(nonempty,2)
+        new_routes[r1], new_routes[r2] = new_routes[r1].copy(), new_routes[r2].copy()
+        i,j = rng.randrange(len(new_routes[r1])), rng.randrange(len(new_routes[r2]))
         new_routes[r1][i], new_routes[r2][j] = new_routes[r2][j], new_routes[r1][i]
+        return new_routes, (r1, r2)
     else:  # relocate
-        src = random.choice(nonempty)
+        src = rng.choice(nonempty)
         dst_candidates = [i for i in range(len(new_routes)) if i != src]
         if not dst_candidates:
-            return new_routes
-        dst = random.choice(dst_candidates)
-        idx = random.randrange(len(new_routes[src]))
+            return new_routes, ()
+        dst = rng.choice(dst_candidates)
+        new_routes[src], new_routes[dst] = new_routes[src].copy(), new_routes[dst].copy()
+        idx = rng.randrange(len(new_routes[src]))
         node = new_routes[src].pop(idx)
-        pos = random.randrange(len(new_routes[dst])+1)
+        pos = rng.randrange(len(new_routes[dst])+1)
         new_routes[dst].insert(pos, node)
-    return new_routes
+        return new_routes, (src, dst)
 
 # ------------------ initial ------------------
 def initial_assignment_round_robin(TPS_nodes, num_vehicle):
@@ -123,97 +96,714 @@ def initial_assignment_round_robin(TPS_nodes, num_vehicle):
         routes[i % num_vehicle].append(t)
     return routes
 
+# ------------------ metrics ------------------
+class SAMetrics:
+    """
+    Ring buffer metrik SA per iterasi (disampling setiap sample_every iterasi),
+    pengganti print per evaluasi. Bisa dibaca langsung (to_dict/latest) dari
+    notebook/dashboard, atau diteruskan ke callback(record) setiap kali ada sampel.
+    Jika buffer penuh, sampel tertua ditimpa.
+    """
+
+    FIELDS = ("chain", "iteration", "temperature", "cost", "best_cost", "accept_rate",
+              "total_distance", "avg_overtime", "unserved_tps", "std_dev")
+
+    def __init__(self, capacity=10000, sample_every=1, callback=None):
+        self.capacity = capacity
+        self.sample_every = max(1, int(sample_every))
+        self.callback = callback
+        self.data = np.zeros((capacity, len(self.FIELDS)), dtype=np.float64)
+        self.count = 0  # total sampel yang pernah direkam
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def __getstate__(self):
+        # callback (mis. lambda) tidak ikut dikirim ke worker process
+        state = self.__dict__.copy()
+        state["callback"] = None
+        return state
+
+    def clear(self):
+        self.count = 0
+
+    def record(self, values):
+        """values: tuple sesuai urutan FIELDS"""
+        self.data[self.count % self.capacity] = values
+        self.count += 1
+        if self.callback is not None:
+            self.callback(dict(zip(self.FIELDS, values)))
+
+    def extend(self, other, chain=None):
+        """Salin semua sampel dari metrik lain (mis. milik chain di worker)"""
+        for row in other.rows():
+            if chain is not None:
+                row[0] = chain
+            self.record(tuple(row))
+
+    def rows(self):
+        """Array (n, len(FIELDS)) urut dari sampel tertua"""
+        n = len(self)
+        start = self.count - n
+        idx = (np.arange(start, self.count)) % self.capacity
+        return self.data[idx]
+
+    def to_dict(self):
+        rows = self.rows()
+        return {name: rows[:, i] for i, name in enumerate(self.FIELDS)}
+
+    def latest(self):
+        if self.count == 0:
+            return None
+        return dict(zip(self.FIELDS, self.data[(self.count - 1) % self.capacity].tolist()))
+
+# ------------------ chain state ------------------
+class SAChain:
+    """
+    State satu rantai SA. Bisa dijalankan bertahap (run_chain per segmen) dan
+    dikirim bolak-balik ke worker process karena semua isinya bisa di-pickle.
+    """
+
+    def __init__(self, routes, cost, T, seed=None):
+        self.current_routes = [r.copy() for r in routes]
+        self.current_cost = cost
+        self.best_routes = [r.copy() for r in routes]
+        self.best_cost = cost
+        self.T = T
+        self.it = 0
+        self.accepted = 0
+        self.rng = random.Random(seed)
+        self.history = []  # best_cost per iterasi segmen terakhir
+        self.cache = None  # RouteCache untuk current_routes, dibangun ulang oleh solver jika None
+        self.accept_rate = 1.0  # rata-rata bergerak rasio kandidat diterima (menentukan ukuran batch)
+        self.index = 0  # nomor chain (multi-chain)
+        self.metrics = None  # SAMetrics opsional, diisi di run_chain
+
+    def adopt(self, routes, cost):
+        """Ganti solusi sekarang (mis. hasil pertukaran best antar chain)"""
+        self.current_routes = [r.copy() for r in routes]
+        self.current_cost = cost
+        self.cache = None
+        if cost < self.best_cost:
+            self.best_cost = cost
+            self.best_routes = [r.copy() for r in routes]
+
+class RouteCache:
+    """
+    Cache evaluasi per route untuk delta evaluation: jarak dan overtime setiap
+    truk, plus agregat global (jumlah jarak, jumlah kuadrat jarak untuk std dev,
+    total overtime, jumlah TPS terlayani). Move yang hanya mengubah 1-2 route
+    cukup menghitung ulang route tersebut.
+
+    Swap/relocate tidak pernah menambah/menghapus TPS dari solusi, jadi TPS
+    terlayani hanya bisa berubah lewat garasi yang juga TPS (dihitung terlayani
+    jika ada truk non-idle yang berangkat dari situ), dicatat di garage_active.
+    """
+
+    def __init__(self, route_dist, route_overtime, route_active, num_items_served, garage_active):
+        self.route_dist = route_dist
+        self.route_overtime = route_overtime
+        self.route_active = route_active
+        self.dist_sum = sum(route_dist)
+        self.dist_sq_sum = sum(d*d for d in route_dist)
+        self.overtime_sum = sum(route_overtime)
+        self.num_items_served = num_items_served
+        self.garage_active = garage_active  # garasi-TPS -> jumlah truk non-idle
+        self.num_served = num_items_served + sum(1 for c in garage_active.values() if c > 0)
+
+# ------------------ solver ------------------
+class SAVRPSolver:
+    """
+    Solver SA VRP yang reentrant: semua konfigurasi (garasi per truk, kapasitas,
+    matriks jarak) disimpan di instance, bukan atribut fungsi global, sehingga
+    beberapa solver/chain bisa berjalan dalam satu process maupun lintas process.
+
+    dist adalah matriks jarak (k x k) antar poi_nodes; bisa berupa array biasa
+    atau memmap read-only yang dibagi ke semua worker. Di dalam chain, route
+    disimpan sebagai list index POI (baris dist), bukan node id.
+    """
+
+    def __init__(self, TPS_nodes, garage_choice, vehicle_capacities, vehicle_speeds,
+                 dist, poi_nodes, demand_per_tps=None, operational_time=5000.0, trees=None):
+        self.TPS_nodes = list(TPS_nodes)
+        self.garage_choice = list(garage_choice)
+        self.capacities = list(vehicle_capacities)
+        self.vehicle_speeds = list(vehicle_speeds)
+        self.num_vehicle = len(self.capacities)
+        self.demand_per_tps = demand_per_tps if demand_per_tps is not None else {t: 1 for t in self.TPS_nodes}
+        self.operational_time = operational_time
+
+        self.dist = dist
+        self.poi_nodes = list(poi_nodes)
+        self.poi_index = {n: i for i, n in enumerate(self.poi_nodes)}
+        self.tps_set = set(self.TPS_nodes)
+        self.trees = trees  # ShortestPathTrees dari poi_nodes (hanya di process utama)
+
+        # ===== versi index POI untuk evaluator =====
+        self.tps_idx = {self.poi_index[t] for t in self.tps_set}
+        self.demand_idx = {self.poi_index[t]: self.demand_per_tps.get(t, 1) for t in self.TPS_nodes}
+        self.demand_arr = np.ones(len(self.poi_nodes), dtype=np.float64)
+        for i, d in self.demand_idx.items():
+            self.demand_arr[i] = d
+        self.garage_idx = [self.poi_index[g] for g in self.garage_choice]
+        self.garage_arr = np.array(self.garage_idx, dtype=np.int64)
+        self.capacity_arr = np.array(self.capacities, dtype=np.float64)
+        self.speed_arr = np.array([max(self._speed(v), 1e-6) for v in range(self.num_vehicle)], dtype=np.float64)
+        self.garage_tps = [g in self.tps_idx for g in self.garage_idx]
+
+    @classmethod
+    def from_graph(cls, graph, TPS_nodes, GARAGE_nodes, vehicle_capacities, vehicle_speeds,
+                   demand_per_tps=None, operational_time=5000.0):
+        num_vehicle = len(vehicle_capacities)
+
+        # assign garage to each vehicle (round-robin)
+        # jika GARAGE_nodes = [TPA_node], assign semua ke node yang sama
+        garage_choice = [GARAGE_nodes[0]] * num_vehicle
+
+        poi_nodes = list(dict.fromkeys(list(TPS_nodes) + list(GARAGE_nodes)))
+        trees = make_poi_trees(graph, poi_nodes)
+        dist = make_distance_matrix(trees, poi_nodes)
+
+        return cls(TPS_nodes, garage_choice, vehicle_capacities, vehicle_speeds,
+                   dist, poi_nodes, demand_per_tps, operational_time, trees)
+
+    def problem_spec(self):
+        """Argumen konstruktor tanpa matriks jarak (dikirim ke worker process)"""
+        return {
+            "TPS_nodes": self.TPS_nodes,
+            "garage_choice": self.garage_choice,
+            "vehicle_capacities": self.capacities,
+            "vehicle_speeds": self.vehicle_speeds,
+            "poi_nodes": self.poi_nodes,
+            "demand_per_tps": self.demand_per_tps,
+            "operational_time": self.operational_time,
+        }
+
+    def _speed(self, vidx):
+        speeds = self.vehicle_speeds
+        return speeds[vidx] if vidx < len(speeds) else speeds[-1]
+
+    def to_index(self, routes):
+        return [[self.poi_index[n] for n in r] for r in routes]
+
+    def to_nodes(self, routes):
+        return [[self.poi_nodes[i] for i in r] for r in routes]
+
+    # ------------------ evaluate ------------------
+    def route_stats(self, vidx, seq):
+        """Jarak dan overtime satu truk, seq = list index POI (O(panjang route))"""
+        trip_route = split_into_trips(seq, self.demand_idx, self.capacities[vidx], self.garage_idx[vidx])
+
+        dist_matrix = self.dist
+        dist = 0.0
+        for i in range(len(trip_route)-1):
+            dist += dist_matrix[trip_route[i], trip_route[i+1]]
+        dist = float(dist)
+
+        overtime = max(0.0, dist / self.speed_arr[vidx] - self.operational_time)
+        return dist, overtime
+
+    def route_stats_batch(self, vidx, seqs):
+        """
+        Versi array dari route_stats untuk banyak route sekaligus (vidx[i] -> seqs[i]).
+        Route digabung jadi satu array index POI; split trip dicari dengan
+        searchsorted pada cumsum demand (satu putaran per trip, semua route
+        sekaligus) dan jarak diambil dengan fancy indexing dari matriks jarak.
+        Return (dist, overtime), masing-masing array per route.
+        """
+        m = len(seqs)
+        vidx = np.asarray(vidx, dtype=np.int64)
+        lengths = np.fromiter(map(len, seqs), dtype=np.int64, count=m)
+        flat = np.fromiter(itertools.chain.from_iterable(seqs), dtype=np.int64, count=int(lengths.sum()))
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        seg = np.repeat(np.arange(m), lengths)
+        garage = self.garage_arr[vidx]
+        capacity = self.capacity_arr[vidx]
+
+        # cs[p] = total demand flat[:p]; trip baru dimulai sebelum posisi j jika
+        # muatan sejak awal trip + demand[j] > kapasitas (sama dengan split_into_trips)
+        cs = np.concatenate(([0.0], np.cumsum(self.demand_arr[flat])))
+        breaks = []
+        active = np.flatnonzero(lengths > 0)
+        base = cs[starts]
+        check = starts.copy()
+        while len(active):
+            j = np.searchsorted(cs, base[active] + capacity[active], side="right") - 1
+            j = np.maximum(j, check[active])
+            inside = j < ends[active]
+            active, j = active[inside], j[inside]
+            breaks.append(j)
+            base[active] = cs[j]
+            check[active] = j + 1
+        breaks = np.concatenate(breaks) if breaks else np.zeros(0, dtype=np.int64)
+
+        dist_matrix = self.dist
+        prev = np.empty_like(flat)
+        prev[1:] = flat[:-1]
+        nonempty = lengths > 0
+        prev[starts[nonempty]] = garage[nonempty]
+        link = dist_matrix[prev, flat]
+
+        # pulang ke garasi lalu berangkat lagi: prev -> garasi -> garasi -> flat[j]
+        g = garage[seg[breaks]]
+        link[breaks] = dist_matrix[prev[breaks], g] + dist_matrix[g, g] + dist_matrix[g, flat[breaks]]
+
+        dist = np.bincount(seg, weights=link, minlength=m)
+        dist[nonempty] += dist_matrix[flat[ends[nonempty] - 1], garage[nonempty]]
+
+        overtime = np.maximum(0.0, dist / self.speed_arr[vidx] - self.operational_time)
+        return dist, overtime
+
+    def _cost(self, total_distance, overtime_sum, dist_sq_sum, num_served):
+        n = self.num_vehicle
+        avg_overtime = overtime_sum / n
+        mean_load = total_distance / n
+        std_dev = math.sqrt(max(0.0, dist_sq_sum / n - mean_load * mean_load))
+        unserved = len(self.tps_set) - num_served
+
+        distance_penalty = (w1*total_distance)
+        overtime_penalty = (w2*avg_overtime)
+        unserved_penalty = (w3*unserved)
+        imbalance_penalty = (w4*std_dev)
+        cost = distance_penalty + overtime_penalty + unserved_penalty + imbalance_penalty
+
+        breakdown = {
+            "total_distance": total_distance,
+            "avg_overtime": avg_overtime,
+            "unserved_tps": unserved,
+            "std_dev": std_dev
+        }
+        return cost, breakdown
+
+    def build_cache(self, routes_per_vehicle):
+        """RouteCache dari route index POI (evaluasi penuh)"""
+        stats = [self.route_stats(vidx, seq) for vidx, seq in enumerate(routes_per_vehicle)]
+        active = [len(seq) > 0 for seq in routes_per_vehicle]
+
+        items = set(itertools.chain.from_iterable(routes_per_vehicle)) & self.tps_idx
+        garage_active = {}
+        for vidx, g in enumerate(self.garage_idx):
+            if self.garage_tps[vidx] and g not in items:
+                garage_active[g] = garage_active.get(g, 0) + active[vidx]
+
+        return RouteCache([s[0] for s in stats], [s[1] for s in stats], active, len(items), garage_active)
+
+    def evaluate(self, routes_per_vehicle):
+        """Evaluasi penuh route node id. Return cost, breakdown, distances_per_vehicle"""
+        cache = self.build_cache(self.to_index(routes_per_vehicle))
+        cost, breakdown = self._cost(cache.dist_sum, cache.overtime_sum, cache.dist_sq_sum, cache.num_served)
+
+        return cost, breakdown, list(cache.route_dist)
+
+    def _served_after(self, cache, update):
+        """num_served setelah update; hanya garasi-TPS yang bisa berubah status"""
+        if not cache.garage_active:
+            return cache.num_served
+        num_served = cache.num_served
+        counts = {}
+        for vidx, _, _, active in update:
+            g = self.garage_idx[vidx]
+            if g in cache.garage_active and active != cache.route_active[vidx]:
+                counts[g] = counts.get(g, cache.garage_active[g]) + (1 if active else -1)
+        for g, c in counts.items():
+            num_served += (c > 0) - (cache.garage_active[g] > 0)
+        return num_served
+
+    def _apply_update(self, cache, update):
+        dist_sum = cache.dist_sum
+        dist_sq_sum = cache.dist_sq_sum
+        overtime_sum = cache.overtime_sum
+        for vidx, dist, overtime, _ in update:
+            old_dist = cache.route_dist[vidx]
+            dist_sum += dist - old_dist
+            dist_sq_sum += dist*dist - old_dist*old_dist
+            overtime_sum += overtime - cache.route_overtime[vidx]
+        num_served = self._served_after(cache, update)
+        cost, _ = self._cost(dist_sum, overtime_sum, dist_sq_sum, num_served)
+        return cost, (update, dist_sum, dist_sq_sum, overtime_sum, num_served)
+
+    def evaluate_delta(self, cache, new_routes, changed):
+        """
+        Cost solusi tetangga dengan hanya menghitung ulang route `changed`
+        (O(panjang route yang berubah), bukan O(total TPS)). Cache tidak diubah;
+        return (cost, delta) dan panggil commit_delta(cache, delta) jika diterima.
+        """
+        update = [(vidx, *self.route_stats(vidx, new_routes[vidx]), len(new_routes[vidx]) > 0)
+                  for vidx in changed]
+        return self._apply_update(cache, update)
+
+    def evaluate_batch(self, cache, candidates):
+        """
+        Cost banyak tetangga sekaligus (list (new_routes, changed) terhadap
+        state yang sama). Semua route yang berubah dievaluasi dalam satu
+        panggilan route_stats_batch dan agregatnya dihitung per kandidat dengan
+        bincount. Return (costs, batch); delta kandidat ke-i untuk commit_delta
+        diambil lewat batch_delta(cache, candidates, batch, i).
+        """
+        counts = [len(changed) for _, changed in candidates]
+        vidx = np.fromiter((v for _, changed in candidates for v in changed), dtype=np.int64, count=sum(counts))
+        seqs = [routes[v] for routes, changed in candidates for v in changed]
+        if not seqs:  # tidak ada move yang mungkin (mis. semua route kosong)
+            cost, _ = self._cost(cache.dist_sum, cache.overtime_sum, cache.dist_sq_sum, cache.num_served)
+            return [cost] * len(candidates), None
+
+        dist, overtime = self.route_stats_batch(vidx, seqs)
+        owner = np.repeat(np.arange(len(candidates)), counts)
+        old_dist = np.asarray(cache.route_dist)[vidx]
+        old_overtime = np.asarray(cache.route_overtime)[vidx]
+
+        n_cand = len(candidates)
+        dist_sum = cache.dist_sum + np.bincount(owner, dist - old_dist, n_cand)
+        dist_sq_sum = cache.dist_sq_sum + np.bincount(owner, dist*dist - old_dist*old_dist, n_cand)
+        overtime_sum = cache.overtime_sum + np.bincount(owner, overtime - old_overtime, n_cand)
+
+        if cache.garage_active:
+            num_served = np.array([self._served_after(cache, [(v, 0, 0, len(routes[v]) > 0) for v in changed])
+                                   for routes, changed in candidates])
+        else:
+            num_served = cache.num_served
+
+        n = self.num_vehicle
+        mean_load = dist_sum / n
+        std_dev = np.sqrt(np.maximum(0.0, dist_sq_sum / n - mean_load * mean_load))
+        unserved = len(self.tps_set) - num_served
+        costs = w1*dist_sum + w2*(overtime_sum / n) + w3*unserved + w4*std_dev
+
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        batch = (dist.tolist(), overtime.tolist(), offsets.tolist(),
+                 dist_sum.tolist(), dist_sq_sum.tolist(), overtime_sum.tolist(), num_served)
+        return costs.tolist(), batch
+
+    def batch_delta(self, cache, candidates, batch, i):
+        """Delta (format commit_delta) untuk kandidat ke-i hasil evaluate_batch"""
+        routes, changed = candidates[i]
+        if batch is None:
+            return ([], cache.dist_sum, cache.dist_sq_sum, cache.overtime_sum, cache.num_served)
+        dist, overtime, offsets, dist_sum, dist_sq_sum, overtime_sum, num_served = batch
+        start = offsets[i]
+        update = [(v, dist[start+j], overtime[start+j], len(routes[v]) > 0) for j, v in enumerate(changed)]
+        served = num_served if isinstance(num_served, int) else int(num_served[i])
+        return (update, dist_sum[i], dist_sq_sum[i], overtime_sum[i], served)
+
+    def commit_delta(self, cache, delta):
+        update, cache.dist_sum, cache.dist_sq_sum, cache.overtime_sum, cache.num_served = delta
+        for vidx, dist, overtime, active in update:
+            cache.route_dist[vidx] = dist
+            cache.route_overtime[vidx] = overtime
+            g = self.garage_idx[vidx]
+            if g in cache.garage_active and active != cache.route_active[vidx]:
+                cache.garage_active[g] += 1 if active else -1
+            cache.route_active[vidx] = active
+
+    def _sample(self, chain):
+        """Satu baris SAMetrics dari state chain sekarang (komponen cost dari cache)"""
+        cache = chain.cache
+        _, b = self._cost(cache.dist_sum, cache.overtime_sum, cache.dist_sq_sum, cache.num_served)
+        return (chain.index, chain.it, chain.T, chain.current_cost, chain.best_cost, chain.accept_rate,
+                b["total_distance"], b["avg_overtime"], b["unserved_tps"], b["std_dev"])
+
+    # ------------------ single chain ------------------
+    def new_chain(self, T_start, seed=None, routes=None):
+        """Chain baru; routes (node id) default round-robin"""
+        if routes is None:
+            routes = initial_assignment_round_robin(self.TPS_nodes[:], self.num_vehicle)
+        cost, _, _ = self.evaluate(routes)
+        chain = SAChain(self.to_index(routes), cost, T_start, seed)
+        chain.cache = self.build_cache(chain.current_routes)
+        return chain
+
+    def random_start(self, rng):
+        """Round-robin dari urutan TPS yang diacak (titik awal berbeda per chain multi-start)"""
+        tps = self.TPS_nodes[:]
+        rng.shuffle(tps)
+        return initial_assignment_round_robin(tps, self.num_vehicle)
+
+    def _propose(self, chain, n):
+        """
+        n kandidat tetangga dari state chain sekarang.
+        Return (candidates, costs, get_delta) dengan get_delta(i) -> delta kandidat i.
+        """
+        if n == 1:
+            new_routes, changed = random_neighbor(chain.current_routes, chain.rng)
+            cost, delta = self.evaluate_delta(chain.cache, new_routes, changed)
+            return [(new_routes, changed)], [cost], lambda i: delta
+        candidates = [random_neighbor(chain.current_routes, chain.rng) for _ in range(n)]
+        costs, batch = self.evaluate_batch(chain.cache, candidates)
+        return candidates, costs, lambda i: self.batch_delta(chain.cache, candidates, batch, i)
+
+    def run_chain(self, chain, n_iter, T_end=1e-3, alpha=0.995, report_every=None, max_iter=None, batch_size=1):
+        """
+        Jalankan n_iter iterasi pada chain (in-place). Return chain.
+
+        batch_size > 1: batch_size tetangga dari state yang sama dievaluasi
+        sekaligus (route_stats_batch), lalu diuji Metropolis berurutan; kandidat
+        pertama yang diterima dipakai dan sisanya dibuang. Karena tetangga yang
+        ditolak tidak mengubah state, hasilnya setara SA biasa (satu iterasi per
+        kandidat yang diuji), hanya evaluasinya yang di-batch.
+        """
+        rng = chain.rng
+        metrics = chain.metrics
+        chain.history = []
+        start_time = time.time()
+        start_it = chain.it
+        last_report = chain.it
+        end_it = chain.it + n_iter
+        if chain.cache is None:
+            # chain baru mengadopsi solusi lain (exchange): bangun ulang cache sekali
+            chain.cache = self.build_cache(chain.current_routes)
+            chain.current_cost, _ = self._cost(chain.cache.dist_sum, chain.cache.overtime_sum,
+                                               chain.cache.dist_sq_sum, chain.cache.num_served)
+
+        while chain.it < end_it and chain.T > T_end:
+            # batch hanya menguntungkan jika sebagian besar kandidat ditolak (suhu rendah).
+            # Dibatasi ekspektasi jumlah penolakan sebelum ada yang diterima ((1-p)/p),
+            # karena kandidat setelah yang diterima dibangkitkan dan dievaluasi sia-sia
+            p = max(chain.accept_rate, 1e-3)
+            n = min(batch_size, end_it - chain.it, int((1 - p) / p))
+            candidates, costs, get_delta = self._propose(chain, n if n >= MIN_BATCH else 1)
+
+            for i, ((new_routes, changed), new_cost) in enumerate(zip(candidates, costs)):
+                chain.it += 1
+                accepted = new_cost < chain.current_cost or \
+                    math.exp((chain.current_cost-new_cost)/max(chain.T,1e-12)) > rng.random()
+                chain.accept_rate += 0.01 * (accepted - chain.accept_rate)
+
+                if accepted:
+                    self.commit_delta(chain.cache, get_delta(i))
+                    chain.current_routes = new_routes
+                    chain.current_cost = new_cost
+                    chain.accepted += 1
+                    if new_cost < chain.best_cost:
+                        chain.best_cost = new_cost
+                        chain.best_routes = [r.copy() for r in new_routes]
+
+                chain.history.append(chain.best_cost)
+                chain.T *= alpha
+                if metrics is not None and chain.it % metrics.sample_every == 0:
+                    metrics.record(self._sample(chain))
+
+                if report_every and chain.it - last_report >= report_every:
+                    total = max_iter or end_it
+                    elapsed = time.time()-start_time
+                    percent = (chain.it/total)*100
+                    eta = (elapsed/(chain.it-start_it))*(total-chain.it)
+                    print(f"[{percent:6.2f}%] Iter {chain.it}/{total} | BestCost {chain.best_cost:.2f} | ETA {eta:.1f}s")
+                    last_report = chain.it
+
+                # kandidat sisa dibuat dari state lama: buang setelah ada yang diterima
+                if accepted or chain.T <= T_end:
+                    break
+
+        return chain
+
+    def solve(self, max_iter=5000, T_start=1000.0, T_end=1e-3, alpha=0.995, report_every=200, seed=None,
+              batch_size=1, metrics=None):
+        """
+        SA satu chain (sekuensial). Return best_routes (node id), best_cost, cost_history.
+        metrics: SAMetrics opsional untuk merekam komponen cost, suhu dan acceptance rate.
+        """
+        chain = self.new_chain(T_start, seed)
+        chain.metrics = metrics
+        cost_history = [chain.best_cost]
+        if report_every:
+            print(f"[SA START] vehicles={self.num_vehicle} TPS={len(self.TPS_nodes)} initial_cost={chain.best_cost:.2f}")
+
+        self.run_chain(chain, max_iter, T_end, alpha, report_every, max_iter, batch_size)
+        cost_history.extend(chain.history)
+        return self.to_nodes(chain.best_routes), chain.best_cost, cost_history
+
+    # ------------------ multi chain ------------------
+    def solve_parallel(self, num_chains=4, workers=None, exchange_every=500, mode="multistart",
+                       max_iter=5000, T_start=1000.0, T_end=1e-3, alpha=0.995, seed=None, batch_size=1,
+                       metrics=None, split_budget=True, target_cost=None, report_every=None):
+        """
+        K chain SA paralel di worker process. Matriks jarak ditulis sekali ke
+        file .npy dan dibuka read-only (memmap) oleh setiap worker.
+
+        mode="multistart": chain independen (seed berbeda), setiap exchange_every
+            iterasi chain terburuk mengambil best global.
+        mode="tempering": parallel tempering, setiap chain punya suhu tetap
+            (tangga geometrik T_start..T_end), state chain bertetangga ditukar
+            dengan kriteria Metropolis setiap exchange_every iterasi.
+        Chain pertama mulai dari round-robin biasa, chain lain dari round-robin
+        urutan TPS yang diacak (random_start), jadi titik awalnya berbeda.
+        split_budget: max_iter adalah total iterasi semua chain (per chain
+            max_iter/num_chains, alpha dipangkatkan supaya jadwal suhu tetap
+            selesai), sehingga waktu turun seiring jumlah worker. False: setiap
+            chain menjalankan max_iter penuh.
+        target_cost: berhenti setelah segmen yang menemukan cost <= target_cost.
+        report_every: cetak progres jika sudah lewat report_every iterasi per chain
+            (dicek setelah setiap segmen); None = tanpa output.
+        metrics: SAMetrics opsional; setiap chain merekam di worker, lalu sampelnya
+            digabung (kolom "chain") di process utama setelah setiap segmen.
+        Return best_routes (node id), best_cost, cost_history (best global per iterasi).
+        """
+        master_rng = random.Random(seed)
+        chain_iter = max(1, math.ceil(max_iter / num_chains)) if split_budget else max_iter
+        if mode == "tempering":
+            ratio = (T_end / T_start) ** (1 / max(1, num_chains - 1))
+            temps = [T_start * ratio**i for i in range(num_chains)]
+            chain_alpha = 1.0
+            chain_T_end = 0.0  # suhu tetap: chain terdingin (= T_end) tidak boleh berhenti
+        else:
+            temps = [T_start] * num_chains
+            chain_alpha = alpha ** (max_iter / chain_iter)  # suhu akhir sama dengan max_iter iterasi alpha
+            chain_T_end = T_end
+
+        chains = [self.new_chain(temps[i], master_rng.getrandbits(64),
+                                 None if i == 0 else self.random_start(master_rng))
+                  for i in range(num_chains)]
+        for i, c in enumerate(chains):
+            c.index = i
+            if metrics is not None:
+                c.metrics = SAMetrics(exchange_every, metrics.sample_every)
+        best = min(chains, key=lambda c: c.best_cost)
+        best_routes, best_cost = best.best_routes, best.best_cost
+        cost_history = [best_cost]
+
+        if report_every:
+            print(f"[SA START] mode={mode} chains={num_chains} vehicles={self.num_vehicle} "
+                  f"TPS={len(self.TPS_nodes)} initial_cost={best_cost:.2f}")
+
+        fd, matrix_file = tempfile.mkstemp(suffix=".npy", prefix="sa_dist_")
+        os.close(fd)
+        try:
+            np.save(matrix_file, np.asarray(self.dist))
+            start_time = time.time()
+            done = 0
+            last_report = 0
+
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.problem_spec(), matrix_file)) as pool:
+                while done < chain_iter:
+                    n = min(exchange_every, chain_iter - done)
+                    chains = list(pool.map(_run_chain_segment, chains, [n]*num_chains, [chain_T_end]*num_chains,
+                                           [chain_alpha]*num_chains, [batch_size]*num_chains))
+                    done += n
+
+                    if metrics is not None:
+                        for c in chains:
+                            metrics.extend(c.metrics)
+                            c.metrics.clear()
+
+                    # best global per iterasi (chain yang berhenti lebih awal memakai nilai terakhirnya)
+                    length = max(len(c.history) for c in chains)
+                    segment = np.min([c.history + [c.best_cost] * (length - len(c.history)) for c in chains], axis=0)
+                    cost_history.extend(np.minimum.accumulate(np.minimum(segment, best_cost)).tolist())
+
+                    best = min(chains, key=lambda c: c.best_cost)
+                    if best.best_cost < best_cost:
+                        best_routes, best_cost = [r.copy() for r in best.best_routes], best.best_cost
+
+                    self._exchange(chains, mode, best_routes, best_cost, master_rng)
+
+                    if report_every and done - last_report >= report_every:
+                        elapsed = time.time() - start_time
+                        print(f"[{done/chain_iter*100:6.2f}%] Iter {done}/{chain_iter} x {num_chains} chains | "
+                              f"BestCost {best_cost:.2f} | {elapsed:.1f}s")
+                        last_report = done
+
+                    if mode != "tempering" and all(c.T <= T_end for c in chains):
+                        break
+                    if target_cost is not None and best_cost <= target_cost:
+                        break
+        finally:
+            os.remove(matrix_file)
+
+        return self.to_nodes(best_routes), best_cost, cost_history
+
+    def _exchange(self, chains, mode, best_routes, best_cost, rng):
+        if mode == "tempering":
+            # tukar state chain bertetangga (suhu tetap di chain masing-masing)
+            for i in range(len(chains) - 1):
+                a, b = chains[i], chains[i + 1]
+                delta = (1 / max(a.T, 1e-12) - 1 / max(b.T, 1e-12)) * (a.current_cost - b.current_cost)
+                if delta >= 0 or rng.random() < math.exp(delta):
+                    a_routes, a_cost = a.current_routes, a.current_cost
+                    a.adopt(b.current_routes, b.current_cost)
+                    b.adopt(a_routes, a_cost)
+        else:
+            worst = max(chains, key=lambda c: c.current_cost)
+            if worst.current_cost > best_cost:
+                worst.adopt(best_routes, best_cost)
+
+    # ------------------ expand ------------------
+    def _segment_path(self, graph, u, v):
+        if u == v:
+            return [u]
+        if self.trees is not None and self.trees.has_root(v):
+            sp = self.trees.path(u, v)  # ikuti predecessor pohon, tanpa Dijkstra baru
+            if sp is not None:
+                return sp
+        try:
+            return nx.dijkstra_path(graph, u, v, weight='length')
+        except Exception:
+            return [u, v]  # fallback jika path tidak ditemukan
+
+    def expand_routes(self, graph, best_routes):
+        """Ekspansi urutan TPS per truk menjadi jalur jalan sesungguhnya"""
+        expanded_best_routes = []
+        for vidx, seq in enumerate(best_routes):
+            garage_node = self.garage_choice[vidx]
+            capacity = self.capacities[vidx]
+
+            # Jika truk idle
+            if not seq:
+                expanded_best_routes.append([garage_node, garage_node])
+                continue
+
+            # Pertama: split trip berdasarkan kapasitas
+            trip_route = split_into_trips(seq, self.demand_per_tps, capacity, garage_node)
+
+            # Kedua: ekspansi path graf agar mengikuti jalan sesungguhnya
+            real_route = []
+            for i in range(len(trip_route) - 1):
+                u, v = trip_route[i], trip_route[i+1]
+                sp = self._segment_path(graph, u, v)
+                if real_route:
+                    sp = sp[1:]  # hindari node duplikat
+                real_route.extend(sp)
+
+            expanded_best_routes.append(real_route)
+        return expanded_best_routes
+
+# ------------------ worker process ------------------
+_worker_solver = None
+
+def _init_worker(spec, matrix_file):
+    global _worker_solver
+    dist = np.load(matrix_file, mmap_mode="r")
+    _worker_solver = SAVRPSolver(dist=dist, **spec)
+
+def _run_chain_segment(chain, n_iter, T_end, alpha, batch_size=1):
+    return _worker_solver.run_chain(chain, n_iter, T_end, alpha, batch_size=batch_size)
+
+# ------------------ entry ------------------
 def simulated_annealing_vrp(graph, TPS_nodes, GARAGE_nodes,
                             vehicle_capacities, vehicle_speeds,
                             demand_per_tps=None,
                             operational_time=5000.0,
                             max_iter=5000,
                             T_start=1000.0, T_end=1e-3, alpha=0.995,
-                            report_every=200, seed=None):
-    if seed is not None:
-        random.seed(seed)
-
-    num_vehicle = len(vehicle_capacities)
-    if demand_per_tps is None:
-        demand_per_tps = {t:1 for t in TPS_nodes}
-
-    # assign garage to each vehicle (round-robin)
-    # jika GARAGE_nodes = [TPA_node], assign semua ke node yang sama
-    evaluate_solution.garage_choice = [GARAGE_nodes[0]] * num_vehicle
-    evaluate_solution.capacities = vehicle_capacities
-
-    sp_len_dict = make_sp_len_dict(graph)
-
-    # initial solution: distribute TPS round-robin
-    current_routes = initial_assignment_round_robin(TPS_nodes[:], num_vehicle)
-    best_routes = [r.copy() for r in current_routes]
-    best_cost, _, _ = evaluate_solution(graph, best_routes, TPS_nodes, demand_per_tps, vehicle_speeds, operational_time, sp_len_dict)
-    current_cost = best_cost
-    cost_history = [best_cost]
-
-    T = T_start
-    start_time = time.time()
-    last_report = 0
-
-    print(f"[SA START] vehicles={num_vehicle} TPS={len(TPS_nodes)} initial_cost={best_cost:.2f}")
-
-    for it in range(1,max_iter+1):
-        new_routes = random_neighbor(current_routes)
-        new_cost, _, _ = evaluate_solution(graph, new_routes, TPS_nodes, demand_per_tps, vehicle_speeds, operational_time, sp_len_dict)
-
-        if new_cost < current_cost or math.exp((current_cost-new_cost)/max(T,1e-12)) > random.random():
-            current_routes = new_routes
-            current_cost = new_cost
-            if new_cost < best_cost:
-                best_cost = new_cost
-                best_routes = [r.copy() for r in current_routes]
-
-        cost_history.append(best_cost)
-        T *= alpha
-
-        if it - last_report >= report_every:
-            elapsed = time.time()-start_time
-            percent = (it/max_iter)*100
-            eta = (elapsed/it)*(max_iter-it)
-            print(f"[{percent:6.2f}%] Iter {it}/{max_iter} | BestCost {best_cost:.2f} | ETA {eta:.1f}s")
-            last_report = it
-
-        if T <= T_end:
-            break
-
-        # ---------------- expand routes with real shortest paths ----------------
-    expanded_best_routes = []
-    for vidx, seq in enumerate(best_routes):
-        garage_node = evaluate_solution.garage_choice[vidx]
-        capacity = evaluate_solution.capacities[vidx]
-
-        # Jika truk idle
-        if not seq:
-            expanded_best_routes.append([garage_node, garage_node])
-            continue
-
-        # Pertama: split trip berdasarkan kapasitas
-        trip_route = split_into_trips(seq, demand_per_tps, capacity, garage_node)
-
-        # Kedua: ekspansi path graf agar mengikuti jalan sesungguhnya
-        real_route = []
-        for i in range(len(trip_route) - 1):
-            u, v = trip_route[i], trip_route[i+1]
-            try:
-                sp = nx.dijkstra_path(graph, u, v, weight='length')
-            except Exception:
-                sp = [u, v]  # fallback jika path tidak ditemukan
-            if real_route:
-                sp = sp[1:]  # hindari node duplikat
-            real_route.extend(sp)
-
-        expanded_best_routes.append(real_route)
-
-    print("[SA DONE] BestCost:", best_cost)
-    return expanded_best_routes, best_cost, cost_history
-
-
-            
-
-    print("[SA DONE] BestCost:", best_cost)
+                            report_every=200, seed=None,
+                            num_chains=1, workers=None, exchange_every=500, mode="multistart",
+                            batch_size=1, metrics=None, split_budget=True, target_cost=None):
+    # batch_size > 1 hanya mempercepat jadwal dingin (acceptance rendah), lihat run_chain
+    solver = SAVRPSolver.from_graph(graph, TPS_nodes, GARAGE_nodes, vehicle_capacities,
+                                    vehicle_speeds, demand_per_tps, operational_time)
+
+    if num_chains > 1:
+        best_routes, best_cost, cost_history = solver.solve_parallel(
+            num_chains, workers, exchange_every, mode, max_iter, T_start, T_end, alpha, seed, batch_size, metrics,
+            split_budget, target_cost, report_every)
+    else:
+        best_routes, best_cost, cost_history = solver.solve(
+            max_iter, T_start, T_end, alpha, report_every, seed, batch_size, metrics)
+
+    # ---------------- expand routes with real shortest paths ----------------
+    expanded_best_routes = solver.expand_routes(graph, best_routes)
+
+    if report_every:
+        print("[SA DONE] BestCost:", best_cost)
     return expanded_best_routes, best_cost, cost_history
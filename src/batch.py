@@ -0,0 +1,190 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .environment import GRAPH_FILE, SHIFT_START, HEADLESS_DT
+
+# Kolom yang selalu tampil di tabel ringkasan (sisanya tetap masuk CSV)
+SUMMARY_COLUMNS = [
+    "name", "seed", "fleet", "days", "total_trips", "total_garbage_collected",
+    "garbage_to_tpa_kg", "total_distance_km", "overtime_hours",
+    "unserved_tps", "unserved_tps_days", "workload_cv", "wall_time",
+]
+
+
+# ============== SCENARIO ==============
+def make_scenario(graph=GRAPH_FILE, node_data=None, edge_data=None, fleet=None, days=1, seed=0,
+                  speed=1.0, event_driven=True, name=None):
+    """
+    Satu skenario batch (dict biasa supaya bisa dikirim ke worker process).
+    fleet=None -> pakai total_armada dari data garasi.
+    """
+    if name is None:
+        graph_name = os.path.splitext(os.path.basename(graph))[0]
+        name = f"{graph_name}-f{fleet if fleet is not None else 'saved'}-s{seed}"
+    return {
+        "name": name,
+        "graph": graph,
+        "node_data": node_data,
+        "edge_data": edge_data,
+        "fleet": fleet,
+        "days": days,
+        "seed": seed,
+        "speed": speed,
+        "event_driven": event_driven,
+    }
+
+
+def load_scenarios(path):
+    """File JSON berisi list skenario, field yang tidak diisi memakai default make_scenario"""
+    with open(path, "r") as f:
+        return [make_scenario(**entry) for entry in json.load(f)]
+
+
+def parse_int_list(text):
+    """"1,2,5-8" -> [1, 2, 5, 6, 7, 8]"""
+    values = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            values.extend(range(int(start), int(end) + 1))
+        else:
+            values.append(int(part))
+    return values
+
+
+# ============== WORKER ==============
+def run_scenario(scenario, verbose=False):
+    """Jalankan satu skenario headless (di worker process), return satu baris hasil"""
+    from .engine import SimulationEngine
+    from .utils.shared import SharedState
+    from .utils.graph_cache import load_graph
+    from .utils.logger import configure_logging, flush_logs
+
+    configure_logging(quiet=not verbose)
+    start = time.time()
+
+    GRAPH = load_graph(scenario["graph"])
+
+    shared = SharedState(scenario["graph"])
+    if scenario["node_data"]:
+        shared.node_data_file = scenario["node_data"]
+    if scenario["edge_data"]:
+        shared.edge_data_file = scenario["edge_data"]
+    shared.simulation_running = True
+    shared.paused = False
+    shared.speed = scenario["speed"]
+
+    engine = SimulationEngine(GRAPH, shared, start_hour=SHIFT_START, seed=scenario["seed"],
+                              fleet_size=scenario["fleet"]).setup()
+
+    sim_seconds = scenario["days"] * 24 * 3600
+    if scenario["event_driven"]:
+        steps = engine.run_events(sim_seconds)
+    else:
+        steps = engine.run(sim_seconds, HEADLESS_DT)
+
+    results = engine.get_results()
+    flush_logs()
+
+    return {
+        "name": scenario["name"],
+        "seed": scenario["seed"],
+        "fleet": len(engine.vehicles),
+        "days": scenario["days"],
+        **results,
+        "steps": steps,
+        "wall_time": time.time() - start,
+    }
+
+
+def run_batch(scenarios, workers=None, verbose=False):
+    """Jalankan semua skenario paralel di ProcessPoolExecutor, urutan hasil = urutan input"""
+    rows = [None] * len(scenarios)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_scenario, sc, verbose): i for i, sc in enumerate(scenarios)}
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            try:
+                rows[i] = future.result()
+            except Exception as e:
+                rows[i] = {"name": scenarios[i]["name"], "seed": scenarios[i]["seed"], "error": repr(e)}
+            print(f"[Batch] {done}/{len(scenarios)} selesai: {scenarios[i]['name']}")
+    return rows
+
+
+# ============== OUTPUT ==============
+def _fmt(value):
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return "" if value is None else str(value)
+
+
+def print_table(rows):
+    columns = [c for c in SUMMARY_COLUMNS if any(c in row for row in rows)]
+    if any("error" in row for row in rows):
+        columns.append("error")
+
+    cells = [[_fmt(row.get(c)) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+
+    print("  ".join(c.rjust(w) for c, w in zip(columns, widths)))
+    print("  ".join("-" * w for w in widths))
+    for r in cells:
+        print("  ".join(v.rjust(w) for v, w in zip(r, widths)))
+
+
+def write_csv(rows, path):
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"[Batch] Hasil disimpan ke {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch eksperimen dispatch: banyak seed/skenario paralel (headless)")
+    parser.add_argument("--scenarios", default=None,
+                        help="File JSON list skenario (graph, node_data, edge_data, fleet, days, seed, ...)")
+    parser.add_argument("--graph", default=GRAPH_FILE, help="File graphml (jika tanpa --scenarios)")
+    parser.add_argument("--node-data", default=None, help="File JSON node (default: data/saved/<graph>_node_data.json)")
+    parser.add_argument("--edge-data", default=None, help="File JSON edge (default: data/saved/<graph>_edge_data.json)")
+    parser.add_argument("--fleet", default=None, help="Jumlah truk, mis. '2,3,4' atau '2-6' (default: data garasi)")
+    parser.add_argument("--seeds", default="0", help="Seed, mis. '0-9'")
+    parser.add_argument("--days", type=int, default=1, help="Lama simulasi per skenario (hari)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Multiplier kecepatan simulasi")
+    parser.add_argument("--fixed-step", action="store_true", help="Pakai timestep tetap, bukan event-driven")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah process (default: semua core)")
+    parser.add_argument("--out", default=None, help="Simpan semua kolom hasil ke CSV")
+    parser.add_argument("--verbose", action="store_true", help="Tampilkan log simulasi dari setiap worker")
+    args = parser.parse_args()
+
+    if args.scenarios:
+        scenarios = load_scenarios(args.scenarios)
+    else:
+        fleets = parse_int_list(args.fleet) if args.fleet else [None]
+        scenarios = [
+            make_scenario(args.graph, args.node_data, args.edge_data, fleet, args.days, seed,
+                          args.speed, not args.fixed_step)
+            for fleet, seed in itertools.product(fleets, parse_int_list(args.seeds))
+        ]
+
+    print(f"[Batch] {len(scenarios)} skenario, workers={args.workers or os.cpu_count()}")
+    start = time.time()
+    rows = run_batch(scenarios, args.workers, args.verbose)
+    print(f"[Batch] Total waktu: {time.time() - start:.2f}s\n")
+
+    print_table(rows)
+    if args.out:
+        write_csv(rows, args.out)
+
+
+if __name__ == "__main__":
+    main()
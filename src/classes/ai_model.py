@@ -1,6 +1,10 @@
-import networkx as nx
+import numpy as np
 from collections import defaultdict
+from ..utils.shortest_paths import ShortestPathTrees, shortest_path_excluding
 from ..environment import SHIFT_START, SHIFT_END, VEHICLE_SPEED
+from ..utils.logger import get_logger
+
+log = get_logger("AIModel")
 
 class AIModel:
     """
@@ -34,13 +38,28 @@ class AIModel:
         self.total_garbage_collected = 0
         self.reschedule_count = 0
 
-        # Historical knowledge about bad edges discovered earlier in the day
+        # Historical knowledge about bad edges discovered earlier in the day (edge index)
         self.historical_bad_edges = set()
 
         # Track when vehicle was last rerouted to prevent too-frequent rerouting
         self.vehicle_last_reroute_time = {}  # vehicle_id -> sim_time
 
-        print("[AIModel] Initialized with Matheuristic Rollout Controller")
+        # Dynamic shortest-path trees (bobot penalti) menuju TPA, garasi, dan TPS.
+        # Hanya subtree yang terdampak yang diperbaiki saat slowdown/bad edge berubah.
+        self.graph_index = self.knowledge.graph_index
+        self.bad_edge_mask = np.zeros(self.graph_index.num_edges, dtype=bool)
+        weights = self._penalized_weights()
+        # Tanpa penalti (awal simulasi) bobotnya sama dengan oracle: salin pohonnya, tanpa Dijkstra ulang
+        same_weights = np.array_equal(weights, self.graph_index.length)
+        self.router = ShortestPathTrees(
+            self.graph_index,
+            self.knowledge.oracle.roots,
+            weights=weights,
+            cached=self.knowledge.oracle if same_weights else None
+        )
+        self.knowledge.add_slowdown_listener(self._update_edge_weight)
+
+        log.info("Initialized with Matheuristic Rollout Controller")
 
     # -------------------------
     # Main loop
@@ -52,7 +71,8 @@ class AIModel:
 
         self.last_decision_time += dt
 
-        if self.last_decision_time >= self.decision_interval:
+        # Toleransi kecil: engine event-driven melompat tepat ke waktu keputusan
+        if self.last_decision_time >= self.decision_interval - 1e-9:
             self.last_decision_time = 0
             self.make_decisions(vehicles)
 
@@ -81,14 +101,12 @@ class AIModel:
     # -------------------------
     def phase_dispatch(self, vehicles):
         """Dispatch semua truk dari garasi ke TPS optimal"""
-        print(f"\n{'='*50}")
-        print(f"[AIModel] PHASE: DISPATCH - Shift Start at {self.shared.sim_hour:02d}:00")
-        print(f"{'='*50}")
+        log.info("===== PHASE: DISPATCH - Shift Start at %02d:00 =====", self.shared.sim_hour)
 
         idle_vehicles = [v for v in vehicles if getattr(v, "state", "").lower() == "idle"]
 
         if not idle_vehicles:
-            print("[AIModel] No idle vehicles to dispatch")
+            log.info("No idle vehicles to dispatch")
             return
 
         tps_priorities = self._calculate_tps_priorities()
@@ -106,7 +124,7 @@ class AIModel:
                 "type": "collect",
                 "tps_id": tps_id,
                 "priority": priority,
-                "assigned_at": f"Day {self.shared.sim_day} {self.shared.sim_hour:02d}:{self.shared.sim_min:02d}"
+                "assigned_at": self.shared.sim_seconds
             }
 
             self._assign_task(vehicle, task)
@@ -123,11 +141,11 @@ class AIModel:
                         vehicle.G[path[i]][path[i+1]][0]['length'] 
                         for i in range(len(path)-1)
                     )
-                    print(f"[AIModel] ✓ Dispatched {vehicle.id} to TPS {tps_id} (priority: {priority:.2f}, distance: {path_distance:.0f}m)")
+                    log.info("✓ Dispatched %s to TPS %s (priority: %.2f, distance: %.0fm)", vehicle.id, tps_id, priority, path_distance)
             except Exception as e:
-                print(f"[AIModel] ✗ Failed to dispatch {vehicle.id} to TPS {tps_id}: {e}")
+                log.warning("✗ Failed to dispatch %s to TPS %s: %s", vehicle.id, tps_id, e)
 
-        print(f"[AIModel] Dispatch complete: {dispatched_count}/{len(idle_vehicles)} vehicles")
+        log.info("Dispatch complete: %s/%s vehicles", dispatched_count, len(idle_vehicles))
 
     def _calculate_tps_priorities(self):
         """Calculate priority score untuk setiap TPS"""
@@ -166,37 +184,37 @@ class AIModel:
     def _handle_at_tps(self, vehicle):
         """Handle vehicle yang tiba di TPS"""
         if vehicle.actuator_is_full():
-            print(f"[AIModel] Vehicle {vehicle.id} already full ({vehicle.load:.2f} kg) - routing to TPA")
+            log.info("Vehicle %s already full (%.2f kg) - routing to TPA", vehicle.id, vehicle.load)
             self._route_to_tpa(vehicle)
             return
 
         loaded = vehicle.actuator_load_from_tps()
 
         if loaded > 0:
-            print(f"[AIModel] Vehicle {vehicle.id} loaded {loaded:.2f} kg at TPS {vehicle.current}")
+            log.info("Vehicle %s loaded %.2f kg at TPS %s", vehicle.id, loaded, vehicle.current)
             self.total_garbage_collected += loaded
 
         if vehicle.actuator_is_full():
-            print(f"[AIModel] Vehicle {vehicle.id} is full ({vehicle.load:.2f} kg) - routing to TPA")
+            log.info("Vehicle %s is full (%.2f kg) - routing to TPA", vehicle.id, vehicle.load)
             self._route_to_tpa(vehicle)
         else:
             tps_data = self.shared.node_type[vehicle.current].get("tps_data", {})
             remaining = tps_data.get("sampah_kg", 0)
 
             if remaining > 10:
-                print(f"[AIModel] Vehicle {vehicle.id} staying at TPS {vehicle.current} (remaining: {remaining:.2f} kg)")
+                log.info("Vehicle %s staying at TPS %s (remaining: %.2f kg)", vehicle.id, vehicle.current, remaining)
                 vehicle.state = "at_tps"
             else:
                 next_tps = self._find_next_tps(vehicle)
                 if next_tps:
-                    print(f"[AIModel] Vehicle {vehicle.id} moving to next TPS {next_tps}")
+                    log.info("Vehicle %s moving to next TPS %s", vehicle.id, next_tps)
                     self._route_to_location(vehicle, next_tps, "to_tps")
                 else:
                     if vehicle.load > 0:
-                        print(f"[AIModel] Vehicle {vehicle.id} has load ({vehicle.load:.2f} kg) - going to TPA")
+                        log.info("Vehicle %s has load (%.2f kg) - going to TPA", vehicle.id, vehicle.load)
                         self._route_to_tpa(vehicle)
                     else:
-                        print(f"[AIModel] Vehicle {vehicle.id} empty and no TPS - returning to garage")
+                        log.info("Vehicle %s empty and no TPS - returning to garage", vehicle.id)
                         self._route_to_garage(vehicle)
 
     def _handle_at_tpa(self, vehicle):
@@ -204,21 +222,22 @@ class AIModel:
         unloaded = vehicle.actuator_unload_to_tpa()
 
         if unloaded > 0:
-            print(f"[AIModel] Vehicle {vehicle.id} unloaded {unloaded:.2f} kg at TPA")
+            log.info("Vehicle %s unloaded %.2f kg at TPA", vehicle.id, unloaded)
             self.total_trips += 1
 
         next_tps = self._find_next_tps(vehicle)
         if next_tps:
-            print(f"[AIModel] Vehicle {vehicle.id} going to next TPS {next_tps}")
+            log.info("Vehicle %s going to next TPS %s", vehicle.id, next_tps)
             self._route_to_location(vehicle, next_tps, "to_tps")
         else:
-            print(f"[AIModel] Vehicle {vehicle.id} returning to garage")
+            log.info("Vehicle %s returning to garage", vehicle.id)
             self._route_to_garage(vehicle)
 
     def _find_next_tps(self, vehicle):
         """Find next TPS dengan sampah paling banyak yang belum diassign terlalu banyak"""
         best_tps = None
         best_score = 0
+        distances = self.knowledge.get_tps_distances(vehicle.current)
 
         for tps_id in self.knowledge.TPS_nodes:
             discovered = self.knowledge.get_discovered_garbage(tps_id)
@@ -231,8 +250,7 @@ class AIModel:
             if garbage <= 0:
                 continue
 
-            path = self.knowledge.get_shortest_path(vehicle.current, tps_id)
-            distance = self.knowledge.get_route_distance(path) if path else float('inf')
+            distance = distances.get(tps_id, float('inf'))
 
             if distance > 10000:
                 continue
@@ -257,28 +275,29 @@ class AIModel:
         
         FIXED: Sekarang memeriksa SELURUH path, bukan hanya next edge
         """
-        current_sim_time = self.shared.sim_hour * 3600 + self.shared.sim_min * 60
+        # Jam monotonic engine (tidak wrap di tengah malam seperti hour*3600+min*60)
+        current_sim_time = self.shared.sim_seconds
 
         # Phase 1: Update historical bad edges dari vehicles yang sedang di dalam edge macet
         for vehicle in vehicles:
-            if getattr(vehicle, "target_node", None) is not None and getattr(vehicle, "current", None) is not None:
-                edge_id = f"{vehicle.current}-{vehicle.target_node}"
-                slowdown = self.knowledge.get_slowdown(edge_id)
+            edge = getattr(vehicle, "edge_idx", -1)
+            if edge >= 0:
+                slowdown = self.knowledge.get_slowdown(edge)
                 progress = getattr(vehicle, "progress", 0.0)
                 
                 # Vehicle sedang traverse edge yang macet
                 if slowdown is not None and progress > 0.0:
                     severe_threshold = max(1.0, VEHICLE_SPEED * 0.5)
                     if slowdown < severe_threshold:
-                        if edge_id not in self.historical_bad_edges:
-                            self.historical_bad_edges.add(edge_id)
-                            print(f"[AIModel] 🚨 Marked historical bad edge: {edge_id} (speed {slowdown:.1f} km/h)")
+                        if edge not in self.historical_bad_edges:
+                            self._mark_bad_edge(edge)
+                            log.warning("🚨 Marked historical bad edge: %s (speed %.1f km/h)", self.graph_index.edge_label(edge), slowdown)
 
         # Phase 2: Reroute vehicles yang akan melewati bad edges
         for vehicle in vehicles:
             # Skip stuck vehicles
             if self._is_vehicle_stuck(vehicle):
-                print(f"[AIModel] 🚨 Vehicle {vehicle.id} is stuck - rescheduling")
+                log.warning("🚨 Vehicle %s is stuck - rescheduling", vehicle.id)
                 self._reschedule_vehicle(vehicle)
                 self.reschedule_count += 1
                 continue
@@ -320,13 +339,7 @@ class AIModel:
             avoid_edges = set(self.historical_bad_edges)
             
             # Also check for currently known slow edges in the path
-            for i in range(len(path) - 1):
-                edge_id = f"{path[i]}-{path[i+1]}"
-                slowdown = self.knowledge.get_slowdown(edge_id)
-                if slowdown is not None:
-                    severe_threshold = max(1.0, VEHICLE_SPEED * 0.5)
-                    if slowdown < severe_threshold:
-                        avoid_edges.add(edge_id)
+            avoid_edges.update(bad_edges_in_path)
 
             # Attempt reroute
             new_path = self._shortest_path_excluding_edges(
@@ -356,38 +369,30 @@ class AIModel:
                         vehicle.set_path(new_path)
                         self.vehicle_last_reroute_time[vehicle.id] = current_sim_time
                         
-                        print(f"[AIModel] ✓ Rerouted {vehicle.id}: avoided {len(bad_edges_in_path)} slow edges")
-                        print(f"    Old distance: {old_distance:.0f}m, New distance: {new_distance:.0f}m")
-                        print(f"    Avoided edges: {', '.join(bad_edges_in_path)}")
+                        log.info("✓ Rerouted %s: avoided %s slow edges", vehicle.id, len(bad_edges_in_path))
+                        log.info("    Old distance: %.0fm, New distance: %.0fm", old_distance, new_distance)
+                        log.debug("    Avoided edges: %s", [self.graph_index.edge_label(e) for e in bad_edges_in_path])
                     else:
-                        print(f"[AIModel] ✗ Alternative path for {vehicle.id} too long ({new_distance:.0f}m vs {old_distance:.0f}m)")
+                        log.info("✗ Alternative path for %s too long (%.0fm vs %.0fm)", vehicle.id, new_distance, old_distance)
                 else:
-                    print(f"[AIModel] ✗ No better alternative for {vehicle.id} (still has {len(new_bad_edges)} slow edges)")
+                    log.info("✗ No better alternative for %s (still has %s slow edges)", vehicle.id, len(new_bad_edges))
             else:
-                print(f"[AIModel] ✗ No alternative path found for {vehicle.id}")
+                log.info("✗ No alternative path found for %s", vehicle.id)
 
     def _find_bad_edges_in_path(self, vehicle, path):
         """
         CRITICAL: Find all slow/bad edges in the given path
-        Returns list of edge_ids that are slow
+        Returns list of edge index that are slow (historical bad atau slowdown parah)
         """
-        bad_edges = []
+        edges = np.asarray(self.graph_index.path_edges(path), dtype=np.int64)
+        edges = edges[edges >= 0]
+        if len(edges) == 0:
+            return []
+
         severe_threshold = max(1.0, VEHICLE_SPEED * 0.5)
-        
-        for i in range(len(path) - 1):
-            edge_id = f"{path[i]}-{path[i+1]}"
-            
-            # Check if edge is in historical bad edges
-            if edge_id in self.historical_bad_edges:
-                bad_edges.append(edge_id)
-                continue
-            
-            # Check current slowdown value
-            slowdown = self.knowledge.get_slowdown(edge_id)
-            if slowdown is not None and slowdown < severe_threshold:
-                bad_edges.append(edge_id)
-        
-        return bad_edges
+        slowdown = self.graph_index.discovered_slowdown[edges]
+        is_bad = self.bad_edge_mask[edges] | ((slowdown > 0) & (slowdown < severe_threshold))
+        return edges[is_bad].tolist()
 
     def _get_vehicle_destination(self, vehicle):
         """
@@ -412,53 +417,17 @@ class AIModel:
     def _shortest_path_excluding_edges(self, G, source, target, exclude_edges):
         """
         Find shortest path from source to target while excluding edges in exclude_edges.
-        exclude_edges: set of strings "u-v"
+        exclude_edges: set of edge index (kedua arah ikut dihindari)
         Returns path list or None.
         """
         if source == target:
             return [source]
 
-        # Create a copy of graph and remove excluded edges
-        G2 = G.copy()
-        removed_count = 0
-        
-        for e in list(exclude_edges):
-            try:
-                u_str, v_str = e.split("-", 1)
-                u = self._maybe_cast_node(u_str)
-                v = self._maybe_cast_node(v_str)
-            except Exception:
-                continue
-
-            # Remove both directions (for undirected behavior)
-            if G2.has_edge(u, v):
-                try:
-                    G2.remove_edge(u, v)
-                    removed_count += 1
-                except Exception:
-                    pass
-            if G2.has_edge(v, u):
-                try:
-                    G2.remove_edge(v, u)
-                    removed_count += 1
-                except Exception:
-                    pass
-
-        # Try shortest path on modified graph
-        try:
-            path = nx.shortest_path(G2, source, target, weight="length")
-            return path
-        except nx.NetworkXNoPath:
-            return None
-        except Exception:
-            return None
-
-    def _maybe_cast_node(self, s):
-        """Try to cast node id strings back to ints if needed"""
-        try:
-            return int(s)
-        except Exception:
-            return s
+        # Masked-edge search di CSR: tanpa G.copy() dan tanpa parsing node id
+        banned = set(exclude_edges)
+        for e in exclude_edges:
+            banned.update(self.graph_index.reverse_edges(e))
+        return shortest_path_excluding(self.graph_index, self.graph_index.length_list, source, target, banned)
 
     def _is_vehicle_stuck(self, vehicle):
         """Check if vehicle stuck"""
@@ -469,7 +438,7 @@ class AIModel:
         if vehicle.id in self.assigned_tasks:
             old_task = self.assigned_tasks[vehicle.id]
             del self.assigned_tasks[vehicle.id]
-            print(f"[AIModel] Cleared task for {vehicle.id}: {old_task}")
+            log.info("Cleared task for %s: %s", vehicle.id, old_task)
 
         vehicle.actuator_idle()
         self._reassign_vehicle(vehicle)
@@ -477,63 +446,56 @@ class AIModel:
     # -------------------------
     # Path helpers
     # -------------------------
-    def _path_contains_edge(self, path, edge_id):
+    def _path_contains_edge(self, path, edge):
         """
-        Check if path contains specific edge
+        Check if path contains specific edge index
         """
         if not path or len(path) < 2:
             return False
-        edge_set = { f"{path[i]}-{path[i+1]}" for i in range(len(path)-1) }
-        return edge_id in edge_set
+        return edge in self.graph_index.path_edges(path)
 
-    def _get_optimal_path(self, start, end, G, allow_force=False):
+    def _penalized_weights(self):
+        """
+        Bobot penalti per edge index (vectorized): length * penalti slowdown
+        yang diketahui * penalti historical bad edge.
+        """
+        slowdown = self.graph_index.discovered_slowdown
+        # Inverse speed penalty: slower = higher penalty
+        penalty = np.where(slowdown > 0, VEHICLE_SPEED / np.maximum(slowdown, 0.1), 1.0)
+        # Historical bad edge penalty
+        penalty[self.bad_edge_mask] *= 5.0  # Strong penalty
+        return self.graph_index.length * penalty
+
+    def _edge_weight(self, e):
+        slowdown = self.graph_index.discovered_slowdown[e]
+        penalty = VEHICLE_SPEED / max(slowdown, 0.1) if slowdown > 0 else 1.0
+        if self.bad_edge_mask[e]:
+            penalty *= 5.0
+        return self.graph_index.length[e] * penalty
+
+    def _update_edge_weight(self, e):
+        """Sinkronkan bobot router untuk satu edge index (dipanggil saat slowdown/bad edge berubah)"""
+        self.router.set_edge_weight(e, self._edge_weight(e))
+
+    def _mark_bad_edge(self, e):
+        self.historical_bad_edges.add(e)
+        self.bad_edge_mask[e] = True
+        self._update_edge_weight(e)
+
+    def _get_optimal_path(self, start, end, G):
         """
         Get optimal path dengan penalti slowdown + historical congestion.
-        Jika tidak ada jalur alternatif, fallback ke shortest path normal.
+        Tujuan TPA/garasi/TPS dijawab langsung dari dynamic shortest-path tree,
+        tujuan lain dicari di CSR dengan bobot penalti yang sama.
         """
+        if self.router.has_root(end):
+            return self.router.path(start, end)
+        return shortest_path_excluding(self.graph_index, self.router.weight_list, start, end)
 
-        def edge_weight(u, v, d):
-            base_length = d.get('length', 1)
-            edge_id = f"{u}-{v}"
-
-            slowdown = self.knowledge.get_slowdown(edge_id)
-            penalty = 1.0
-
-            if slowdown is not None and slowdown > 0:
-                try:
-                    # Inverse speed penalty: slower = higher penalty
-                    penalty *= (VEHICLE_SPEED / max(slowdown, 0.1))
-                except Exception:
-                    penalty *= 5.0
-
-            # Historical bad edge penalty
-            if edge_id in self.historical_bad_edges:
-                penalty *= 5.0  # Strong penalty
-
-            return base_length * penalty
-
-        try:
-            path = nx.shortest_path(G, start, end, weight=edge_weight)
-            return path
-
-        except Exception:
-            # Fallback: try without penalty
-            if allow_force:
-                try:
-                    path = nx.shortest_path(G, start, end, weight="length")
-                    return path
-                except Exception:
-                    return None
-
-            return self._get_optimal_path(start, end, G, allow_force=True)
-
-    # -------------------------
-    # Reassignment + Ending
-    # -------------------------
     def _reassign_vehicle(self, vehicle):
         """Reassign idle vehicle to new task"""
         if getattr(vehicle, "load", 0) > 0:
-            print(f"[AIModel] Vehicle {vehicle.id} has load ({vehicle.load:.2f} kg) - sending to TPA before new task")
+            log.info("Vehicle %s has load (%.2f kg) - sending to TPA before new task", vehicle.id, vehicle.load)
             self._route_to_tpa(vehicle)
             return
 
@@ -543,35 +505,33 @@ class AIModel:
             task = {
                 "type": "collect",
                 "tps_id": next_tps,
-                "assigned_at": f"Day {self.shared.sim_day} {self.shared.sim_hour:02d}:{self.shared.sim_min:02d}"
+                "assigned_at": self.shared.sim_seconds
             }
             self._assign_task(vehicle, task)
             self._route_to_location(vehicle, next_tps, "to_tps")
-            print(f"[AIModel] Reassigned {vehicle.id} to TPS {next_tps}")
+            log.info("Reassigned %s to TPS %s", vehicle.id, next_tps)
         else:
-            print(f"[AIModel] No TPS for {vehicle.id} - returning to garage")
+            log.info("No TPS for %s - returning to garage", vehicle.id)
             self._route_to_garage(vehicle)
 
     def phase_ending(self, vehicles):
         """Return all vehicles to garage before overtime"""
-        print(f"\n{'='*50}")
-        print(f"[AIModel] PHASE: ENDING - Shift End Approaching at {self.shared.sim_hour:02d}:00")
-        print(f"{'='*50}")
+        log.info("===== PHASE: ENDING - Shift End Approaching at %02d:00 =====", self.shared.sim_hour)
 
         for vehicle in vehicles:
             if vehicle.state != "to_garage" and vehicle.state != "idle":
 
                 if vehicle.load > 0 and vehicle.state != "to_tpa" and vehicle.state != "at_tpa":
-                    print(f"[AIModel] Vehicle {vehicle.id} has load ({vehicle.load:.2f} kg) - routing to TPA before garage")
+                    log.info("Vehicle %s has load (%.2f kg) - routing to TPA before garage", vehicle.id, vehicle.load)
                     self._route_to_tpa(vehicle)
                     continue
 
                 if vehicle.state == "at_tpa":
                     vehicle.actuator_unload_to_tpa()
-                    print(f"[AIModel] Vehicle {vehicle.id} unloading before return")
+                    log.info("Vehicle %s unloading before return", vehicle.id)
 
                 if vehicle.load == 0:
-                    print(f"[AIModel] Recalling vehicle {vehicle.id} to garage")
+                    log.info("Recalling vehicle %s to garage", vehicle.id)
                     self._route_to_garage(vehicle)
 
             if vehicle.id in self.assigned_tasks:
@@ -583,19 +543,19 @@ class AIModel:
     def _route_to_tpa(self, vehicle):
         """Route vehicle to TPA using optimal path that avoids bad edges"""
         if not vehicle.TPA_node:
-            print(f"[AIModel] ERROR: No TPA_node configured for {vehicle.id}!")
+            log.error("No TPA_node configured for %s!", vehicle.id)
             return False
         
         if isinstance(vehicle.TPA_node, (set, list)):
             if len(vehicle.TPA_node) == 0:
-                print(f"[AIModel] ERROR: TPA_node is empty for {vehicle.id}!")
+                log.error("TPA_node is empty for %s!", vehicle.id)
                 return False
             tpa_target = list(vehicle.TPA_node)[0]
         else:
             tpa_target = vehicle.TPA_node
         
         if vehicle.current == tpa_target:
-            print(f"[AIModel] Vehicle {vehicle.id} already at TPA {tpa_target}")
+            log.info("Vehicle %s already at TPA %s", vehicle.id, tpa_target)
             vehicle.state = "at_tpa"
             return True
         
@@ -603,7 +563,7 @@ class AIModel:
         path = self._get_optimal_path(vehicle.current, tpa_target, vehicle.G)
         
         if not path or len(path) < 2:
-            print(f"[AIModel] ERROR: No path to TPA for {vehicle.id}!")
+            log.error("No path to TPA for %s!", vehicle.id)
             return False
         
         vehicle.set_path(path)
@@ -613,13 +573,13 @@ class AIModel:
             vehicle.G[path[i]][path[i+1]][0]['length'] 
             for i in range(len(path)-1)
         )
-        print(f"[AIModel] 🚛 Routing {vehicle.id} to TPA {tpa_target} (distance: {path_distance:.0f}m, avoiding {len(self.historical_bad_edges)} known slow edges)")
+        log.info("🚛 Routing %s to TPA %s (distance: %.0fm, avoiding %s known slow edges)", vehicle.id, tpa_target, path_distance, len(self.historical_bad_edges))
         return True
 
     def _route_to_garage(self, vehicle):
         """Route vehicle to garage using optimal path that avoids bad edges"""
         if not vehicle.garage_node:
-            print(f"[AIModel] ERROR: No garage for {vehicle.id}!")
+            log.error("No garage for %s!", vehicle.id)
             return False
         
         if vehicle.current == vehicle.garage_node:
@@ -630,7 +590,7 @@ class AIModel:
         path = self._get_optimal_path(vehicle.current, vehicle.garage_node, vehicle.G)
         
         if not path:
-            print(f"[AIModel] ERROR: No path to garage for {vehicle.id}!")
+            log.error("No path to garage for %s!", vehicle.id)
             return False
         
         vehicle.set_path(path)
@@ -640,7 +600,7 @@ class AIModel:
             vehicle.G[path[i]][path[i+1]][0]['length'] 
             for i in range(len(path)-1)
         )
-        print(f"[AIModel] 🏠 Routing {vehicle.id} to garage (distance: {path_distance:.0f}m)")
+        log.info("🏠 Routing %s to garage (distance: %.0fm)", vehicle.id, path_distance)
         return True
 
     def _route_to_location(self, vehicle, target_node, new_state):
@@ -653,7 +613,7 @@ class AIModel:
         path = self._get_optimal_path(vehicle.current, target_node, vehicle.G)
         
         if not path:
-            print(f"[AIModel] ERROR: No path to {target_node} for {vehicle.id}!")
+            log.error("No path to %s for %s!", target_node, vehicle.id)
             return False
         
         vehicle.set_path(path)
@@ -667,9 +627,9 @@ class AIModel:
         # Check if path contains any bad edges
         bad_edges_in_path = self._find_bad_edges_in_path(vehicle, path)
         if bad_edges_in_path:
-            print(f"[AIModel] ⚠️ Routing {vehicle.id} to {target_node} (distance: {path_distance:.0f}m) - WARNING: path contains {len(bad_edges_in_path)} slow edges (unavoidable)")
+            log.warning("⚠️ Routing %s to %s (distance: %.0fm) - path contains %s slow edges (unavoidable)", vehicle.id, target_node, path_distance, len(bad_edges_in_path))
         else:
-            print(f"[AIModel] ✓ Routing {vehicle.id} to {target_node} (distance: {path_distance:.0f}m)")
+            log.info("✓ Routing %s to %s (distance: %.0fm)", vehicle.id, target_node, path_distance)
         
         return True
 
@@ -705,6 +665,10 @@ class AIModel:
         self.current_phase = "IDLE"
         self.assigned_tasks.clear()
         self.tps_assignments.clear()
+        cleared_edges = list(self.historical_bad_edges)
         self.historical_bad_edges.clear()
+        self.bad_edge_mask[:] = False
+        for e in cleared_edges:
+            self._update_edge_weight(e)
         self.vehicle_last_reroute_time.clear()
-        print(f"[AIModel] Daily reset complete for Day {self.shared.sim_day}")
\ No newline at end of file
+        log.info("Daily reset complete for Day %s", self.shared.sim_day)
\ No newline at end of file
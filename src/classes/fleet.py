@@ -0,0 +1,225 @@
+import heapq
+import numpy as np
+from ..environment import VEHICLE_SPEED, VEHICLE_CAP, VEHICLE_CARRY_LEFTOVER
+
+# State kendaraan yang diam dengan sengaja (tidak dianggap stuck saat tidak punya path)
+REST_STATES = ("idle", "at_tps", "at_tpa")
+
+
+class FleetState:
+    """
+    Penyimpanan state armada dalam bentuk struct-of-arrays.
+
+    Setiap kendaraan punya satu slot; node sekarang/target (node index
+    GraphIndex, -1 = None), cursor posisi di path, edge index yang sedang dilalui, progress,
+    kecepatan, muatan dan jarak tempuh disimpan di array NumPy per slot.
+    Objek Vehicle hanya view tipis ke slot-nya, sehingga pergerakan semua truk
+    bisa dimajukan sekaligus dalam satu langkah vectorized (step). Transisi
+    (edge selesai, sampai tujuan, slowdown ditemukan) tetap ditangani di
+    Python, tapi hanya untuk slot yang mengalaminya.
+    """
+
+    def __init__(self, index, capacity=64, carry_leftover=VEHICLE_CARRY_LEFTOVER):
+        self.index = index
+        self.size = 0
+        self.vehicles = []
+
+        # True: sisa waktu tick setelah edge selesai dipakai untuk edge berikutnya
+        # (bisa melewati beberapa edge pendek dalam satu dt). False: perilaku lama,
+        # sisa dibuang dan maksimal satu node per frame.
+        self.carry_leftover = carry_leftover
+
+        self.node = np.full(capacity, -1, dtype=np.int32)
+        self.target = np.full(capacity, -1, dtype=np.int32)
+        self.cursor = np.zeros(capacity, dtype=np.int32)  # path[cursor] == node sekarang
+        self.edge = np.full(capacity, -1, dtype=np.int32)
+        self.progress = np.zeros(capacity, dtype=np.float64)
+        self.speed = np.full(capacity, VEHICLE_SPEED, dtype=np.float64)
+        self.load = np.zeros(capacity, dtype=np.float64)
+        self.max_load = np.full(capacity, VEHICLE_CAP, dtype=np.float64)
+        self.daily_dist = np.zeros(capacity, dtype=np.float64)
+        self.total_dist = np.zeros(capacity, dtype=np.float64)
+        self.resting = np.ones(capacity, dtype=bool)
+        # Naik setiap kali path/kecepatan kendaraan diganti dari luar (untuk
+        # invalidasi event kedatangan di mode event-driven)
+        self.version = np.zeros(capacity, dtype=np.int64)
+        # True jika state/node/muatan/kapasitas berubah sejak terakhir dibaca KnowledgeModel
+        self.status_dirty = np.ones(capacity, dtype=bool)
+
+    def _grow(self):
+        capacity = max(1, len(self.edge)) * 2
+        for name in ("node", "target", "cursor", "edge", "progress", "speed", "load", "max_load",
+                     "daily_dist", "total_dist", "resting", "version", "status_dirty"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, vehicle):
+        """Daftarkan kendaraan baru, return nomor slot-nya"""
+        if self.size == len(self.edge):
+            self._grow()
+
+        slot = self.size
+        self.node[slot] = -1
+        self.target[slot] = -1
+        self.cursor[slot] = 0
+        self.edge[slot] = -1
+        self.progress[slot] = 0.0
+        self.speed[slot] = VEHICLE_SPEED
+        self.load[slot] = 0.0
+        self.max_load[slot] = VEHICLE_CAP
+        self.daily_dist[slot] = 0.0
+        self.total_dist[slot] = 0.0
+        self.resting[slot] = True
+        self.version[slot] = 0
+        self.status_dirty[slot] = True
+
+        self.vehicles.append(vehicle)
+        self.size += 1
+        return slot
+
+    # ============== STEP ==============
+    def step(self, dt, shared, slots=None):
+        """
+        Majukan semua kendaraan (atau hanya `slots`) sebesar dt.
+        Kecepatan per edge = speed (atau nilai slowdown edge) * shared.speed;
+        budget waktu dt dihabiskan lintas edge (lihat _cross_edges).
+        """
+        if shared.paused or self.size == 0:
+            return
+
+        n = self.size
+        edge = self.edge[:n]
+
+        # Kendaraan tanpa edge yang tidak sedang istirahat (dicek sebelum bergerak,
+        # supaya kendaraan yang baru sampai tidak langsung dianggap stuck)
+        if slots is None:
+            on_edge = edge >= 0
+            stopped = np.flatnonzero(~(on_edge | self.resting[:n]))
+            moving = np.flatnonzero(on_edge)
+        else:
+            slots = np.asarray(slots, dtype=np.int64)
+            on_edge = edge[slots] >= 0
+            stopped = slots[~(on_edge | self.resting[slots])]
+            moving = slots[on_edge]
+
+        if len(moving):
+            e = edge[moving]
+            length = self.index.length[e]
+            slowdown = self.index.slowdown[e]
+            speed = np.where(slowdown > 0, slowdown, self.speed[moving]) * shared.speed
+
+            # Waktu (dalam satuan dt) sampai ujung edge sekarang
+            remaining = (1.0 - self.progress[moving]) * length
+            with np.errstate(divide="ignore", invalid="ignore"):
+                time_to_end = np.where(speed > 0, remaining / speed, np.inf)
+
+            # Mayoritas: masih di tengah edge, cukup satu update vectorized
+            inside = time_to_end > dt
+            cruising = moving[inside]
+            distance = speed[inside] * dt
+            self.progress[cruising] += distance / length[inside]
+            self.daily_dist[cruising] += distance / 1000
+            self.total_dist[cruising] += distance / 1000
+
+            # Sisanya sampai di ujung edge dalam tick ini: jarak yang dihitung
+            # hanya sampai node (bukan lewat), sisa waktu diproses di _cross_edges
+            crossing = moving[~inside]
+            self.progress[crossing] = 1.0
+            self.daily_dist[crossing] += remaining[~inside] / 1000
+            self.total_dist[crossing] += remaining[~inside] / 1000
+
+            if len(crossing):
+                self._cross_edges(dt, shared, crossing.tolist(), time_to_end[~inside].tolist())
+
+        for slot in stopped.tolist():
+            self.vehicles[slot]._check_stopped()
+
+    def _cross_edges(self, dt, shared, slots, arrive_times):
+        """
+        Proses kendaraan yang mencapai node dalam tick ini, urut berdasarkan
+        waktu sampai (event TPS/TPA/garasi terjadi sesuai urutan sebenarnya).
+        Dengan carry_leftover, sisa waktu tick dipakai untuk edge berikutnya,
+        sehingga satu tick bisa melewati banyak edge pendek di speed tinggi.
+        """
+        length = self.index.length
+        slowdown = self.index.slowdown
+
+        events = list(zip(arrive_times, slots))
+        heapq.heapify(events)
+
+        while events:
+            t, slot = heapq.heappop(events)
+            vehicle = self.vehicles[slot]
+            if not vehicle._complete_edge(shared) or not self.carry_leftover:
+                continue
+
+            e = self.edge.item(slot)
+            sd = slowdown.item(e)
+            speed = (sd if sd > 0 else self.speed.item(slot)) * shared.speed
+
+            budget = dt - t
+            edge_len = length.item(e)
+            edge_time = edge_len / speed if speed > 0 else float("inf")
+
+            if edge_time > budget:
+                distance = speed * budget
+                self.progress[slot] = distance / edge_len
+            else:
+                distance = edge_len
+                self.progress[slot] = 1.0
+                heapq.heappush(events, (t + edge_time, slot))
+
+            self.daily_dist[slot] += distance / 1000
+            self.total_dist[slot] += distance / 1000
+
+    # ============== QUERIES ==============
+    def pop_status_changes(self):
+        """Slot yang status-nya berubah sejak panggilan terakhir (lalu flag di-reset)"""
+        dirty = self.status_dirty[:self.size]
+        if not dirty.any():
+            return ()
+        slots = np.flatnonzero(dirty).tolist()
+        dirty[:] = False
+        return slots
+
+    def time_to_path_end(self, slot, speed_multiplier):
+        """
+        Waktu (satuan dt) sampai kendaraan di slot mencapai ujung path-nya
+        dengan kecepatan/slowdown sekarang. None jika kendaraan tidak bergerak.
+        Jika path memuat pasangan node tanpa edge, dihitung sampai titik itu.
+        """
+        e = self.edge.item(slot)
+        if e < 0:
+            return None
+
+        vehicle = self.vehicles[slot]
+        rest = vehicle.path_edge_ids[self.cursor.item(slot) + 1:]
+        broken = np.flatnonzero(rest < 0)
+        if len(broken):
+            rest = rest[:broken[0]]
+
+        edges = np.concatenate(([e], rest))
+        slowdown = self.index.slowdown[edges]
+        speed = np.where(slowdown > 0, slowdown, self.speed.item(slot)) * speed_multiplier
+        if not (speed > 0).all():
+            return None
+
+        times = self.index.length[edges] / speed
+        times[0] *= 1.0 - self.progress.item(slot)
+        return float(times.sum())
+
+    def positions(self, node_xy, slots=None):
+        """
+        Posisi (V, 2) kendaraan di `slots` (default semua), interpolasi
+        node -> target sesuai progress. node_xy: koordinat per node index GraphIndex.
+        """
+        if slots is None:
+            slots = np.arange(self.size)
+        node = self.node[slots]
+        target = np.where(self.target[slots] >= 0, self.target[slots], node)
+        progress = np.where(self.edge[slots] >= 0, self.progress[slots], 0.0)
+
+        p1 = node_xy[node]
+        return p1 + (node_xy[target] - p1) * progress[:, None]
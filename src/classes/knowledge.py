@@ -1,4 +1,12 @@
 import networkx as nx
+from collections import defaultdict
+from ..utils.graph_index import GraphIndex
+from ..utils.shortest_paths import DistanceOracle
+from ..utils.distance_cache import load_trees
+from ..utils.garbage_history import GarbageHistory
+from ..utils.logger import get_logger
+
+log = get_logger("KnowledgeModel")
 
 class KnowledgeModel:
     
@@ -14,16 +22,33 @@ class KnowledgeModel:
         self.known_tps = {node_id: self._get_tps_static_info(node_id) for node_id in tps_nodes}
         self.known_tpa = {node_id: self._get_tpa_info(node_id) for node_id in tpa_nodes}
         
+        # ===== Distance oracle (Dijkstra tree per TPS/TPA/garasi, cache di data/saved) =====
+        self.graph_index = getattr(shared, "graph_index", None) or GraphIndex(graph)
+        self.oracle = load_trees(self.graph_index, list(tps_nodes) + list(tpa_nodes) + list(garage_nodes),
+                                 cls=DistanceOracle)
+        self._tps_list = [t for t in tps_nodes if self.oracle.has_root(t)]
+        self._tps_rows = [self.oracle.root_row[t] for t in self._tps_list]
 
         # ===== Discovered information (dinamis) =====
-        self.discovered_slowdowns = {}
+        self.discovered_slowdowns = {}  # edge index -> record
+        self.total_slowdown_encounters = 0
+        self.graph_index.discovered_slowdown[:] = 0.0
         self.discovered_garbage = {}
+        self.garbage_history = GarbageHistory()  # ring buffer (sim_time, kg) per TPS
+        self.slowdown_listeners = []
 
         
         # ===== Vehicle tracking =====
-        self.vehicle_statuses = {}
+        self.vehicle_statuses = {}  # vehicle_id -> record (dibuat sekali, diupdate in-place)
+        self.vehicles_by_state = defaultdict(dict)  # state -> {vehicle_id: None} (urutan tetap)
         self.vehicle_assignments = {}
         self.all_vehicle_ids = set()
+        self._slot_records = []  # slot FleetState -> record di vehicle_statuses
+
+        # Record semua kendaraan yang sudah ada dialokasikan sekarang, bukan saat pertama terlihat
+        fleet = getattr(shared, "fleet", None)
+        if fleet is not None:
+            self.sync_vehicle_statuses(fleet)
         
 
 
@@ -71,6 +96,8 @@ class KnowledgeModel:
         return self.known_tpa
     
     def get_shortest_path(self, start, end):
+        if self.oracle.has_root(end):
+            return self.oracle.path(start, end)
         try:
             return nx.shortest_path(self.graph, start, end, weight="length")
         except:
@@ -86,6 +113,17 @@ class KnowledgeModel:
             if edge_data:
                 total_dist += edge_data[0].get('length', 0)
         return total_dist
+
+    def get_distance(self, start, end):
+        if self.oracle.has_root(end):
+            return self.oracle.distance(start, end)
+        path = self.get_shortest_path(start, end)
+        return self.get_route_distance(path) if path else float('inf')
+
+    def get_tps_distances(self, start):
+        """Jarak start -> setiap TPS dari oracle (dict tps_id -> meter), O(#TPS)"""
+        dists = self.oracle.distances_from(start)[self._tps_rows].tolist()
+        return dict(zip(self._tps_list, dists))
     
 
 
@@ -93,26 +131,46 @@ class KnowledgeModel:
 
 
     # ============== DISCOVERED/DYNAMIC KNOWLEDGE ==============
-    def discover_slowdown(self, edge_id, slowdown_value):
-        if edge_id not in self.discovered_slowdowns:
-            self.discovered_slowdowns[edge_id] = {
+    def discover_slowdown(self, edge, slowdown_value):
+        """edge: edge index GraphIndex (bukan string "u-v")"""
+        self.total_slowdown_encounters += 1
+        record = self.discovered_slowdowns.get(edge)
+        if record is None:
+            self.discovered_slowdowns[edge] = {
                 "slowdown": slowdown_value,
-                "discovered_at": f"Day {self.shared.sim_day} {self.shared.sim_hour:02d}:{self.shared.sim_min:02d}",
+                "discovered_at": self.shared.sim_seconds,
+                "last_seen_at": self.shared.sim_seconds,
                 "times_encountered": 1
             }
-            print(f"[KnowledgeModel] 🚨 DISCOVERED slowdown at {edge_id}: {slowdown_value} km/jam")
+            self.graph_index.discovered_slowdown[edge] = slowdown_value
+            log.info("🚨 DISCOVERED slowdown at %s: %s km/jam", self.graph_index.edge_label(edge), slowdown_value,
+                     key=("slowdown", edge))
+            self._notify_slowdown(edge)
         else:
-            self.discovered_slowdowns[edge_id]["times_encountered"] += 1
+            record["times_encountered"] += 1
+            record["last_seen_at"] = self.shared.sim_seconds
             
-            if self.discovered_slowdowns[edge_id]["slowdown"] != slowdown_value:
-                old_value = self.discovered_slowdowns[edge_id]["slowdown"]
-                self.discovered_slowdowns[edge_id]["slowdown"] = slowdown_value
-                self.discovered_slowdowns[edge_id]["updated_at"] = f"Day {self.shared.sim_day} {self.shared.sim_hour:02d}:{self.shared.sim_min:02d}"
-                print(f"[KnowledgeModel] ⚠️ UPDATED slowdown at {edge_id}: {old_value} → {slowdown_value} km/jam")
-    
-    def get_slowdown(self, edge_id):
-        if edge_id in self.discovered_slowdowns:
-            return self.discovered_slowdowns[edge_id]["slowdown"]
+            if record["slowdown"] != slowdown_value:
+                old_value = record["slowdown"]
+                record["slowdown"] = slowdown_value
+                record["updated_at"] = self.shared.sim_seconds
+                self.graph_index.discovered_slowdown[edge] = slowdown_value
+                log.warning("⚠️ UPDATED slowdown at %s: %s → %s km/jam", self.graph_index.edge_label(edge), old_value, slowdown_value,
+                            key=("slowdown", edge))
+                self._notify_slowdown(edge)
+
+    def add_slowdown_listener(self, callback):
+        """callback(edge) dipanggil setiap kali nilai slowdown suatu edge index berubah"""
+        self.slowdown_listeners.append(callback)
+
+    def _notify_slowdown(self, edge):
+        for callback in self.slowdown_listeners:
+            callback(edge)
+    
+    def get_slowdown(self, edge):
+        record = self.discovered_slowdowns.get(edge)
+        if record is not None:
+            return record["slowdown"]
         return None
     
     def get_all_slowdowns(self):
@@ -120,56 +178,108 @@ class KnowledgeModel:
     
     def get_slowdown_count(self):
         return len(self.discovered_slowdowns)
+
+    def get_recent_slowdowns(self, window_seconds):
+        """Edge index yang slowdown-nya terlihat dalam window_seconds detik simulasi terakhir"""
+        since = self.shared.sim_seconds - window_seconds
+        return [edge for edge, record in self.discovered_slowdowns.items() if record["last_seen_at"] >= since]
     
     def discover_garbage(self, tps_id, sampah_kg, sim_time=None):
-        current_time = f"Day {self.shared.sim_day} {self.shared.sim_hour:02d}:{self.shared.sim_min:02d}" if sim_time is None else sim_time
-        
+        """sim_time: detik simulasi (default: jam engine sekarang)"""
+        current_time = self.shared.sim_seconds if sim_time is None else sim_time
+        self.garbage_history.append(tps_id, current_time, sampah_kg)
+
         if tps_id not in self.discovered_garbage:
             self.discovered_garbage[tps_id] = {
                 "sampah_kg": sampah_kg,
-                "last_check_time": current_time,
-                "history": [sampah_kg]
+                "last_check_time": current_time
             }
-            print(f"[KnowledgeModel] DISCOVERED garbage at TPS {tps_id}: {sampah_kg:.2f} kg (at {current_time})")
+            log.debug("DISCOVERED garbage at TPS %s: %.2f kg (at t=%ds)", tps_id, sampah_kg, current_time)
         else:
             old_amount = self.discovered_garbage[tps_id]["sampah_kg"]
             self.discovered_garbage[tps_id]["sampah_kg"] = sampah_kg
             self.discovered_garbage[tps_id]["last_check_time"] = current_time
-            self.discovered_garbage[tps_id]["history"].append(sampah_kg)
-            print(f"[KnowledgeModel] UPDATED garbage at TPS {tps_id}: {sampah_kg:.2f} kg (was {old_amount:.2f} at {current_time})")
+            log.debug("UPDATED garbage at TPS %s: %.2f kg (was %.2f, t=%ds)", tps_id, sampah_kg, old_amount, current_time)
     
     def get_discovered_garbage(self, tps_id):
         if tps_id in self.discovered_garbage:
             return self.discovered_garbage[tps_id]["sampah_kg"]
         return None
     
-    def get_garbage_history(self, tps_id):
-        if tps_id in self.discovered_garbage:
-            return self.discovered_garbage[tps_id]["history"]
-        return []
+    def get_garbage_history(self, tps_id, window_seconds=None):
+        """Array kg observasi TPS (terlama dulu), opsional hanya window_seconds terakhir"""
+        return self.garbage_history.get(tps_id, window_seconds, self.shared.sim_seconds)[1]
+
+    def get_garbage_trend(self, tps_id, window_seconds=None):
+        """(mean kg, trend kg/jam) observasi TPS dalam window, None jika data kurang"""
+        now = self.shared.sim_seconds
+        return (self.garbage_history.mean(tps_id, window_seconds, now),
+                self.garbage_history.trend(tps_id, window_seconds, now))
     
 
 
 
 
     # ============== VEHICLE TRACKER ==============
+    def _vehicle_record(self, vehicle_id):
+        record = self.vehicle_statuses.get(vehicle_id)
+        if record is None:
+            record = self.vehicle_statuses[vehicle_id] = {
+                "location": None, "load": 0, "load_percentage": 0, "state": None, "timestamp": None
+            }
+            self.all_vehicle_ids.add(vehicle_id)
+        return record
+
+    def _set_vehicle_state(self, vehicle_id, record, state):
+        if state != record["state"]:
+            self.vehicles_by_state[record["state"]].pop(vehicle_id, None)
+            self.vehicles_by_state[state][vehicle_id] = None
+            record["state"] = state
+
     def update_vehicle_status(self, vehicle_id, status):
-        self.all_vehicle_ids.add(vehicle_id)
-        self.vehicle_statuses[vehicle_id] = {
-            "status": status,
-            "location": status.get("current_node"),
-            "load": status.get("load", 0),
-            "load_percentage": status.get("load_percentage", 0),
-            "state": status.get("state"),
-            "timestamp": f"Day {self.shared.sim_day} {self.shared.sim_hour:02d}:{self.shared.sim_min:02d}"
-        }
-    
+        """Update dari dict status (mis. actuator_get_status); engine memakai sync_vehicle_statuses"""
+        record = self._vehicle_record(vehicle_id)
+        self._set_vehicle_state(vehicle_id, record, status.get("state"))
+        record["location"] = status.get("current_node")
+        record["load"] = status.get("load", 0)
+        record["load_percentage"] = status.get("load_percentage", 0)
+        record["timestamp"] = self.shared.sim_seconds
+
+    def sync_vehicle_statuses(self, fleet):
+        """
+        Update record hanya untuk slot yang berubah state/node/muatan
+        (FleetState.status_dirty). Nilai skalar dibaca langsung dari array
+        FleetState ke record yang sudah ada, tanpa membuat dict status baru.
+        """
+        vehicles = fleet.vehicles
+        records = self._slot_records
+        while len(records) < fleet.size:  # kendaraan baru: record dibuat sekali per slot
+            records.append(self._vehicle_record(vehicles[len(records)].id))
+
+        slots = fleet.pop_status_changes()
+        if not slots:
+            return
+
+        node_ids = fleet.index.node_ids
+        now = self.shared.sim_seconds
+        for slot in slots:
+            record = records[slot]
+            node = fleet.node.item(slot)
+            load = fleet.load.item(slot)
+            max_load = fleet.max_load.item(slot)
+
+            self._set_vehicle_state(vehicles[slot].id, record, vehicles[slot]._state)
+            record["location"] = node_ids[node] if node >= 0 else None
+            record["load"] = load
+            record["load_percentage"] = (load / max_load) * 100 if max_load > 0 else 0
+            record["timestamp"] = now
+
     def get_vehicle_status(self, vehicle_id):
         return self.vehicle_statuses.get(vehicle_id, None)
     
     def assign_task(self, vehicle_id, task):
         self.vehicle_assignments[vehicle_id] = task
-        print(f"[KnowledgeModel] ASSIGNED task to vehicle {vehicle_id}: {task}")
+        log.debug("ASSIGNED task to vehicle %s: %s", vehicle_id, task)
     
     def get_task(self, vehicle_id):
         return self.vehicle_assignments.get(vehicle_id, None)
@@ -184,22 +294,19 @@ class KnowledgeModel:
     def get_optimal_tps(self, current_pos, prefer_known=False):
         best_tps = None
         best_distance = float('inf')
+        distances = self.get_tps_distances(current_pos)
         
         if prefer_known and self.discovered_garbage:
             for tps_id in self.discovered_garbage.keys():
                 if tps_id in self.known_tps:
-                    dist = self.get_route_distance(
-                        self.get_shortest_path(current_pos, tps_id)
-                    )
+                    dist = distances.get(tps_id, float('inf'))
                     if dist < best_distance:
                         best_distance = dist
                         best_tps = tps_id
         
         if best_tps is None:
             for tps_id in self.TPS_nodes:
-                dist = self.get_route_distance(
-                    self.get_shortest_path(current_pos, tps_id)
-                )
+                dist = distances.get(tps_id, float('inf'))
                 if dist < best_distance:
                     best_distance = dist
                     best_tps = tps_id
@@ -207,26 +314,19 @@ class KnowledgeModel:
         return best_tps
 
     def get_vehicles_by_state(self, state):
-        return [
-            vid for vid, status in self.vehicle_statuses.items()
-            if status.get("state") == state
-        ]
+        return list(self.vehicles_by_state.get(state, ()))
 
     def get_knowledge_summary(self):
-        total_encounters = sum(
-            data["times_encountered"] 
-            for data in self.discovered_slowdowns.values()
-        )
-        
+        idle = len(self.vehicles_by_state.get("idle", ()))
         return {
             "known_garages": len(self.known_garages),
             "known_tps": len(self.known_tps),
             "known_tpa": len(self.known_tpa),
             "discovered_slowdowns": len(self.discovered_slowdowns),
-            "total_slowdown_encounters": total_encounters,
+            "total_slowdown_encounters": self.total_slowdown_encounters,
             "discovered_garbage": len(self.discovered_garbage),
             "active_vehicles": len(self.all_vehicle_ids),
             "vehicles_with_task": len(self.vehicle_assignments),
-            "idle_vehicles": len(self.get_vehicles_by_state("idle")),
-            "busy_vehicles": len(self.all_vehicle_ids) - len(self.get_vehicles_by_state("idle"))
+            "idle_vehicles": idle,
+            "busy_vehicles": len(self.all_vehicle_ids) - idle
         }
\ No newline at end of file
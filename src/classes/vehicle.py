@@ -1,13 +1,28 @@
 import random
+import numpy as np
 import networkx as nx
 from ..environment import VEHICLE_SPEED, VEHICLE_CAP
+from .fleet import REST_STATES
 import uuid
+from ..utils.logger import get_logger
+
+log = get_logger("Vehicle")
 
 class Vehicle:
     def __init__(self, graph, tps_nodes=None, tpa_node=None, garage_nodes=None, shared=None):
-        self.id = str(uuid.uuid4())[:8]
+        self.id = str(uuid.UUID(int=random.getrandbits(128), version=4))[:8]
         
         self.G = graph
+        self.index = getattr(shared, "graph_index", None)
+
+        # State numerik (posisi, progress, muatan, jarak) disimpan di FleetState
+        # bersama; atribut di bawah adalah view ke slot kendaraan ini
+        self.fleet = getattr(shared, "fleet", None)
+        if self.index is None or self.fleet is None:
+            # Tanpa FleetState bersama, kendaraan tidak akan pernah dimajukan engine
+            raise ValueError("Vehicle butuh shared.graph_index dan shared.fleet (dibuat oleh SimulationEngine.setup)")
+        self.slot = self.fleet.add(self)
+
         self.TPS_nodes = tps_nodes
         self.TPA_node = tpa_node
         self.garage_nodes = garage_nodes or []
@@ -17,6 +32,7 @@ class Vehicle:
         
         # ===== Vehicle tracking data =====
         self.path = []
+        self.path_edge_ids = np.empty(0, dtype=np.int64)  # edge index per hop di path
         self.progress = 0.0
         self.target_node = None
         self.state = "idle"
@@ -29,7 +45,112 @@ class Vehicle:
         self.max_load = VEHICLE_CAP
         self.route = []
         
-        print(f"[Vehicle] Created ID: {self.id}")
+        log.debug("Created ID: %s", self.id)
+
+    # ============== FLEET VIEW ==============
+    @property
+    def current(self):
+        idx = self.fleet.node.item(self.slot)
+        return self.index.node_ids[idx] if idx >= 0 else None
+
+    @current.setter
+    def current(self, node):
+        idx = -1 if node is None else self.index.node_idx[node]
+        if idx != self.fleet.node.item(self.slot):
+            self.fleet.node[self.slot] = idx
+            self.fleet.status_dirty[self.slot] = True
+
+    @property
+    def target_node(self):
+        idx = self.fleet.target.item(self.slot)
+        return self.index.node_ids[idx] if idx >= 0 else None
+
+    @target_node.setter
+    def target_node(self, node):
+        self.fleet.target[self.slot] = -1 if node is None else self.index.node_idx[node]
+
+    @property
+    def path_pos(self):
+        """Cursor di path: path[path_pos] == current, path[path_pos + 1] == target_node"""
+        return self.fleet.cursor.item(self.slot)
+
+    @path_pos.setter
+    def path_pos(self, pos):
+        self.fleet.cursor[self.slot] = pos
+
+    @property
+    def edge_idx(self):
+        """Edge index GraphIndex untuk current -> target_node (-1 jika tidak ada)"""
+        return self.fleet.edge.item(self.slot)
+
+    @edge_idx.setter
+    def edge_idx(self, e):
+        self.fleet.edge[self.slot] = e
+
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, value):
+        if value != getattr(self, "_state", None):
+            self.fleet.status_dirty[self.slot] = True
+        self._state = value
+        self.fleet.resting[self.slot] = value in REST_STATES
+
+    @property
+    def progress(self):
+        return self.fleet.progress.item(self.slot)
+
+    @progress.setter
+    def progress(self, value):
+        self.fleet.progress[self.slot] = value
+
+    @property
+    def speed(self):
+        return self.fleet.speed.item(self.slot)
+
+    @speed.setter
+    def speed(self, value):
+        self.fleet.speed[self.slot] = value
+        self.fleet.version[self.slot] += 1
+
+    @property
+    def load(self):
+        return self.fleet.load.item(self.slot)
+
+    @load.setter
+    def load(self, value):
+        if value != self.fleet.load.item(self.slot):
+            self.fleet.load[self.slot] = value
+            self.fleet.status_dirty[self.slot] = True
+
+    @property
+    def max_load(self):
+        return self.fleet.max_load.item(self.slot)
+
+    @max_load.setter
+    def max_load(self, value):
+        # load_percentage di KnowledgeModel bergantung pada max_load
+        if value != self.fleet.max_load.item(self.slot):
+            self.fleet.max_load[self.slot] = value
+            self.fleet.status_dirty[self.slot] = True
+
+    @property
+    def daily_dist(self):
+        return self.fleet.daily_dist.item(self.slot)
+
+    @daily_dist.setter
+    def daily_dist(self, value):
+        self.fleet.daily_dist[self.slot] = value
+
+    @property
+    def total_dist(self):
+        return self.fleet.total_dist.item(self.slot)
+
+    @total_dist.setter
+    def total_dist(self, value):
+        self.fleet.total_dist[self.slot] = value
 
     def _update_garage_stats(self):
         if not self.garage_node or not self.shared:
@@ -43,7 +164,7 @@ class Vehicle:
             else:
                 garage_data["armada_bertugas"] = garage_data.get("armada_bertugas", 0) + 1
             
-            print(f"[Vehicle {self.id}] Updated garage {self.garage_node} stats: standby={garage_data.get('armada_standby', 0)}, bertugas={garage_data.get('armada_bertugas', 0)}")
+            log.debug("%s: Updated garage %s stats: standby=%s, bertugas=%s", self.id, self.garage_node, garage_data.get('armada_standby', 0), garage_data.get('armada_bertugas', 0))
 
     def _update_state_in_garage_stats(self, old_state):
         if not self.garage_node or not self.shared:
@@ -82,7 +203,7 @@ class Vehicle:
         
         self.garage_node = new_garage_node
         self._update_garage_stats()
-        print(f"[Vehicle {self.id}] Reassigned to garage {new_garage_node}")
+        log.info("%s: Reassigned to garage %s", self.id, new_garage_node)
 
 
 
@@ -118,19 +239,19 @@ class Vehicle:
 
     def actuator_go_to_tpa(self):
         if not self.TPA_node:
-            print(f"[Vehicle {self.id}] ERROR: No TPA_node configured!")
+            log.error("%s: No TPA_node configured!", self.id)
             return False
         
         if isinstance(self.TPA_node, (set, list)):
             if len(self.TPA_node) == 0:
-                print(f"[Vehicle {self.id}] ERROR: TPA_node is empty set/list!")
+                log.error("%s: TPA_node is empty set/list!", self.id)
                 return False
             tpa_target = list(self.TPA_node)[0]
         else:
             tpa_target = self.TPA_node
         
         if self.current == tpa_target:
-            print(f"[Vehicle {self.id}] Already at TPA {tpa_target}")
+            log.info("%s: Already at TPA %s", self.id, tpa_target)
             self.state = "at_tpa"
             return True
         
@@ -139,7 +260,7 @@ class Vehicle:
             path = nx.shortest_path(self.G, self.current, tpa_target, weight="length")
             
             if not path or len(path) < 2:
-                print(f"[Vehicle {self.id}] ERROR: Invalid path to TPA!")
+                log.error("%s: Invalid path to TPA!", self.id)
                 return False
             
             self.set_path(path)
@@ -152,10 +273,10 @@ class Vehicle:
             self.G[path[i]][path[i+1]][0]['length'] 
             for i in range(len(path)-1)
             )
-            print(f"[Vehicle] {self.id} Routing to TPA {tpa_target} (distance: {path_distance:.0f}m / {path_distance/1000:.2f}km)")  # ✅ meter & km
+            log.info("%s: Routing to TPA %s (distance: %.0fm / %.2fkm)", self.id, tpa_target, path_distance, path_distance/1000)  # ✅ meter & km
             return True
         except Exception as e:
-            print(f"[Vehicle {self.id}] ERROR: Failed to route to TPA: {e}")
+            log.error("%s: Failed to route to TPA: %s", self.id, e)
             return False
 
     def actuator_go_to_garage(self):
@@ -189,18 +310,22 @@ class Vehicle:
         return self.load <= 0
 
     def actuator_get_status(self):
+        # Baca langsung dari slot FleetState (sekali per field, tanpa lewat property)
+        fleet, slot = self.fleet, self.slot
+        load = fleet.load.item(slot)
+        max_load = fleet.max_load.item(slot)
         return {
             "id": self.id,
-            "state": self.state,
+            "state": self._state,
             "current_node": self.current,
             "target_node": self.target_node,
-            "load": self.load,
-            "max_load": self.max_load,
-            "load_percentage": self.actuator_get_load_percentage(),
-            "is_full": self.actuator_is_full(),
-            "is_empty": self.actuator_is_empty(),
-            "daily_dist": self.daily_dist / 10_000_000,
-            "total_dist": self.total_dist / 10_000_000,
+            "load": load,
+            "max_load": max_load,
+            "load_percentage": (load / max_load) * 100 if max_load > 0 else 0,
+            "is_full": load >= max_load,
+            "is_empty": load <= 0,
+            "daily_dist": fleet.daily_dist.item(slot) / 10_000_000,
+            "total_dist": fleet.total_dist.item(slot) / 10_000_000,
             "garage_node": self.garage_node,
             "route": self.route
         }
@@ -222,7 +347,7 @@ class Vehicle:
                 self.shared.knowledge_model.discover_garbage(self.current, current_garbage)
             
             self.state = "at_tps"
-            print(f"[Vehicle {self.id}] Arrived at TPS {self.current}, found {current_garbage:.2f} kg")
+            log.info("%s: Arrived at TPS %s, found %.2f kg", self.id, self.current, current_garbage)
             return True
         return False
 
@@ -239,7 +364,7 @@ class Vehicle:
         loaded = self.actuator_load_garbage(amount)
         tps_data["sampah_kg"] = max(0, available - loaded)
         
-        print(f"[Vehicle {self.id}] Loaded {loaded:.2f} kg from TPS {self.current} (remaining: {tps_data['sampah_kg']:.2f} kg)")
+        log.info("%s: Loaded %.2f kg from TPS %s (remaining: %.2f kg)", self.id, loaded, self.current, tps_data['sampah_kg'])
         return loaded
 
     def actuator_arrive_at_tpa(self):
@@ -250,13 +375,13 @@ class Vehicle:
         
         if is_at_tpa:
             self.state = "at_tpa"
-            print(f"[Vehicle {self.id}] Arrived at TPA {self.current}")
+            log.info("%s: Arrived at TPA %s", self.id, self.current)
             return True
         return False
 
     def actuator_unload_to_tpa(self):
         if self.state != "at_tpa":
-            print(f"[Vehicle {self.id}] ERROR: Not at TPA (state: {self.state})")
+            log.error("%s: Not at TPA (state: %s)", self.id, self.state)
             return 0
         
         if isinstance(self.TPA_node, (set, list)):
@@ -265,7 +390,7 @@ class Vehicle:
             is_at_tpa = self.current == self.TPA_node
         
         if not is_at_tpa:
-            print(f"[Vehicle {self.id}] ERROR: Current node {self.current} is not a TPA!")
+            log.error("%s: Current node %s is not a TPA!", self.id, self.current)
             return 0
         
         unloaded = self.actuator_unload_garbage()
@@ -275,32 +400,27 @@ class Vehicle:
                 tpa_data = self.shared.node_type[self.current].get("tpa_data", {})
                 tpa_data["total_sampah"] = tpa_data.get("total_sampah", 0) + unloaded
             
-            print(f"[Vehicle {self.id}] ✓ Unloaded {unloaded:.0f}kg to TPA {self.current}")
+            log.info("%s: ✓ Unloaded %.0fkg to TPA %s", self.id, unloaded, self.current)
         
         return unloaded
 
     def actuator_arrive_at_garage(self):
         if self.current == self.garage_node:
             self.state = "idle"
-            print(f"[Vehicle {self.id}] Arrived at garage {self.garage_node}")
+            log.info("%s: Arrived at garage %s", self.id, self.garage_node)
             return True
         return False
 
     def actuator_discover_slowdown(self):
-        if not self.target_node or not self.shared:
+        if not self.target_node or not self.shared or self.edge_idx < 0:
             return None
         
-        edge_id = f"{self.current}-{self.target_node}"
+        slowdown = self.index.slowdown[self.edge_idx]
         
-        if hasattr(self.shared, 'edge_type') and edge_id in self.shared.edge_type:
-            slowdown = self.shared.edge_type[edge_id].get("slowdown", 0)
-            
-            if slowdown > 0 and hasattr(self.shared, 'knowledge_model'):
-                self.shared.knowledge_model.discover_slowdown(edge_id, slowdown)
-            
-            return slowdown
+        if slowdown > 0 and hasattr(self.shared, 'knowledge_model'):
+            self.shared.knowledge_model.discover_slowdown(self.edge_idx, slowdown)
         
-        return None
+        return slowdown
 
     def actuator_get_current_location(self):
         return self.current
@@ -311,138 +431,129 @@ class Vehicle:
     # ============== IF THIS WORKS IT WORKS ==============
     def set_path(self, path):
         if not path or len(path) == 0:
-            print(f"[Vehicle {self.id}] Warning: Empty path provided")
+            log.warning("%s: Empty path provided", self.id)
             self.path = []
             self.route = []
+            self.path_pos = 0
             self.target_node = None
+            self.edge_idx = -1
             self.progress = 0.0
+            self.fleet.version[self.slot] += 1
             return
         
         self.path = path
         self.route = path.copy()
+        self.path_pos = 0
+        self.path_edge_ids = np.array(self.index.path_edges(path), dtype=np.int64)
+        self.fleet.version[self.slot] += 1
         
         if len(path) > 1:
             self.current = path[0]
-            self.target_node = path[1]
+            self._set_target(path[1])
             self.progress = 0.0
         else:
             self.current = path[0]
-            self.target_node = None
+            self._set_target(None)
             self.progress = 0.0
 
+    def _set_target(self, target_node):
+        self.target_node = target_node
+        self.edge_idx = e = -1 if target_node is None else self.index.edge_between(self.current, target_node)
+
+        # Slowdown ditemukan sekali per masuk edge (bukan setiap tick), jadi
+        # times_encountered tidak bergantung pada dt / mode event-driven
+        if e >= 0:
+            slowdown = self.index.slowdown.item(e)
+            knowledge = getattr(self.shared, "knowledge_model", None)
+            if slowdown > 0 and knowledge is not None:
+                knowledge.discover_slowdown(e, slowdown)
+
     def return_to_idle(self):
         old_state = self.state
         self.state = "idle"
         self._update_state_in_garage_stats(old_state)
-        print(f"[Vehicle {self.id}] Returned to idle at garage {self.garage_node}")
+        log.info("%s: Returned to idle at garage %s", self.id, self.garage_node)
 
     def update(self, dt, shared):
-        if shared.paused:
-            return
+        """Majukan kendaraan ini saja (engine memakai FleetState.step untuk semua sekaligus)"""
+        self.fleet.step(dt, shared, slots=[self.slot])
 
-        real_speed = self.speed * shared.speed
-
-        if not self.path or self.target_node is None:
-            if self.state in ["idle", "at_tps", "at_tpa"]:
-                return
-            
-            neighbors = list(self.G.neighbors(self.current))
-            if not neighbors:
-                return
-            try:
-                self.state = "random"
-            except:
-                pass
-            return
-        
-        if self.target_node not in self.path:
-            print(f"[Vehicle {self.id}] ERROR: target_node {self.target_node} not in path! Resetting path.")
+    def _check_stopped(self):
+        """Dipanggil FleetState.step untuk kendaraan tanpa edge yang tidak sedang istirahat"""
+        if self.target_node is not None:
+            log.error("%s: No edge between %s and %s! Resetting path.", self.id, self.current, self.target_node)
             self.path = []
-            self.target_node = None
+            self._set_target(None)
             self.progress = 0.0
             return
-        
-        edge_data = self.G.get_edge_data(self.current, self.target_node)
-        if not edge_data:
-            print(f"[Vehicle {self.id}] ERROR: No edge between {self.current} and {self.target_node}! Resetting path.")
+
+        neighbors = list(self.G.neighbors(self.current))
+        if not neighbors:
+            return
+        self.state = "random"
+
+    def _complete_edge(self, shared):
+        """
+        Dipanggil FleetState saat kendaraan mencapai target_node. Maju ke hop
+        berikutnya lewat cursor (O(1)). Return True jika kendaraan lanjut ke
+        edge berikutnya, False jika path selesai (event kedatangan) atau rusak.
+        """
+        path = self.path
+        pos = self.path_pos + 1
+        if pos >= len(path) or path[pos] != self.target_node:
+            log.error("%s: target_node %s disappeared from path! Resetting.", self.id, self.target_node)
+            self.current = self.target_node if self.target_node else self.current
             self.path = []
-            self.target_node = None
+            self._set_target(None)
             self.progress = 0.0
-            return
-        
-        length = edge_data[0]['length']
+            return False
 
-        edge_id = f"{self.current}-{self.target_node}"
-        actual_speed = real_speed  # m/s
-        
-        if shared and hasattr(shared, 'edge_type') and edge_id in shared.edge_type:
-            slowdown_value = shared.edge_type[edge_id].get("slowdown", 0)
-            if slowdown_value > 0:
-                actual_speed = slowdown_value * shared.speed
-                
-                if hasattr(shared, 'knowledge_model'):
-                    shared.knowledge_model.discover_slowdown(edge_id, slowdown_value)
-        
-        distance = actual_speed * dt
-        
-        self.progress += distance / length
-        
-        self.daily_dist += distance / 1000
-        self.total_dist += distance / 1000
-
-        if self.progress >= 1.0:
-            try:
-                idx = self.path.index(self.target_node)
-            except ValueError:
-                print(f"[Vehicle {self.id}] ERROR: target_node {self.target_node} disappeared from path! Resetting.")
-                self.current = self.target_node if self.target_node else self.current
-                self.path = []
-                self.target_node = None
-                self.progress = 0.0
-                return
-            
-            if idx + 1 < len(self.path):
-                self.current = self.target_node
-                self.target_node = self.path[idx + 1]
-                self.progress = 0.0
+        self.current = self.target_node
+        self.path_pos = pos
+        self.progress = 0.0
+
+        if pos + 1 < len(path):
+            self._set_target(path[pos + 1])
+            return self.edge_idx >= 0
+
+        self._set_target(None)
+        self.path = []
+        self.path_pos = 0
+
+        # ===== Handle arrival at destination =====
+        if self.state == "to_garage" and self.current == self.garage_node:
+            self.return_to_idle()
+
+        elif self.state == "to_tps" and self.current in self.TPS_nodes:
+            old_state = self.state
+            self.state = "at_tps"
+            if old_state != "at_tps":
+                self._update_state_in_garage_stats(old_state)
+
+            if hasattr(shared, 'knowledge_model'):
+                tps_data = shared.node_type[self.current].get("tps_data", {})
+                current_garbage = tps_data.get("sampah_kg", 0)
+                shared.knowledge_model.discover_garbage(self.current, current_garbage)
+
+            log.info("%s: Arrived at TPS %s", self.id, self.current)
+
+        elif self.state == "to_tpa":
+            if isinstance(self.TPA_node, (set, list)):
+                is_at_tpa = self.current in self.TPA_node
             else:
-                self.current = self.target_node
-                self.target_node = None
-                self.path = []
-                self.progress = 0.0
-                
-                # ===== Handle arrival at destination =====
-                if self.state == "to_garage" and self.current == self.garage_node:
-                    self.return_to_idle()
-                
-                elif self.state == "to_tps" and self.current in self.TPS_nodes:
-                    old_state = self.state
-                    self.state = "at_tps"
-                    if old_state != "at_tps":
-                        self._update_state_in_garage_stats(old_state)
-                    
-                    if hasattr(shared, 'knowledge_model'):
-                        tps_data = shared.node_type[self.current].get("tps_data", {})
-                        current_garbage = tps_data.get("sampah_kg", 0)
-                        shared.knowledge_model.discover_garbage(self.current, current_garbage)
-                    
-                    print(f"[Vehicle {self.id}] Arrived at TPS {self.current}")
-                
-                elif self.state == "to_tpa":
-                    if isinstance(self.TPA_node, (set, list)):
-                        is_at_tpa = self.current in self.TPA_node
-                    else:
-                        is_at_tpa = self.current == self.TPA_node
-                    
-                    if is_at_tpa:
-                        old_state = self.state
-                        self.state = "at_tpa"
-                        if old_state != "at_tpa":
-                            self._update_state_in_garage_stats(old_state)
-                        print(f"[Vehicle {self.id}] Arrived at TPA {self.current}")
-                
-                else:
-                    print(f"[Vehicle {self.id}] Arrived at node {self.current} (state: {self.state})")
+                is_at_tpa = self.current == self.TPA_node
+
+            if is_at_tpa:
+                old_state = self.state
+                self.state = "at_tpa"
+                if old_state != "at_tpa":
+                    self._update_state_in_garage_stats(old_state)
+                log.info("%s: Arrived at TPA %s", self.id, self.current)
+
+        else:
+            log.info("%s: Arrived at node %s (state: %s)", self.id, self.current, self.state, key=("arrive", self.id))
+
+        return False
 
     def get_pos(self, pos_dict):
         if self.target_node is None:
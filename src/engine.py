@@ -0,0 +1,321 @@
+import argparse
+import os
+import random
+import time
+import numpy as np
+from .environment import *
+from .utils.timesync import apply_sim_time
+from .utils.graph_index import GraphIndex
+from .utils.event_queue import EventQueue
+from .utils.logger import configure_logging, flush_logs, get_logger
+from .utils.nodes import initNodes, generate_daily_garbage, generate_car_in_garage, assign_fleet_size
+from .classes.knowledge import KnowledgeModel
+from .classes.ai_model import AIModel
+from .classes.fleet import FleetState
+
+log = get_logger("Engine")
+
+
+class SimulationEngine:
+    """
+    Inti simulasi tanpa pygame/Tk.
+
+    Engine memegang model (kendaraan, KnowledgeModel, AIModel) dan memajukan
+    waktu simulasi lewat step(dt). Viewer pygame memanggil step() dengan dt
+    dari jam dinding, sedangkan mode headless memanggilnya dengan dt tetap
+    secepat CPU mampu sehingga hasil run bisa diulang (deterministik).
+    run_events() melompat langsung dari event ke event (kedatangan truk,
+    keputusan AI, pergantian hari) untuk evaluasi batch.
+    """
+
+    def __init__(self, GRAPH, shared, start_hour=SIM_START_HOUR, seed=None, fleet_size=None):
+        self.GRAPH = GRAPH
+        self.shared = shared
+        self.start_hour = start_hour
+        self.seed = seed
+        self.fleet_size = fleet_size  # None = pakai total_armada dari data garasi
+
+        self.sim_time_acc = 0.0
+        self.last_garbage_generation_day = shared.sim_day
+
+        self.TPS_nodes = set()
+        self.TPA_nodes = set()
+        self.GARAGE_nodes = set()
+        self.vehicles = []
+        self.fleet = None
+        self.knowledge_model = None
+        self.ai_model = None
+
+        # Akumulator metrik PEAS (lihat planning/peas.txt dan get_peas_metrics)
+        self.overtime_seconds = 0.0
+        self.unserved_tps_days = 0
+        self.tpa_start_total = 0
+
+    def setup(self):
+        """Load node, buat kendaraan, dan inisialisasi KnowledgeModel + AIModel"""
+        if self.seed is not None:
+            random.seed(self.seed)
+
+        self.shared.vehicles.clear()
+        self.shared.total_vehicles = 0
+        apply_sim_time(self.shared, self.sim_time_acc, self.start_hour)
+
+        self.shared.graph_index = GraphIndex(self.GRAPH)
+        self.TPS_nodes, self.TPA_nodes, self.GARAGE_nodes = initNodes(self.GRAPH, self.shared)
+        if self.fleet_size is not None:
+            assign_fleet_size(self.shared, self.GARAGE_nodes, self.fleet_size)
+
+        self.fleet = FleetState(self.shared.graph_index)
+        self.shared.fleet = self.fleet
+
+        self.vehicles = []
+        generate_car_in_garage(self.GARAGE_nodes, self.shared, self.vehicles, self.GRAPH,
+                               self.TPS_nodes, self.TPA_nodes)
+
+        self.last_garbage_generation_day = self.shared.sim_day
+        self.tpa_start_total = self._tpa_total()
+
+        self.knowledge_model = KnowledgeModel(self.GRAPH, self.shared, self.TPS_nodes,
+                                              self.TPA_nodes, self.GARAGE_nodes)
+        self.shared.knowledge_model = self.knowledge_model
+
+        log.info("KnowledgeModel initialized")
+        log.info("Agent knowledge: %s", self.knowledge_model.get_knowledge_summary())
+
+        self.ai_model = AIModel(self.knowledge_model, self.shared)
+        self.shared.ai_model = self.ai_model
+
+        log.info("AIModel initialized with Matheuristic Rollout")
+        return self
+
+    # ============== STEP ==============
+    def step(self, dt):
+        """Majukan simulasi sebesar dt (detik frame, dikali shared.speed)"""
+        shared = self.shared
+
+        # Armada bergerak dulu sepanjang interval dengan keputusan yang berlaku,
+        # baru keputusan berikutnya diambil dari posisi di akhir interval
+        # (sama untuk satu frame kecil maupun satu lompatan event besar)
+        working = 0 if shared.paused else sum(1 for v in self.vehicles if v.state != "idle")
+        self.fleet.step(dt, shared)
+
+        if not shared.paused:
+            sim_dt = dt * shared.speed * SIM_TIME_SCALE
+            if working:
+                self.overtime_seconds += working * self._off_shift_seconds(self.sim_time_acc, self.sim_time_acc + sim_dt)
+            self.sim_time_acc += sim_dt
+            apply_sim_time(shared, self.sim_time_acc, self.start_hour)
+
+            if shared.sim_day > self.last_garbage_generation_day:
+                self.unserved_tps_days += self._count_unserved_tps()
+
+            self.last_garbage_generation_day = generate_daily_garbage(
+                shared, self.TPS_nodes, self.ai_model, self.last_garbage_generation_day
+            )
+
+            self.ai_model.update(dt, self.vehicles)
+
+        # Hanya kendaraan yang berubah state/node/muatan sejak step sebelumnya
+        self.knowledge_model.sync_vehicle_statuses(self.fleet)
+
+    def run(self, sim_seconds, dt=HEADLESS_DT):
+        """Jalankan headless dengan timestep tetap sampai sim_seconds terlewati"""
+        end_time = self.sim_time_acc + sim_seconds
+        steps = 0
+        while self.sim_time_acc < end_time and self.shared.simulation_running:
+            self.step(dt)
+            steps += 1
+        return steps
+
+    def run_shift(self, dt=HEADLESS_DT, event_driven=False):
+        """Jalankan satu shift penuh (SHIFT_START sampai SHIFT_END)"""
+        sim_seconds = (SHIFT_END - SHIFT_START) * 3600
+        if event_driven:
+            return self.run_events(sim_seconds)
+        return self.run(sim_seconds, dt)
+
+    # ============== EVENT-DRIVEN ==============
+    def run_events(self, sim_seconds):
+        """
+        Jalankan headless secara event-driven: waktu melompat langsung ke event
+        berikutnya (truk sampai di ujung path, tick keputusan AI, pergantian
+        hari, atau akhir run). Di antara event tidak ada yang perlu diputuskan,
+        jadi satu step(dt) besar memberi hasil yang sama dengan banyak frame
+        (lembur dihitung per bagian interval di luar jam shift).
+        Return jumlah step yang dijalankan.
+        """
+        shared = self.shared
+        fleet = self.fleet
+        scale = shared.speed * SIM_TIME_SCALE  # detik simulasi per satuan dt
+        if scale <= 0:
+            return 0
+
+        end_time = self.sim_time_acc + sim_seconds
+        now = 0.0  # waktu engine dalam satuan dt
+        queue = EventQueue()
+
+        def is_valid(kind, key, version):
+            return kind != "vehicle" or fleet.version.item(key) == version
+
+        def day_time():
+            next_day = (int(self.sim_time_acc // 86400) + 1) * 86400
+            return now + (next_day - self.sim_time_acc) / scale
+
+        queue.push(now + (end_time - self.sim_time_acc) / scale, "end")
+        queue.push(now + max(0.0, self.ai_model.decision_interval - self.ai_model.last_decision_time), "ai")
+        queue.push(day_time(), "day")
+
+        scheduled = np.full(fleet.size, -1, dtype=np.int64)
+        map_version = shared.map_version
+        steps = 0
+
+        while shared.simulation_running:
+            # (Re)jadwalkan kedatangan truk yang path/kecepatannya berubah
+            if shared.map_version != map_version:
+                map_version = shared.map_version
+                scheduled[:] = -1
+            for slot in np.flatnonzero(fleet.version[:fleet.size] != scheduled).tolist():
+                version = fleet.version.item(slot)
+                scheduled[slot] = version
+                t = fleet.time_to_path_end(slot, shared.speed)
+                if t is not None:
+                    queue.push(now + t, "vehicle", slot, version)
+
+            event = queue.pop(is_valid)
+            if event is None:
+                break
+            t, kind, key = event
+
+            # Langkah minimum kecil supaya pembulatan float tidak membuat loop diam
+            self.step(max(t - now, 1e-9))
+            now = max(t, now + 1e-9)
+            steps += 1
+
+            if kind == "end":
+                break
+            elif kind == "ai":
+                queue.push(now + self.ai_model.decision_interval - self.ai_model.last_decision_time, "ai")
+            elif kind == "day":
+                queue.push(day_time(), "day")
+            elif kind == "vehicle" and fleet.edge.item(key) >= 0:
+                # Belum sampai karena pembulatan: hitung ulang waktunya
+                scheduled[key] = -1
+
+        return steps
+
+    # ============== METRICS ==============
+    def _off_shift_seconds(self, t0, t1):
+        """Detik simulasi dalam [t0, t1) yang jatuh di luar jam shift (lembur)"""
+        offset = self.start_hour * 3600
+        shift_start, shift_end = SHIFT_START * 3600, SHIFT_END * 3600
+        on_shift = 0.0
+        day = int((t0 + offset) // 86400)
+        while day * 86400 - offset < t1:
+            base = day * 86400 - offset
+            on_shift += max(0.0, min(t1, base + shift_end) - max(t0, base + shift_start))
+            day += 1
+        return (t1 - t0) - on_shift
+
+    def _count_unserved_tps(self):
+        """Jumlah TPS yang masih menyimpan sampah"""
+        node_type = self.shared.node_type
+        return sum(
+            1 for tps_id in self.TPS_nodes
+            if node_type.get(tps_id, {}).get("tps_data", {}).get("sampah_kg", 0) > 0
+        )
+
+    def _tpa_total(self):
+        node_type = self.shared.node_type
+        return sum(
+            node_type.get(tpa_id, {}).get("tpa_data", {}).get("total_sampah", 0)
+            for tpa_id in self.TPA_nodes
+        )
+
+    def get_peas_metrics(self):
+        """Ukuran performa dari planning/peas.txt"""
+        dists = np.array([v.total_dist for v in self.vehicles], dtype=np.float64)
+        mean_dist = dists.mean() if len(dists) else 0.0
+
+        return {
+            "total_distance_km": float(dists.sum()),
+            "overtime_hours": self.overtime_seconds / 3600,
+            "unserved_tps": self._count_unserved_tps(),
+            "unserved_tps_days": self.unserved_tps_days,
+            "garbage_to_tpa_kg": self._tpa_total() - self.tpa_start_total,
+            "workload_std_km": float(dists.std()) if len(dists) else 0.0,
+            "workload_cv": float(dists.std() / mean_dist) if mean_dist > 0 else 0.0,
+        }
+
+    def get_results(self):
+        return {
+            "sim_day": self.shared.sim_day,
+            "sim_time": f"{self.shared.sim_hour:02d}:{self.shared.sim_min:02d}",
+            "sim_seconds": self.shared.sim_seconds,
+            "vehicles": len(self.vehicles),
+            **self.ai_model.get_statistics(),
+            **self.get_peas_metrics()
+        }
+
+
+# ============== HEADLESS ENTRY ==============
+def run_headless(graph_file=GRAPH_FILE, hours=None, speed=1.0, dt=HEADLESS_DT, seed=None, event_driven=False):
+    from .utils.shared import SharedState
+    from .utils.graph_cache import load_graph
+
+    GRAPH = load_graph(graph_file)
+
+    shared = SharedState(graph_file)
+    shared.simulation_running = True
+    shared.paused = False
+    shared.speed = speed
+
+    start_hour = SHIFT_START if hours is None else SIM_START_HOUR
+    engine = SimulationEngine(GRAPH, shared, start_hour=start_hour, seed=seed).setup()
+
+    start = time.time()
+    if hours is None:
+        steps = engine.run_shift(dt, event_driven)
+    elif event_driven:
+        steps = engine.run_events(hours * 3600)
+    else:
+        steps = engine.run(hours * 3600, dt)
+    elapsed = time.time() - start
+
+    results = engine.get_results()
+    results["steps"] = steps
+    results["wall_time"] = elapsed
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulasi truk sampah tanpa tampilan (headless)")
+    parser.add_argument("--graph", default=GRAPH_FILE, help="File graphml")
+    parser.add_argument("--hours", type=float, default=None,
+                        help="Lama simulasi (jam). Default: satu shift penuh")
+    parser.add_argument("--speed", type=float, default=1.0, help="Multiplier kecepatan simulasi")
+    parser.add_argument("--dt", type=float, default=HEADLESS_DT, help="Timestep tetap (detik)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed random untuk run deterministik")
+    parser.add_argument("--events", action="store_true",
+                        help="Mode event-driven: lompat langsung antar event, bukan timestep tetap")
+    parser.add_argument("--log-level", default=None, help="Level log simulasi (DEBUG/INFO/WARNING/ERROR)")
+    parser.add_argument("--quiet", action="store_true", help="Hanya tampilkan log ERROR (untuk benchmark)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.graph):
+        print("Graph file tidak ditemukan:", args.graph)
+        return
+
+    configure_logging(level=args.log_level, quiet=args.quiet)
+    results = run_headless(args.graph, args.hours, args.speed, args.dt, args.seed, args.events)
+    flush_logs()
+
+    print("\n" + "="*50)
+    print("HEADLESS RESULTS")
+    print("="*50)
+    for key, value in results.items():
+        print(f"{key:>24}: {value}")
+    print("="*50)
+
+
+if __name__ == "__main__":
+    main()
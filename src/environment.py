@@ -4,6 +4,17 @@ WIDTH = 1000
 HEIGHT = 800
 CAM_SPEED = 10
 MAX_FPS = 60
+UI_PUBLISH_HZ = 10  # Snapshot sim -> window Tk per detik (window hanya update widget yang berubah)
+
+# ================== SIMULATION CLOCK ==================
+SIM_START_HOUR = 8      # Jam awal simulasi (hari ke-1)
+SIM_TIME_SCALE = 60     # 1 detik nyata = 60 detik simulasi pada speed 1x
+HEADLESS_DT = 1.0 / MAX_FPS  # Timestep tetap untuk mode headless
+
+# ================== LOGGING ==================
+LOG_LEVEL = "INFO"        # Level default semua modul (DEBUG/INFO/WARNING/ERROR)
+LOG_MODULE_LEVELS = {}    # Override per modul, mis. {"AIModel": "WARNING", "Vehicle": "INFO"}
+LOG_RATE_LIMIT = 1.0      # Detik minimum antar pesan dengan key yang sama
 
 # ================== TEST SETUP ==================
 GRAPH_FILE = "./data/simpl_klandasan_ilir_drive.graphml"
@@ -12,6 +23,10 @@ GRAPH_FILE = "./data/simpl_klandasan_ilir_drive.graphml"
 # ================== VEHICLE ==================
 VEHICLE_SPEED = 60 
 VEHICLE_CAP = 200
+VEHICLE_CARRY_LEFTOVER = True  # Sisa jarak dibawa ke edge berikutnya (penting di speed tinggi)
+
+# ================== KNOWLEDGE ==================
+GARBAGE_HISTORY_SIZE = 256  # Observasi (sim_time, kg) terakhir yang disimpan per TPS
 
 
 # ================== SHIFT SETTINGS (00:00 WITH INTEGER 0) ==================
@@ -3,9 +3,7 @@ from .utils.viewer import GraphViewer
 from .environment import *
 from .utils.timesync import sync, getDt
 from .utils.controls import controls
-from .utils.nodes import initNodes, generate_daily_garbage, generate_car_in_garage
-from .classes.knowledge import KnowledgeModel
-from .classes.ai_model import AIModel
+from .engine import SimulationEngine
 import time
 
 def run_simulation(GRAPH, shared):
@@ -21,7 +19,6 @@ def run_simulation(GRAPH, shared):
     
     print(f"[Simulation] Vehicles cleared: {len(shared.vehicles)}")
     
-    sim_time_acc = 0.0  
     last_time = time.time()
     SCALE_DIV = 1000.0
     pos = {n: (data['x'] / SCALE_DIV, data['y'] / SCALE_DIV)
@@ -36,23 +33,9 @@ def run_simulation(GRAPH, shared):
     viewer.offset_x = viewer.WIDTH/2 - ((viewer.min_x+viewer.max_x)/2 - viewer.min_x)*viewer.scale
     viewer.offset_y = viewer.HEIGHT/2 - ((viewer.max_y+viewer.min_y)/2 - viewer.min_y)*viewer.scale
 
-    TPS_nodes, TPA_nodes, GARAGE_nodes = initNodes(GRAPH, shared)
-    
-    vehicles = []
-    generate_car_in_garage(GARAGE_nodes, shared, vehicles, GRAPH, TPS_nodes, TPA_nodes)
-
-    last_garbage_generation_day = shared.sim_day
-
-    knowledge_model = KnowledgeModel(GRAPH, shared, TPS_nodes, TPA_nodes, GARAGE_nodes)
-    shared.knowledge_model = knowledge_model
-    
-    print(f"[Simulation] KnowledgeModel initialized")
-    print(f"[Simulation] Agent knowledge: {knowledge_model.get_knowledge_summary()}")
-
-    ai_model = AIModel(knowledge_model, shared)
-    shared.ai_model = ai_model
-    
-    print(f"[Simulation] AIModel initialized with Matheuristic Rollout")
+    # ===== Engine (model + waktu simulasi) =====
+    engine = SimulationEngine(GRAPH, shared).setup()
+    vehicles = engine.vehicles
     
     running = True
     shared.paused = True
@@ -72,7 +55,7 @@ def run_simulation(GRAPH, shared):
             print("[Simulation] simulation_running = False, breaking loop...")
             break
         
-        sim_time_acc = sync(shared, sim_time_acc)
+        engine.sim_time_acc = sync(shared, engine.sim_time_acc)
         shared.fps = int(clock.get_fps())
 
         dt, last_time = getDt(time, last_time)
@@ -80,26 +63,13 @@ def run_simulation(GRAPH, shared):
         controls(viewer, shared, GRAPH, range_x, range_y, vehicles, running, dt)
 
 
-        if not shared.paused:
-            sim_time_acc += dt * shared.speed * (60 ** 1)
-            total_minutes = int(sim_time_acc / 60)
-            shared.sim_hour = (8 + (total_minutes // 60)) % 24
-            shared.sim_min = total_minutes % 60
-            shared.sim_day = 1 + (total_minutes // (24 * 60))
-            
-            last_garbage_generation_day = generate_daily_garbage(shared, TPS_nodes, ai_model, last_garbage_generation_day)
-            
-            ai_model.update(dt, vehicles)
-        
-        screen.fill((20,20,20))
+        engine.step(dt)
+
         viewer.draw_graph(screen, GRAPH, NODE_COL, LINE_COL)
         viewer.draw_dynamic_objects(screen, vehicles)
 
-        for v in vehicles:
-            v.update(dt, shared)
-
-        for v in vehicles:
-            knowledge_model.update_vehicle_status(v.id, v.actuator_get_status())
+        # Snapshot untuk window Tk (throttled ke UI_PUBLISH_HZ)
+        shared.publish_ui()
         
         pygame.display.flip()
         clock.tick(MAX_FPS)
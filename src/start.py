@@ -1,5 +1,4 @@
 import os
-import osmnx as ox
 import threading
 import pygame
 import time
@@ -13,6 +12,7 @@ from window.window_car_state import CarStateWindow
 from .environment import *
 from .simulation import run_simulation
 from .utils.shared import SharedState
+from .utils.graph_cache import load_graph
 
 _simulation_thread = None
 _simulation_active = False
@@ -66,7 +66,7 @@ def main():
     print("\n" + "="*50)
     print("LOADING GRAPH")
     print("="*50)
-    GRAPH = ox.load_graphml(GRAPH_FILE)
+    GRAPH = load_graph(GRAPH_FILE)
     print(f"✓ Graph loaded: {GRAPH.number_of_nodes()} nodes, {GRAPH.number_of_edges()} edges")
     print("="*50 + "\n")
 
@@ -120,7 +120,7 @@ def main():
             print(f"[ERROR] Vehicles not cleared! Still have {len(shared.vehicles)} vehicles!")
         
         print("[3/5] Reloading graph...")
-        GRAPH = ox.load_graphml(GRAPH_FILE)
+        GRAPH = load_graph(GRAPH_FILE)
         print(f"      Graph: {GRAPH.number_of_nodes()} nodes")
         
         print("[4/5] Clearing pygame...")
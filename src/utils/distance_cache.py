@@ -0,0 +1,129 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import numpy as np
+from .shortest_paths import ShortestPathTrees
+from .logger import get_logger
+
+log = get_logger("DistanceCache")
+
+CACHE_VERSION = 1
+CACHE_DIR = os.path.join("data", "saved", "distance_cache")
+MAX_ENTRIES_PER_GRAPH = 8  # entri lama (POI set lain) dihapus berdasarkan waktu pakai
+
+ARRAYS = ("roots", "dist", "next_node", "next_edge")
+
+
+def graph_signature(index):
+    """Hash struktur graph (node id, edge, panjang edge) dari GraphIndex"""
+    h = hashlib.sha1(f"v{CACHE_VERSION}".encode())
+    h.update(np.asarray(index.node_ids, dtype=np.int64).tobytes())
+    h.update(index.edge_src.tobytes())
+    h.update(index.edge_dst.tobytes())
+    h.update(index.length.tobytes())
+    return h.hexdigest()[:16]
+
+
+def poi_signature(roots):
+    """Hash himpunan POI (urutan tidak berpengaruh)"""
+    return hashlib.sha1(np.array(sorted(set(roots)), dtype=np.int64).tobytes()).hexdigest()[:16]
+
+
+class CachedTrees:
+    """Satu entri cache di disk; array dibuka lewat memmap (read-only)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.roots = np.load(os.path.join(path, "roots.npy")).tolist()
+        self.dist = np.load(os.path.join(path, "dist.npy"), mmap_mode="r")
+        self.next_node = np.load(os.path.join(path, "next_node.npy"), mmap_mode="r")
+        self.next_edge = np.load(os.path.join(path, "next_edge.npy"), mmap_mode="r")
+
+
+# ============== LOOKUP ==============
+def _entries(graph_sig, cache_dir):
+    if not os.path.isdir(cache_dir):
+        return []
+    return [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+            if name.startswith(graph_sig + "_")]
+
+
+def _best_base(graph_sig, roots, cache_dir):
+    """Entri graph yang sama dengan irisan POI terbesar (untuk rebuild inkremental)"""
+    wanted = set(roots)
+    best, best_overlap = None, 0
+    for path in _entries(graph_sig, cache_dir):
+        try:
+            overlap = len(wanted.intersection(np.load(os.path.join(path, "roots.npy")).tolist()))
+        except (OSError, ValueError):
+            continue
+        if overlap > best_overlap:
+            best, best_overlap = path, overlap
+    return best
+
+
+def _open(path):
+    try:
+        entry = CachedTrees(path)
+    except (OSError, ValueError) as e:
+        log.warning("Cache unreadable (%s), rebuilding", e)
+        return None
+    os.utime(path)  # tandai baru dipakai (untuk pruning)
+    return entry
+
+
+# ============== SAVE ==============
+def _save(trees, path, cache_dir):
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".tmp_", dir=cache_dir)
+    try:
+        np.save(os.path.join(tmp, "roots.npy"), np.array(trees.roots, dtype=np.int64))
+        np.save(os.path.join(tmp, "dist.npy"), trees.dist)
+        np.save(os.path.join(tmp, "next_node.npy"), trees.next_node)
+        np.save(os.path.join(tmp, "next_edge.npy"), trees.next_edge)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(tmp, path)
+    except OSError as e:
+        shutil.rmtree(tmp, ignore_errors=True)
+        log.warning("Gagal menulis cache: %s", e)
+        return False
+    return True
+
+
+def _prune(graph_sig, cache_dir, keep):
+    entries = sorted(_entries(graph_sig, cache_dir), key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+# ============== LOAD ==============
+def load_trees(index, roots, cls=ShortestPathTrees, cache_dir=CACHE_DIR):
+    """
+    Pohon shortest path (bobot = panjang edge) ke setiap root, lewat cache disk:
+    1. entri dengan graph + himpunan POI yang sama -> salin dari memmap, tanpa Dijkstra
+    2. entri graph yang sama dengan POI berbeda (mis. beberapa TPS ditambah/dihapus
+       di editor) -> baris root lama dipakai ulang, hanya root baru yang dihitung
+    3. tidak ada entri -> hitung semua lalu simpan
+    """
+    roots = list(roots)
+    graph_sig = graph_signature(index)
+    path = os.path.join(cache_dir, f"{graph_sig}_{poi_signature(r for r in roots if r in index.node_idx)}")
+
+    cached = _open(path) if os.path.isdir(path) else None
+    if cached is None:
+        base = _best_base(graph_sig, roots, cache_dir)
+        cached = _open(base) if base is not None else None
+
+    trees = cls(index, roots, cached=cached)
+
+    if cached is not None and not trees.built_rows and cached.path == path:
+        log.info("Loaded %s trees from cache", len(trees.roots))
+        return trees
+
+    reused = len(trees.roots) - len(trees.built_rows)
+    log.info("Built %s trees, reused %s from cache", len(trees.built_rows), reused)
+    if _save(trees, path, cache_dir):
+        _prune(graph_sig, cache_dir, MAX_ENTRIES_PER_GRAPH)
+    return trees
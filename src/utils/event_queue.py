@@ -0,0 +1,44 @@
+import heapq
+import itertools
+
+
+class EventQueue:
+    """
+    Priority queue event simulasi berdasarkan waktu.
+
+    Setiap event membawa (kind, key, version). Event yang sudah basi
+    (mis. kendaraan diberi path baru sehingga waktu kedatangannya berubah)
+    tidak dihapus dari heap, cukup di-skip saat diambil: pemanggil memberi
+    fungsi is_valid(kind, key, version) ke peek()/pop().
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()  # tie-breaker untuk event di waktu yang sama
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, time, kind, key=None, version=0):
+        heapq.heappush(self._heap, (time, next(self._seq), kind, key, version))
+
+    def _drop_stale(self, is_valid):
+        heap = self._heap
+        while heap and is_valid is not None and not is_valid(heap[0][2], heap[0][3], heap[0][4]):
+            heapq.heappop(heap)
+
+    def peek(self, is_valid=None):
+        """(time, kind, key) event valid terdekat tanpa mengambilnya, None jika kosong"""
+        self._drop_stale(is_valid)
+        if not self._heap:
+            return None
+        time, _, kind, key, _ = self._heap[0]
+        return time, kind, key
+
+    def pop(self, is_valid=None):
+        """Ambil event valid terdekat: (time, kind, key), None jika kosong"""
+        self._drop_stale(is_valid)
+        if not self._heap:
+            return None
+        time, _, kind, key, _ = heapq.heappop(self._heap)
+        return time, kind, key
@@ -0,0 +1,97 @@
+import numpy as np
+from ..environment import GARBAGE_HISTORY_SIZE
+
+
+class GarbageHistory:
+    """
+    Riwayat observasi sampah (sim_time, kg) per TPS dalam ring buffer NumPy.
+
+    Setiap TPS punya satu baris array berkapasitas tetap; observasi terlama
+    ditimpa jika penuh, sehingga memori tidak tumbuh walau run berminggu-minggu.
+    append O(1), statistik window (mean, trend) dihitung vectorized.
+    """
+
+    def __init__(self, capacity=GARBAGE_HISTORY_SIZE, rows=16):
+        self.capacity = capacity
+        self.row_of = {}  # tps_id -> baris
+        self.times = np.zeros((rows, capacity), dtype=np.int64)  # detik simulasi
+        self.kg = np.zeros((rows, capacity), dtype=np.float64)
+        self.head = np.zeros(rows, dtype=np.int64)  # slot tulis berikutnya
+        self.count = np.zeros(rows, dtype=np.int64)
+
+    def _grow(self):
+        rows = len(self.head) * 2
+        for name in ("times", "kg", "head", "count"):
+            old = getattr(self, name)
+            new = np.zeros((rows,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _row(self, tps_id):
+        row = self.row_of.get(tps_id)
+        if row is None:
+            row = len(self.row_of)
+            if row == len(self.head):
+                self._grow()
+            self.row_of[tps_id] = row
+        return row
+
+    def __contains__(self, tps_id):
+        return tps_id in self.row_of
+
+    def __len__(self):
+        return len(self.row_of)
+
+    # ============== WRITE ==============
+    def append(self, tps_id, sim_time, kg):
+        row = self._row(tps_id)
+        slot = self.head.item(row)
+        self.times[row, slot] = sim_time
+        self.kg[row, slot] = kg
+        self.head[row] = (slot + 1) % self.capacity
+        if self.count.item(row) < self.capacity:
+            self.count[row] += 1
+
+    def clear(self):
+        self.row_of.clear()
+        self.head[:] = 0
+        self.count[:] = 0
+
+    # ============== READ ==============
+    def get(self, tps_id, window_seconds=None, now=None):
+        """
+        (times, kg) urut dari terlama, hanya observasi dalam window_seconds
+        terakhir sebelum `now` jika diberikan (default now = observasi terbaru)
+        """
+        row = self.row_of.get(tps_id)
+        if row is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        n = self.count.item(row)
+        order = (self.head.item(row) - n + np.arange(n)) % self.capacity
+        times, kg = self.times[row, order], self.kg[row, order]
+
+        if window_seconds is not None and n:
+            if now is None:
+                now = times[-1]
+            start = np.searchsorted(times, now - window_seconds, side="left")
+            end = np.searchsorted(times, now, side="right")
+            times, kg = times[start:end], kg[start:end]
+        return times, kg
+
+    def mean(self, tps_id, window_seconds=None, now=None):
+        """Rata-rata kg dalam window, None jika tidak ada observasi"""
+        _, kg = self.get(tps_id, window_seconds, now)
+        return float(kg.mean()) if len(kg) else None
+
+    def trend(self, tps_id, window_seconds=None, now=None):
+        """Kemiringan least-squares kg per jam simulasi dalam window, None jika < 2 titik berbeda waktu"""
+        times, kg = self.get(tps_id, window_seconds, now)
+        if len(kg) < 2:
+            return None
+        t = (times - times[0]) / 3600
+        t_dev = t - t.mean()
+        var = float(t_dev @ t_dev)
+        if var <= 0:
+            return None
+        return float(t_dev @ (kg - kg.mean())) / var
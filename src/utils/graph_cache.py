@@ -0,0 +1,156 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+import networkx as nx
+import numpy as np
+from .logger import get_logger
+
+log = get_logger("GraphCache")
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".cache.npz"
+
+# graph_file (abspath) -> (signature, graph) untuk refresh tanpa parsing ulang
+_loaded_graphs = {}
+
+
+def cache_path(graph_file):
+    """File cache biner di sebelah graphml: data/x.graphml -> data/x.cache.npz"""
+    return os.path.splitext(graph_file)[0] + CACHE_SUFFIX
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def _file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# ============== SAVE ==============
+def save_graph_cache(G, graph_file, source_hash=None):
+    """
+    Simpan node id, koordinat, adjacency CSR dan panjang edge ke satu file .npz.
+    Hanya atribut yang dipakai simulasi (x, y, length) yang disimpan.
+    """
+    node_ids = list(G.nodes())
+    if not all(isinstance(n, int) for n in node_ids):
+        log.warning("Node id bukan integer, cache dilewati")
+        return False
+
+    node_idx = {n: i for i, n in enumerate(node_ids)}
+    edges = list(G.edges(keys=True, data="length", default=1))
+
+    edge_src = np.array([node_idx[u] for u, _, _, _ in edges], dtype=np.int32)
+    order = np.argsort(edge_src, kind="stable")
+    indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edge_src, minlength=len(node_ids)), out=indptr[1:])
+
+    size, mtime_ns = _file_signature(graph_file)
+    path = cache_path(graph_file)
+    # Tulis ke file sementara di folder yang sama lalu os.replace (atomik), supaya
+    # proses lain (mis. worker batch) tidak pernah membaca file setengah jadi
+    fd, tmp = tempfile.mkstemp(prefix=".tmp_", suffix=CACHE_SUFFIX, dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                version=np.int64(CACHE_VERSION),
+                source_size=np.int64(size),
+                source_mtime_ns=np.int64(mtime_ns),
+                source_hash=np.str_(source_hash or _file_hash(graph_file)),
+                crs=np.str_(G.graph.get("crs", "")),
+                node_ids=np.array(node_ids, dtype=np.int64),
+                x=np.array([G.nodes[n]["x"] for n in node_ids], dtype=np.float64),
+                y=np.array([G.nodes[n]["y"] for n in node_ids], dtype=np.float64),
+                indptr=indptr,
+                dst=np.array([node_idx[edges[e][1]] for e in order], dtype=np.int32),
+                key=np.array([edges[e][2] for e in order], dtype=np.int32),
+                length=np.array([float(edges[e][3]) for e in order], dtype=np.float64),
+            )
+        os.replace(tmp, path)
+    except OSError as e:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        log.warning("Gagal menulis cache: %s", e)
+        return False
+
+    log.info("Cache written: %s", path)
+    return True
+
+
+# ============== LOAD ==============
+def _is_cache_valid(data, graph_file):
+    if int(data["version"]) != CACHE_VERSION:
+        return False
+
+    size, mtime_ns = _file_signature(graph_file)
+    if int(data["source_size"]) != size:
+        return False
+    if int(data["source_mtime_ns"]) == mtime_ns:
+        return True
+
+    # mtime berubah (mis. file di-copy/touch): cek isi lewat hash
+    return str(data["source_hash"]) == _file_hash(graph_file)
+
+
+def _graph_from_cache(data):
+    node_ids = data["node_ids"].tolist()
+    x = data["x"].tolist()
+    y = data["y"].tolist()
+    indptr = data["indptr"].tolist()
+    dst = data["dst"].tolist()
+    key = data["key"].tolist()
+    length = data["length"].tolist()
+
+    G = nx.MultiDiGraph(crs=str(data["crs"]))
+    G.add_nodes_from((n, {"x": x[i], "y": y[i]}) for i, n in enumerate(node_ids))
+    G.add_edges_from(
+        (node_ids[u], node_ids[dst[k]], key[k], {"length": length[k]})
+        for u in range(len(node_ids))
+        for k in range(indptr[u], indptr[u + 1])
+    )
+    return G
+
+
+def load_graph(graph_file):
+    """
+    Load graph jalan dengan urutan:
+    1. graph di memori jika file sumber tidak berubah (refresh)
+    2. cache biner .npz jika masih valid (mtime/hash file sumber)
+    3. parsing graphml lewat osmnx, lalu tulis cache baru
+    """
+    key = os.path.abspath(graph_file)
+    signature = _file_signature(graph_file)
+
+    loaded = _loaded_graphs.get(key)
+    if loaded is not None and loaded[0] == signature:
+        log.info("Reusing in-memory graph: %s", graph_file)
+        return loaded[1]
+
+    G = None
+    path = cache_path(graph_file)
+    if os.path.exists(path):
+        try:
+            with np.load(path) as data:
+                if _is_cache_valid(data, graph_file):
+                    G = _graph_from_cache(data)
+                    log.info("Loaded from cache: %s", path)
+                else:
+                    log.info("Cache stale, rebuilding: %s", path)
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile) as e:
+            log.warning("Cache unreadable (%s), rebuilding", e)
+
+    if G is None:
+        import osmnx as ox
+        G = ox.load_graphml(graph_file)
+        save_graph_cache(G, graph_file)
+
+    _loaded_graphs[key] = (signature, G)
+    return G
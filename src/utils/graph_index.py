@@ -0,0 +1,118 @@
+import numpy as np
+
+
+class GraphIndex:
+    """
+    Indeks integer untuk graph jalan yang dibangun sekali saat load.
+
+    - node_id (OSM) -> index 0..N-1 (urutan G.nodes())
+    - edge (u, v, key) -> index 0..E-1 (urutan G.edges(keys=True))
+    - adjacency CSR maju (out-edge) dan mundur (in-edge) dalam bentuk array
+    - tabel atribut edge: length, slowdown (kondisi jalan sebenarnya) dan
+      discovered_slowdown (yang sudah diketahui agent), semuanya array per edge
+
+    Edge id string "u-v" hanya dipakai di batas JSON/UI (lihat load_slowdowns,
+    edge_label, edges_of_id).
+    """
+
+    def __init__(self, G):
+        self.node_ids = list(G.nodes())
+        self.node_idx = {n: i for i, n in enumerate(self.node_ids)}
+        self.num_nodes = len(self.node_ids)
+
+        edges = list(G.edges(keys=True, data="length", default=1))
+        self.num_edges = len(edges)
+
+        self.edge_src = np.fromiter((self.node_idx[u] for u, _, _, _ in edges), dtype=np.int32, count=self.num_edges)
+        self.edge_dst = np.fromiter((self.node_idx[v] for _, v, _, _ in edges), dtype=np.int32, count=self.num_edges)
+        self.length = np.fromiter((float(l) for _, _, _, l in edges), dtype=np.float64, count=self.num_edges)
+        self.length_list = self.length.tolist()  # versi list untuk loop Dijkstra Python (length tidak berubah)
+
+        # (u, v, key) -> edge index, (u, v) -> list edge index (semua key paralel)
+        self.edge_idx = {}
+        self.pair_edges = {}
+        for e, (u, v, k, _) in enumerate(edges):
+            self.edge_idx[(u, v, k)] = e
+            self.pair_edges.setdefault((u, v), []).append(e)
+
+        self.slowdown = np.zeros(self.num_edges, dtype=np.float64)
+        self.discovered_slowdown = np.zeros(self.num_edges, dtype=np.float64)
+
+        self._build_csr()
+
+    def _build_csr(self):
+        N = self.num_nodes
+
+        # ===== Out-edge (CSR maju) =====
+        order = np.argsort(self.edge_src, kind="stable").astype(np.int32)
+        self.out_eid = order
+        self.out_dst = self.edge_dst[order]
+        self.out_indptr = np.zeros(N + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.edge_src, minlength=N), out=self.out_indptr[1:])
+
+        # ===== In-edge (CSR mundur) =====
+        order = np.argsort(self.edge_dst, kind="stable").astype(np.int32)
+        self.in_eid = order
+        self.in_src = self.edge_src[order]
+        self.in_indptr = np.zeros(N + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.edge_dst, minlength=N), out=self.in_indptr[1:])
+
+        # List Python per node untuk loop Dijkstra (lebih cepat dari indexing numpy per elemen)
+        self.out_adj = self._adj_lists(self.out_dst, self.out_eid, self.out_indptr)
+        self.in_adj = self._adj_lists(self.in_src, self.in_eid, self.in_indptr)
+
+    def _adj_lists(self, nbrs, eids, indptr):
+        nbrs = nbrs.tolist()
+        eids = eids.tolist()
+        indptr = indptr.tolist()
+        return [
+            list(zip(nbrs[indptr[v]:indptr[v + 1]], eids[indptr[v]:indptr[v + 1]]))
+            for v in range(self.num_nodes)
+        ]
+
+    # ============== LOOKUP ==============
+    def index_of(self, node_id):
+        return self.node_idx.get(node_id, -1)
+
+    def node_of(self, idx):
+        return self.node_ids[idx]
+
+    def edge_between(self, u, v):
+        """Edge index pertama u -> v (node_id), -1 jika tidak ada"""
+        edges = self.pair_edges.get((u, v))
+        return edges[0] if edges else -1
+
+    def path_edges(self, path):
+        """List edge index untuk setiap pasangan node berurutan di path"""
+        return [self.edge_between(path[i], path[i + 1]) for i in range(len(path) - 1)]
+
+    def reverse_edges(self, e):
+        """Edge index arah sebaliknya (v -> u) dari edge e"""
+        return self.pair_edges.get((self.node_ids[self.edge_dst[e]], self.node_ids[self.edge_src[e]]), [])
+
+    def edge_label(self, e):
+        """Edge id string "u-v" untuk tampilan/JSON"""
+        return f"{self.node_ids[self.edge_src[e]]}-{self.node_ids[self.edge_dst[e]]}"
+
+    def edges_between(self, u, v):
+        """Semua edge index u -> v (node_id), list kosong jika tidak ada"""
+        return self.pair_edges.get((u, v), [])
+
+    def edges_of_id(self, edge_id):
+        """Terjemahkan edge id string "u-v" ke list edge index"""
+        try:
+            u_str, v_str = edge_id.split("-", 1)
+            return self.edges_between(int(u_str), int(v_str))
+        except (ValueError, AttributeError):
+            return []
+
+    # ============== TRANSLATION (JSON "u-v" <-> ARRAY) ==============
+    def load_slowdowns(self, edge_type):
+        """Isi array slowdown dari dict edge_type {"u-v": {"slowdown": x}}"""
+        self.slowdown[:] = 0.0
+        for edge_id, data in edge_type.items():
+            self.set_slowdown(edge_id, data.get("slowdown", 0))
+
+    def set_slowdown(self, edge_id, value):
+        for e in self.edges_of_id(edge_id):
+            self.slowdown[e] = value
@@ -0,0 +1,162 @@
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler
+from ..environment import LOG_LEVEL, LOG_MODULE_LEVELS, LOG_RATE_LIMIT
+
+ROOT = "sim"
+
+_queue = None
+_writer = None
+_handler = None
+_module_names = set()  # modul yang pernah diberi level sendiri
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Selalu menulis ke sys.stdout saat ini (ikut contextlib.redirect_stdout)"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Batasi pesan dengan key yang sama (extra={"key": ...}) maksimal sekali per
+    `interval` detik. Jumlah pesan yang dibuang ditambahkan ke pesan berikutnya.
+    Pesan tanpa key tidak dibatasi.
+    """
+
+    def __init__(self, interval):
+        super().__init__()
+        self.interval = interval
+        self._last = {}  # key -> (waktu terakhir lolos, jumlah yang dibuang)
+
+    def filter(self, record):
+        key = getattr(record, "key", None)
+        if key is None or self.interval <= 0:
+            return True
+
+        now = time.monotonic()
+        last, dropped = self._last.get(key, (None, 0))
+        if last is not None and now - last < self.interval:
+            self._last[key] = (last, dropped + 1)
+            return False
+
+        self._last[key] = (now, 0)
+        if dropped:
+            record.msg = f"{record.msg} (+{dropped} serupa)"
+        return True
+
+
+class _Writer(threading.Thread):
+    """Thread latar yang menulis record dari queue, sim thread tidak menunggu I/O"""
+
+    def __init__(self, log_queue, handler):
+        super().__init__(name="sim-log-writer", daemon=True)
+        self.queue = log_queue
+        self.handler = handler
+
+    def run(self):
+        while True:
+            record = self.queue.get()
+            try:
+                self.handler.handle(record)
+            finally:
+                self.queue.task_done()
+
+
+# ============== SETUP ==============
+def configure_logging(level=None, module_levels=None, quiet=False, rate_limit=None):
+    """
+    Atur level log simulasi.
+    level: level default semua modul ("DEBUG", "INFO", "WARNING", "ERROR")
+    module_levels: dict nama modul -> level, mis. {"AIModel": "WARNING"}
+    quiet: hanya ERROR yang ditampilkan (untuk benchmark/batch)
+    rate_limit: interval (detik) per key pesan
+    """
+    _ensure_started()
+    root = logging.getLogger(ROOT)
+    root.setLevel(logging.ERROR if quiet else (level or LOG_LEVEL))
+
+    levels = {} if quiet else {**LOG_MODULE_LEVELS, **(module_levels or {})}
+    for name in _module_names | set(levels):
+        logging.getLogger(f"{ROOT}.{name}").setLevel(levels.get(name, logging.NOTSET))
+    _module_names.update(levels)
+
+    if rate_limit is not None:
+        for f in _handler.filters:
+            if isinstance(f, RateLimitFilter):
+                f.interval = rate_limit
+
+
+def _ensure_started():
+    global _queue, _writer, _handler
+    if _handler is not None:
+        return
+
+    _queue = queue.Queue()
+    out = _StdoutHandler()
+    out.setFormatter(logging.Formatter("[%(module_name)s] %(message)s"))
+
+    _handler = QueueHandler(_queue)
+    _handler.addFilter(RateLimitFilter(LOG_RATE_LIMIT))
+
+    root = logging.getLogger(ROOT)
+    root.addHandler(_handler)
+    root.propagate = False
+
+    _writer = _Writer(_queue, out)
+    _writer.start()
+    atexit.register(flush_logs)
+
+    configure_logging()
+
+
+def _restart_in_child():
+    # Thread writer tidak ikut ter-fork (mis. worker ProcessPoolExecutor): buat ulang
+    global _queue, _writer
+    if _handler is None:
+        return
+    _queue = queue.Queue()
+    _handler.queue = _queue
+    _writer = _Writer(_queue, _writer.handler)
+    _writer.start()
+
+
+os.register_at_fork(after_in_child=_restart_in_child)
+
+
+def flush_logs():
+    """Tunggu sampai semua pesan di queue selesai ditulis"""
+    if _queue is not None:
+        _queue.join()
+        sys.stdout.flush()
+
+
+class _ModuleAdapter(logging.LoggerAdapter):
+    def process(self, msg, kwargs):
+        extra = dict(kwargs.pop("extra", None) or {})
+        extra["module_name"] = self.extra["module_name"]
+        if "key" in kwargs:
+            extra["key"] = kwargs.pop("key")
+        kwargs["extra"] = extra
+        return msg, kwargs
+
+
+def get_logger(name):
+    """
+    Logger untuk satu modul (AIModel, Vehicle, KnowledgeModel, SharedState, ...).
+    Pakai format lazy: log.info("Loaded %.2f kg", kg) -- string hanya dibentuk
+    jika level aktif. key="..." mengaktifkan rate limit per key.
+    """
+    _ensure_started()
+    return _ModuleAdapter(logging.getLogger(f"{ROOT}.{name}"), {"module_name": name})
@@ -1,5 +1,8 @@
 import random
 from ..classes.vehicle import Vehicle
+from .logger import get_logger
+
+log = get_logger("Simulation")
 
 # ========== GENERATE TPS GARBAGES ==========
 def generate_tps_garbage(TPS_nodes, shared):
@@ -15,14 +18,14 @@ def generate_tps_garbage(TPS_nodes, shared):
                     actual_sampah = max(0, actual_sampah)
                     
                     tps_data["sampah_kg"] = actual_sampah
-                    print(f"[Simulation] TPS {tps_id}: Initial garbage {actual_sampah:.2f} kg")
+                    log.debug("TPS %s: Initial garbage %.2f kg", tps_id, actual_sampah)
 
 
 
 # ========== GENERATE DAILY GARBAGES ==========
 def generate_daily_garbage(shared, TPS_nodes, ai_model, last_garbage_generation_day):
     if shared.sim_day > last_garbage_generation_day:
-        print(f"\n[Simulation] Day {shared.sim_day}: Generating daily garbage...")
+        log.info("Day %s: Generating daily garbage...", shared.sim_day)
         
         ai_model.reset_daily()
         
@@ -38,42 +41,55 @@ def generate_daily_garbage(shared, TPS_nodes, ai_model, last_garbage_generation_
                     daily_garbage = max(0, daily_garbage)
                     
                     tps_data["sampah_kg"] += daily_garbage
-                    print(f"[Simulation] TPS {tps_id}: +{daily_garbage:.2f} kg (total: {tps_data['sampah_kg']:.2f} kg)")
+                    log.debug("TPS %s: +%.2f kg (total: %.2f kg)", tps_id, daily_garbage, tps_data["sampah_kg"])
         
         last_garbage_generation_day = shared.sim_day
     return last_garbage_generation_day
 
 
 
+# ========== OVERRIDE FLEET SIZE ==========
+def assign_fleet_size(shared, GARAGE_nodes, total_vehicles):
+    """Bagi total armada rata ke semua garasi (urut id); sisa pembagian dibagi satu-satu ke garasi pertama dst."""
+    garage_list = sorted(GARAGE_nodes)
+    if not garage_list:
+        return
+
+    base, extra = divmod(total_vehicles, len(garage_list))
+    for i, garage_id in enumerate(garage_list):
+        garage_data = shared.node_type[garage_id].setdefault("garage_data", {})
+        garage_data["total_armada"] = base + (1 if i < extra else 0)
+        log.info("Garage %s: total_armada=%s (override)", garage_id, garage_data["total_armada"])
+
+
+
 # ========== SPAWN CARS FROM GARAGE ==========
 def generate_car_in_garage(GARAGE_nodes, shared, vehicles, GRAPH, TPS_nodes, TPA_nodes):
     
     # ===== CREATE VEHICLES =====
-    print(f"\n{'='*60}")
-    print(f"[Simulation] CREATING VEHICLES")
-    print(f"{'='*60}")
+    log.info("===== CREATING VEHICLES =====")
 
     garage_list = list(GARAGE_nodes)
     
     if garage_list:
         total_vehicles_created = 0
         
-        print(f"[Simulation] Resetting garage stats...")
+        log.debug("Resetting garage stats...")
         for garage_id in garage_list:
             if garage_id in shared.node_type:
                 garage_data = shared.node_type[garage_id].get("garage_data", {})
                 garage_data["armada_bertugas"] = 0
                 garage_data["armada_standby"] = 0
-                print(f"[Simulation]   Garage {garage_id}: total_armada={garage_data.get('total_armada', 0)}")
+                log.debug("  Garage %s: total_armada=%s", garage_id, garage_data.get("total_armada", 0))
         
-        print(f"\n[Simulation] Creating vehicles for each garage...")
+        log.debug("Creating vehicles for each garage...")
         for garage_id in garage_list:
             if garage_id in shared.node_type:
                 garage_data = shared.node_type[garage_id].get("garage_data", {})
                 armada_count = garage_data.get("total_armada", 0)
                 
                 if armada_count > 0:
-                    print(f"\n[Simulation] Garage {garage_id}: Creating {armada_count} vehicles...")
+                    log.debug("Garage %s: Creating %s vehicles...", garage_id, armada_count)
                     
                     for i in range(armada_count):
                         vehicle = Vehicle(GRAPH, TPS_nodes, TPA_nodes, garage_list, shared=shared)
@@ -85,40 +101,32 @@ def generate_car_in_garage(GARAGE_nodes, shared, vehicles, GRAPH, TPS_nodes, TPA
                         total_vehicles_created += 1
                         
                         if total_vehicles_created % 10 == 0:
-                            print(f"[Simulation]   Progress: {total_vehicles_created} vehicles created...")
+                            log.debug("  Progress: %s vehicles created...", total_vehicles_created)
                     
-                    print(f"[Simulation]   ✓ Garage {garage_id}: {armada_count} vehicles created")
-        
-        print(f"\n{'='*60}")
-        print(f"[Simulation] ✓ Total vehicles created: {total_vehicles_created}")
-        print(f"{'='*60}")
-        
+                    log.info("  ✓ Garage %s: %s vehicles created", garage_id, armada_count)
+
+        log.info("✓ Total vehicles created: %s", total_vehicles_created)
+
         if total_vehicles_created == 0:
-            print(f"\n[WARNING] No armada configured in any garage!")
+            log.warning("No armada configured in any garage!")
         
         shared.total_vehicles = total_vehicles_created
     else:
-        print("[WARNING] No garage nodes found!")
-    
-    print(f"\n[Simulation] Assigning vehicles to shared state...")
-    print(f"[Simulation]   Local: {len(vehicles)}, Shared (before): {len(shared.vehicles)}")
-    
+        log.warning("No garage nodes found!")
+
+    log.debug("Assigning vehicles to shared state (local: %s, shared before: %s)", len(vehicles), len(shared.vehicles))
+
     shared.vehicles = vehicles
-    
-    print(f"[Simulation]   Shared (after): {len(shared.vehicles)}")
-    
+
     if len(shared.vehicles) != len(vehicles):
-        print(f"[ERROR] Mismatch! Local: {len(vehicles)}, Shared: {len(shared.vehicles)}")
+        log.error("Mismatch! Local: %s, Shared: %s", len(vehicles), len(shared.vehicles))
     else:
-        print(f"[Simulation] ✓ Vehicle assignment successful!")
+        log.debug("✓ Vehicle assignment successful!")
     
     vehicle_ids = [v.id for v in shared.vehicles]
     unique_ids = set(vehicle_ids)
     if len(vehicle_ids) != len(unique_ids):
-        print(f"[WARNING] Duplicate vehicle IDs!")
-        print(f"[WARNING]   Total: {len(vehicle_ids)}, Unique: {len(unique_ids)}")
-    
-    print(f"{'='*60}\n")
+        log.warning("Duplicate vehicle IDs! Total: %s, Unique: %s", len(vehicle_ids), len(unique_ids))
 
 
 
@@ -138,14 +146,12 @@ def initNodes(GRAPH, shared):
         if node_data.get("garage", False):
             GARAGE_nodes.add(node_id)
     
-    print(f"[Simulation] Loaded TPS nodes: {len(TPS_nodes)}")
-    print(f"[Simulation] Loaded TPA nodes: {len(TPA_nodes)}")
-    print(f"[Simulation] Loaded Garage nodes: {len(GARAGE_nodes)}")
-    
+    log.info("Loaded TPS nodes: %s, TPA nodes: %s, Garage nodes: %s", len(TPS_nodes), len(TPA_nodes), len(GARAGE_nodes))
+
     if TPA_nodes:
-        print(f"[Simulation] TPA nodes list: {list(TPA_nodes)}")
+        log.debug("TPA nodes list: %s", list(TPA_nodes))
     else:
-        print(f"[Simulation] ⚠️ WARNING: NO TPA NODES CONFIGURED!")
+        log.warning("⚠️ NO TPA NODES CONFIGURED!")
     
     shared.node_count = GRAPH.number_of_nodes()
     shared.edge_count = GRAPH.number_of_edges()
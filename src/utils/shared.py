@@ -1,16 +1,23 @@
 import json
 import os
-from ..environment import GRAPH_FILE
+from ..environment import GRAPH_FILE, SIM_START_HOUR
+from .logger import get_logger
+from .ui_channel import SnapshotChannel
+
+log = get_logger("SharedState")
 
 class SharedState:
-    def __init__(self):
+    def __init__(self, graph_file=GRAPH_FILE):
         self.fps = 0
         self.sim_hour = 8
         self.sim_min = 0
         self.sim_day = 1
+        self.sim_seconds = 0  # detik simulasi sejak start (int, monotonic), diisi engine
+        self.sim_start_hour = SIM_START_HOUR
         self.speed = 1.0
         self.paused = False
         self.simulation_running = False
+        self.ui_channel = SnapshotChannel()  # snapshot throttled untuk window Tk
         
         self.node_state_window = None
         self.edge_state_window = None
@@ -22,6 +29,9 @@ class SharedState:
         # === TIPE NODE (TPS / TPA / GARAGE) ===
         self.node_type = {}
         self.edge_type = {}
+        self.graph_index = None
+        self.fleet = None  # FleetState (struct-of-arrays armada), dibuat oleh engine
+        self.map_version = 0  # naik setiap kali tampilan peta (edge/node) diedit
         self.vehicles = []
         self.total_vehicles = 0
         
@@ -34,7 +44,7 @@ class SharedState:
         
         # === DYNAMIC PATH FILE DATA ===
         self.data_dir = os.path.join("data", "saved")
-        self.graph_base_name = self._extract_graph_name(GRAPH_FILE)
+        self.graph_base_name = self._extract_graph_name(graph_file)
         self.node_data_file = os.path.join(self.data_dir, f"{self.graph_base_name}_node_data.json")
         self.edge_data_file = os.path.join(self.data_dir, f"{self.graph_base_name}_edge_data.json")
 
@@ -56,8 +66,39 @@ class SharedState:
             for n in G.nodes()
         }
 
-        print("[SharedState] Attempting to load saved data...")
+        log.info("Attempting to load saved data...")
         self.load_all_data()
+        self.mark_map_dirty()
+
+    def set_edge_slowdown(self, edge_id, value):
+        """Update slowdown edge "u-v" di dict JSON dan array GraphIndex sekaligus"""
+        self.edge_type[edge_id] = {"slowdown": value}
+        if self.graph_index is not None:
+            self.graph_index.set_slowdown(edge_id, value)
+        self.mark_map_dirty()
+
+    def mark_map_dirty(self):
+        """Minta viewer me-render ulang layer jalan statis"""
+        self.map_version += 1
+
+    def ui_snapshot(self):
+        """Nilai yang ditampilkan ProgramSummaryWindow (dibangun di sim thread)"""
+        return {
+            "fps": self.fps,
+            "sim_hour": self.sim_hour,
+            "sim_min": self.sim_min,
+            "sim_day": self.sim_day,
+            "speed": self.speed,
+            "paused": self.paused,
+            "node": self.node_count,
+            "edge": self.edge_count,
+            "tps": self.num_tps,
+            "tpa": self.num_tpa,
+            "truk": self.total_vehicles,
+        }
+
+    def publish_ui(self, force=False):
+        self.ui_channel.publish(self.ui_snapshot, force)
 
     def get_total_vehicles(self):
         total = 0
@@ -86,7 +127,7 @@ class SharedState:
         self.paused = self.get_pause_state()
 
     def reset_vehicles(self):
-        print(f"[SharedState] Resetting {len(self.vehicles)} vehicles...")
+        log.info("Resetting %s vehicles...", len(self.vehicles))
         
         vehicle_count_before = len(self.vehicles)
         
@@ -99,10 +140,10 @@ class SharedState:
         self.vehicles.clear()
         self.total_vehicles = 0
         
-        print(f"[SharedState] Vehicles reset: {vehicle_count_before} → {len(self.vehicles)}")
+        log.info("Vehicles reset: %s → %s", vehicle_count_before, len(self.vehicles))
         
         if len(self.vehicles) != 0:
-            print("[ERROR] Vehicles list not empty after reset!")
+            log.error("Vehicles list not empty after reset!")
         
         return vehicle_count_before
 
@@ -110,7 +151,7 @@ class SharedState:
     def ensure_data_dir(self):
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
-            print(f"[SharedState] Created data directory: {self.data_dir}")
+            log.info("Created data directory: %s", self.data_dir)
 
     def _serialize_node_for_save(self, node_id, node_data):
         return {
@@ -138,10 +179,10 @@ class SharedState:
             with open(self.node_data_file, 'w') as f:
                 json.dump(serializable_data, f, indent=2)
             
-            print(f"[SharedState] Node data saved to {self.node_data_file}")
+            log.info("Node data saved to %s", self.node_data_file)
             return True
         except Exception as e:
-            print(f"[SharedState] Error saving node data: {e}")
+            log.error("Error saving node data: %s", e)
             return False
 
     def save_edge_data(self):
@@ -151,10 +192,10 @@ class SharedState:
             with open(self.edge_data_file, 'w') as f:
                 json.dump(self.edge_type, f, indent=2)
             
-            print(f"[SharedState] Edge data saved to {self.edge_data_file}")
+            log.info("Edge data saved to %s", self.edge_data_file)
             return True
         except Exception as e:
-            print(f"[SharedState] Error saving edge data: {e}")
+            log.error("Error saving edge data: %s", e)
             return False
 
     def save_all_data(self):
@@ -162,16 +203,16 @@ class SharedState:
         edge_success = self.save_edge_data()
         
         if node_success and edge_success:
-            print("[SharedState] All data saved successfully!")
+            log.info("All data saved successfully!")
             return True
         else:
-            print("[SharedState] Failed to save some data")
+            log.error("Failed to save some data")
             return False
 
     def load_node_data(self):
         if not os.path.exists(self.node_data_file):
-            print(f"[SharedState] Node data file not found: {self.node_data_file}")
-            print(f"[SharedState] Starting with fresh node data")
+            log.info("Node data file not found: %s", self.node_data_file)
+            log.info("Starting with fresh node data")
             return False
         
         try:
@@ -202,29 +243,31 @@ class SharedState:
                         
                         loaded_count += 1
                 except ValueError:
-                    print(f"[SharedState] Warning: Invalid node_id {node_id_str}")
+                    log.warning("Invalid node_id %s", node_id_str)
                     continue
             
-            print(f"[SharedState] Node data loaded from {self.node_data_file} ({loaded_count} nodes)")
+            log.info("Node data loaded from %s (%s nodes)", self.node_data_file, loaded_count)
             return True
         except Exception as e:
-            print(f"[SharedState] Error loading node data: {e}")
+            log.error("Error loading node data: %s", e)
             return False
 
     def load_edge_data(self):
         if not os.path.exists(self.edge_data_file):
-            print(f"[SharedState] Edge data file not found: {self.edge_data_file}")
-            print(f"[SharedState] Starting with fresh edge data")
+            log.info("Edge data file not found: %s", self.edge_data_file)
+            log.info("Starting with fresh edge data")
             return False
         
         try:
             with open(self.edge_data_file, 'r') as f:
                 self.edge_type = json.load(f)
             
-            print(f"[SharedState] Edge data loaded from {self.edge_data_file} ({len(self.edge_type)} edges)")
+            log.info("Edge data loaded from %s (%s edges)", self.edge_data_file, len(self.edge_type))
+            if self.graph_index is not None:
+                self.graph_index.load_slowdowns(self.edge_type)
             return True
         except Exception as e:
-            print(f"[SharedState] Error loading edge data: {e}")
+            log.error("Error loading edge data: %s", e)
             return False
 
     def load_all_data(self):
@@ -232,13 +275,13 @@ class SharedState:
         edge_success = self.load_edge_data()
         
         if node_success and edge_success:
-            print("[SharedState] ✓ All data loaded successfully!")
+            log.info("✓ All data loaded successfully!")
             return True
         elif node_success or edge_success:
-            print("[SharedState] ⚠ Partial data loaded")
+            log.warning("⚠ Partial data loaded")
             return True
         else:
-            print("[SharedState] ℹ No saved data found, using defaults")
+            log.info("ℹ No saved data found, using defaults")
             return False
 
     def auto_save(self):
@@ -0,0 +1,271 @@
+import heapq
+import numpy as np
+
+INF = float("inf")
+
+
+class ShortestPathTrees:
+    """
+    Pohon Dijkstra yang berakar di beberapa node tujuan (TPS/TPA/garasi).
+
+    Setiap pohon dihitung di graph terbalik, sehingga dist[r, n] adalah jarak
+    DARI node n MENUJU root r, dan next_node[r, n] adalah node berikutnya di
+    jalur n -> root. Semua disimpan dalam array (k x N) per index node.
+
+    cached: pohon lain dengan bobot yang sama (ShortestPathTrees atau entri
+    distance_cache); baris root yang sudah ada di sana disalin, hanya root
+    baru yang dihitung Dijkstra.
+    """
+
+    def __init__(self, index, roots, weights=None, cached=None):
+        self.index = index
+        self.weights = index.length.copy() if weights is None else np.asarray(weights, dtype=np.float64)
+        self.weight_list = self.weights.tolist()  # salinan list, diupdate di set_edge_weight
+
+        self.roots = []
+        self.root_row = {}
+        for r in roots:
+            if r in index.node_idx and r not in self.root_row:
+                self.root_row[r] = len(self.roots)
+                self.roots.append(r)
+
+        k, N = len(self.roots), index.num_nodes
+        self.dist = np.full((k, N), INF, dtype=np.float64)
+        self.next_node = np.full((k, N), -1, dtype=np.int32)
+        self.next_edge = np.full((k, N), -1, dtype=np.int32)
+
+        cached_row = {} if cached is None else {r: i for i, r in enumerate(cached.roots)}
+        reuse = [(row, cached_row[r]) for row, r in enumerate(self.roots) if r in cached_row]
+        if reuse:
+            rows, src = (list(x) for x in zip(*reuse))
+            self.dist[rows] = cached.dist[src]
+            self.next_node[rows] = cached.next_node[src]
+            self.next_edge[rows] = cached.next_edge[src]
+        self.built_rows = [row for row, r in enumerate(self.roots) if r not in cached_row]
+
+        for row in self.built_rows:
+            self._build_tree(row)
+
+    def _build_tree(self, row):
+        root = self.index.node_idx[self.roots[row]]
+        N = self.index.num_nodes
+        in_adj = self.index.in_adj
+        w = self.weight_list
+
+        dist = [INF] * N
+        nxt = [-1] * N
+        nxe = [-1] * N
+        dist[root] = 0.0
+        heap = [(0.0, root)]
+
+        while heap:
+            d, v = heapq.heappop(heap)
+            if d > dist[v]:
+                continue
+            for u, e in in_adj[v]:
+                nd = d + w[e]
+                if nd < dist[u]:
+                    dist[u] = nd
+                    nxt[u] = v
+                    nxe[u] = e
+                    heapq.heappush(heap, (nd, u))
+
+        self.dist[row] = dist
+        self.next_node[row] = nxt
+        self.next_edge[row] = nxe
+
+    # ============== DYNAMIC UPDATE ==============
+    def set_edge_weight(self, e, new_weight):
+        """
+        Ubah bobot satu edge dan perbaiki hanya bagian pohon yang terdampak.
+        Penurunan bobot: propagasi Dijkstra dari ujung edge.
+        Kenaikan bobot: hanya jika edge ada di pohon, subtree di bawahnya
+        di-invalidate lalu dihitung ulang dari tetangga di luar subtree.
+        """
+        old_weight = self.weights[e]
+        if new_weight == old_weight:
+            return
+        self.weights[e] = new_weight
+        self.weight_list[e] = new_weight
+
+        u = int(self.index.edge_src[e])
+        v = int(self.index.edge_dst[e])
+
+        for row in range(len(self.roots)):
+            if new_weight < old_weight:
+                self._repair_decrease(row, u, v, e)
+            elif self.next_edge[row, u] == e:
+                self._repair_increase(row, u)
+
+    def set_edge_weights(self, edges, new_weights):
+        for e, w in zip(edges, new_weights):
+            self.set_edge_weight(e, w)
+
+    def _repair_decrease(self, row, u, v, e):
+        dist = self.dist[row]
+        nd = dist[v] + self.weights[e]
+        if nd >= dist[u]:
+            return
+        dist[u] = nd
+        self.next_node[row, u] = v
+        self.next_edge[row, u] = e
+        self._propagate(row, [(nd, u)])
+
+    def _repair_increase(self, row, u):
+        dist = self.dist[row]
+        nxe = self.next_edge[row]
+        in_adj = self.index.in_adj
+        out_adj = self.index.out_adj
+        w = self.weight_list
+
+        # Kumpulkan subtree: semua node yang jalurnya ke root melewati u
+        subtree = [u]
+        affected = {u}
+        i = 0
+        while i < len(subtree):
+            y = subtree[i]
+            i += 1
+            for x, e2 in in_adj[y]:
+                if nxe[x] == e2 and x not in affected:
+                    affected.add(x)
+                    subtree.append(x)
+
+        for x in subtree:
+            dist[x] = INF
+            self.next_node[row, x] = -1
+            nxe[x] = -1
+
+        # Seed: jarak terbaik tiap node terdampak lewat tetangga yang tidak terdampak
+        heap = []
+        for x in subtree:
+            best, best_y, best_e = INF, -1, -1
+            for y, e2 in out_adj[x]:
+                if y in affected:
+                    continue
+                nd = dist[y] + w[e2]
+                if nd < best:
+                    best, best_y, best_e = nd, y, e2
+            if best < INF:
+                dist[x] = best
+                self.next_node[row, x] = best_y
+                nxe[x] = best_e
+                heap.append((best, x))
+
+        heapq.heapify(heap)
+        self._propagate(row, heap)
+
+    def _propagate(self, row, heap):
+        dist = self.dist[row]
+        nxt = self.next_node[row]
+        nxe = self.next_edge[row]
+        in_adj = self.index.in_adj
+        w = self.weight_list
+
+        while heap:
+            d, v = heapq.heappop(heap)
+            if d > dist[v]:
+                continue
+            for u, e in in_adj[v]:
+                nd = d + w[e]
+                if nd < dist[u]:
+                    dist[u] = nd
+                    nxt[u] = v
+                    nxe[u] = e
+                    heapq.heappush(heap, (nd, u))
+
+    # ============== QUERIES ==============
+    def has_root(self, node_id):
+        return node_id in self.root_row
+
+    def distance(self, node_id, root):
+        """Jarak node_id -> root, inf jika tidak terjangkau"""
+        row = self.root_row.get(root)
+        idx = self.index.node_idx.get(node_id)
+        if row is None or idx is None:
+            return INF
+        return float(self.dist[row, idx])
+
+    def distances_from(self, node_id):
+        """Array jarak node_id -> setiap root (urutan self.roots), O(k)"""
+        idx = self.index.node_idx.get(node_id)
+        if idx is None:
+            return np.full(len(self.roots), INF)
+        return self.dist[:, idx]
+
+    def path(self, node_id, root):
+        """Jalur node_id -> root (list node_id), None jika tidak terjangkau"""
+        row = self.root_row.get(root)
+        idx = self.index.node_idx.get(node_id)
+        if row is None or idx is None or self.dist[row, idx] == INF:
+            return None
+
+        nxt = self.next_node[row]
+        root_idx = self.index.node_idx[root]
+        node_ids = self.index.node_ids
+
+        path = [node_id]
+        while idx != root_idx:
+            idx = nxt[idx]
+            path.append(node_ids[idx])
+        return path
+
+
+class DistanceOracle(ShortestPathTrees):
+    """
+    Oracle jarak statis (bobot = panjang edge) dari node mana pun ke setiap
+    TPS, TPA dan garasi. Dipakai bersama oleh KnowledgeModel dan AIModel.
+    """
+
+    def distances_to(self, node_id, targets):
+        """Dict target -> jarak dari node_id, O(len(targets))"""
+        dists = self.distances_from(node_id).tolist()
+        return {t: dists[self.root_row[t]] if t in self.root_row else INF for t in targets}
+
+
+def shortest_path_excluding(index, weights, source, target, banned_edges=()):
+    """
+    Dijkstra source -> target langsung di CSR GraphIndex tanpa menyalin graph.
+    weights: list bobot per edge index (GraphIndex.length_list atau
+    ShortestPathTrees.weight_list), dipakai langsung tanpa disalin.
+    banned_edges: set edge index yang tidak boleh dilewati.
+    Return list node_id, atau None jika tidak ada jalur.
+    """
+    src = index.node_idx.get(source)
+    dst = index.node_idx.get(target)
+    if src is None or dst is None:
+        return None
+    if src == dst:
+        return [source]
+
+    out_adj = index.out_adj
+    w = weights
+
+    dist = {src: 0.0}
+    prev = {}
+    heap = [(0.0, src)]
+
+    while heap:
+        d, v = heapq.heappop(heap)
+        if v == dst:
+            break
+        if d > dist[v]:
+            continue
+        for u, e in out_adj[v]:
+            if e in banned_edges:
+                continue
+            nd = d + w[e]
+            if nd < dist.get(u, INF):
+                dist[u] = nd
+                prev[u] = v
+                heapq.heappush(heap, (nd, u))
+    else:
+        return None
+
+    node_ids = index.node_ids
+    path = [target]
+    v = dst
+    while v != src:
+        v = prev[v]
+        path.append(node_ids[v])
+    path.reverse()
+    return path
@@ -0,0 +1,118 @@
+import math
+import numpy as np
+
+
+class SpatialGrid:
+    """
+    Grid seragam di koordinat dunia untuk picking (klik) node dan edge.
+
+    Titik dimasukkan ke satu sel, segmen ke semua sel yang dilewati bounding
+    box-nya. Query hanya memeriksa sel di sekitar titik klik, lalu jarak
+    dihitung vectorized untuk kandidat saja.
+    """
+
+    def __init__(self, xy, seg_src=None, seg_dst=None, cell_size=None):
+        self.xy = np.asarray(xy, dtype=np.float64)
+        self.seg_src = None if seg_src is None else np.asarray(seg_src, dtype=np.int64)
+        self.seg_dst = None if seg_dst is None else np.asarray(seg_dst, dtype=np.int64)
+
+        self.min_x = float(self.xy[:, 0].min()) if len(self.xy) else 0.0
+        self.min_y = float(self.xy[:, 1].min()) if len(self.xy) else 0.0
+
+        if cell_size is None:
+            cell_size = self._default_cell_size()
+        self.cell_size = cell_size
+
+        self.point_cells = self._bucket_points()
+        self.segment_cells = self._bucket_segments() if self.seg_src is not None else {}
+
+    def _default_cell_size(self):
+        # Rata-rata panjang segmen (cukup kecil supaya sel berisi sedikit kandidat)
+        if self.seg_src is not None and len(self.seg_src):
+            seg = self.xy[self.seg_dst] - self.xy[self.seg_src]
+            size = float(np.hypot(seg[:, 0], seg[:, 1]).mean())
+            if size > 0:
+                return size
+
+        span = np.ptp(self.xy, axis=0).max() if len(self.xy) else 1.0
+        return float(span) / max(1.0, math.sqrt(len(self.xy))) or 1.0
+
+    def _cell_of(self, x, y):
+        return (int(math.floor((x - self.min_x) / self.cell_size)),
+                int(math.floor((y - self.min_y) / self.cell_size)))
+
+    # ============== BUILD ==============
+    def _bucket_points(self):
+        cells = {}
+        cx = np.floor((self.xy[:, 0] - self.min_x) / self.cell_size).astype(np.int64).tolist()
+        cy = np.floor((self.xy[:, 1] - self.min_y) / self.cell_size).astype(np.int64).tolist()
+        for i, key in enumerate(zip(cx, cy)):
+            cells.setdefault(key, []).append(i)
+        return {key: np.array(items, dtype=np.int64) for key, items in cells.items()}
+
+    def _bucket_segments(self):
+        cells = {}
+        p1 = self.xy[self.seg_src]
+        p2 = self.xy[self.seg_dst]
+        lo = np.floor((np.minimum(p1, p2) - (self.min_x, self.min_y)) / self.cell_size).astype(np.int64).tolist()
+        hi = np.floor((np.maximum(p1, p2) - (self.min_x, self.min_y)) / self.cell_size).astype(np.int64).tolist()
+        for s, ((x0, y0), (x1, y1)) in enumerate(zip(lo, hi)):
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    cells.setdefault((cx, cy), []).append(s)
+        return {key: np.array(items, dtype=np.int64) for key, items in cells.items()}
+
+    def _candidates(self, cells, x, y, radius):
+        x0, y0 = self._cell_of(x - radius, y - radius)
+        x1, y1 = self._cell_of(x + radius, y + radius)
+
+        found = []
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(cells):
+            # Radius lebih besar dari grid (zoom sangat jauh): ambil semua sel
+            found = list(cells.values())
+        else:
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    items = cells.get((cx, cy))
+                    if items is not None:
+                        found.append(items)
+
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    # ============== QUERY ==============
+    def nearest_point(self, x, y, radius):
+        """Index titik terdekat dalam kotak +-radius dari (x, y), -1 jika tidak ada"""
+        cand = self._candidates(self.point_cells, x, y, radius)
+        if not len(cand):
+            return -1
+
+        d = np.abs(self.xy[cand] - (x, y))
+        inside = (d[:, 0] <= radius) & (d[:, 1] <= radius)
+        if not inside.any():
+            return -1
+
+        cand = cand[inside]
+        d = d[inside]
+        return int(cand[np.argmin(d[:, 0] ** 2 + d[:, 1] ** 2)])
+
+    def nearest_segment(self, x, y, radius):
+        """Index segmen terdekat dengan jarak <= radius dari (x, y), -1 jika tidak ada"""
+        cand = self._candidates(self.segment_cells, x, y, radius)
+        if not len(cand):
+            return -1
+
+        p1 = self.xy[self.seg_src[cand]]
+        seg = self.xy[self.seg_dst[cand]] - p1
+        rel = np.array((x, y)) - p1
+
+        seg_len2 = (seg ** 2).sum(axis=1)
+        t = np.divide((rel * seg).sum(axis=1), seg_len2, out=np.zeros(len(cand)), where=seg_len2 > 0)
+        t = np.clip(t, 0.0, 1.0)
+
+        dist2 = ((rel - seg * t[:, None]) ** 2).sum(axis=1)
+        best = int(np.argmin(dist2))
+        if dist2[best] > radius * radius:
+            return -1
+        return int(cand[best])
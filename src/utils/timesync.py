@@ -1,3 +1,5 @@
+from ..environment import SIM_START_HOUR
+
 def sync(shared, curr_time_acc):
     sim_time_acc = curr_time_acc
     if hasattr(shared, "time_modified") and shared.time_modified:
@@ -20,4 +22,23 @@ def getDt(time, last_time):
     dt = now - last_time
     last_time = now
 
-    return dt, last_time
\ No newline at end of file
+    return dt, last_time
+
+def split_sim_time(sim_seconds, start_hour=SIM_START_HOUR):
+    """Detik simulasi -> (day, hour, minute)"""
+    total_minutes = sim_seconds // 60
+    return 1 + (total_minutes // (24 * 60)), (start_hour + (total_minutes // 60)) % 24, total_minutes % 60
+
+def apply_sim_time(shared, sim_time_acc, start_hour=SIM_START_HOUR):
+    # Jam integer monotonic (detik sejak awal simulasi), satu-satunya
+    # representasi waktu di dalam model; day/hour/min hanya turunan untuk UI
+    shared.sim_seconds = int(sim_time_acc)
+    shared.sim_start_hour = start_hour
+    shared.sim_day, shared.sim_hour, shared.sim_min = split_sim_time(shared.sim_seconds, start_hour)
+
+def format_sim_time(shared, sim_seconds=None):
+    """Detik simulasi -> "Day d HH:MM" (hanya di batas UI/laporan)"""
+    if sim_seconds is None:
+        sim_seconds = shared.sim_seconds
+    day, hour, minute = split_sim_time(sim_seconds, shared.sim_start_hour)
+    return f"Day {day} {hour:02d}:{minute:02d}"
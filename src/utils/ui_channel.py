@@ -0,0 +1,52 @@
+import threading
+import time
+from ..environment import UI_PUBLISH_HZ
+
+_MISSING = object()
+
+
+class SnapshotChannel:
+    """
+    Saluran satu arah sim thread -> window Tk.
+
+    Sim thread memanggil publish() setiap frame; snapshot (dict kecil nilai
+    primitif) hanya dibangun dan disimpan paling banyak UI_PUBLISH_HZ kali per
+    detik. Window Tk mem-poll dengan interval yang sama, melihat `version`
+    dulu (murah) dan hanya mengubah widget yang nilainya berbeda dari yang
+    sedang ditampilkan.
+    """
+
+    def __init__(self, rate=UI_PUBLISH_HZ):
+        self.interval = 1.0 / rate
+        self.interval_ms = max(1, int(self.interval * 1000))
+        self.version = 0
+        self._snapshot = {}
+        self._next_publish = 0.0
+        self._lock = threading.Lock()
+
+    def publish(self, build_snapshot, force=False):
+        """build_snapshot() hanya dipanggil jika sudah waktunya publish (atau force)"""
+        now = time.monotonic()
+        if not force and now < self._next_publish:
+            return False
+        self._next_publish = now + self.interval
+
+        snapshot = build_snapshot()
+        with self._lock:
+            if snapshot == self._snapshot:
+                return False
+            self._snapshot = snapshot
+            self.version += 1
+        return True
+
+    def read(self):
+        """(version, snapshot) terbaru; snapshot jangan diubah oleh pembaca"""
+        with self._lock:
+            return self.version, self._snapshot
+
+
+def diff_snapshot(shown, snapshot):
+    """Key yang nilainya berubah dibanding `shown` (dict yang sedang ditampilkan, ikut diupdate)"""
+    changed = {key: value for key, value in snapshot.items() if shown.get(key, _MISSING) != value}
+    shown.update(changed)
+    return changed
@@ -1,5 +1,7 @@
 import pygame
+import numpy as np
 from ..environment import WIDTH, HEIGHT, TPA_COL, TPS_COL, GARAGE_COL
+from .spatial_index import SpatialGrid
 import math
 
 class GraphViewer:
@@ -18,35 +20,96 @@ class GraphViewer:
         self.min_y = min(p[1] for p in pos_dict.values())
         self.max_y = max(p[1] for p in pos_dict.values())
 
-        self.cache = {}
-        self.last_scale = None
-        self.last_offx = None
-        self.last_offy = None
+        # Posisi node sebagai array (N, 2) dan koordinat layar hasil transform
+        # vectorized, dihitung ulang sekali setiap kali kamera berubah
+        self.node_ids = list(pos_dict.keys())
+        self.node_row = {n: i for i, n in enumerate(self.node_ids)}
+        self.node_xy = np.array([pos_dict[n] for n in self.node_ids], dtype=np.float64)
+        self.node_screen = None
+        self._camera_key = None
+
+        # Baris node_xy untuk setiap node index GraphIndex (urutan bisa beda dari pos_dict)
+        self._rows_index = None
+        self._index_rows = None
+
+        # Grid spasial untuk picking, di koordinat dunia (tidak terpengaruh kamera)
+        self.node_grid = SpatialGrid(self.node_xy)
+        self.edge_grid = None
+        self._edge_grid_index = None
+
+        # Layer jalan statis (off-screen), hanya di-render ulang saat kamera
+        # bergeser/zoom atau peta diedit (shared.map_version berubah)
+        self.road_layer = None
+        self._road_layer_key = None
 
     def transform(self, x, y):
         px = (x - self.min_x) * self.scale + self.offset_x
         py = (self.max_y - y) * self.scale + self.offset_y
         return int(px), int(py)
 
-    def transform_cached(self, node):
-        x, y = self.pos[node]
-
-        if (self.scale != self.last_scale or
-            self.offset_x != self.last_offx or
-            self.offset_y != self.last_offy):
-            self.cache = {}
-
-        if node in self.cache:
-            return self.cache[node]
+    def transform_array(self, xy):
+        """Transform (M, 2) koordinat dunia ke layar (int) sekaligus"""
+        screen = np.empty(xy.shape, dtype=np.float64)
+        screen[:, 0] = (xy[:, 0] - self.min_x) * self.scale + self.offset_x
+        screen[:, 1] = (self.max_y - xy[:, 1]) * self.scale + self.offset_y
+        return screen.astype(np.int64)
+
+    def get_node_screen(self):
+        """Koordinat layar semua node (N, 2), dihitung ulang hanya saat kamera berubah"""
+        key = (self.scale, self.offset_x, self.offset_y)
+        if key != self._camera_key:
+            self.node_screen = self.transform_array(self.node_xy)
+            self._camera_key = key
+        return self.node_screen
 
-        screen_pos = self.transform(x, y)
-        self.cache[node] = screen_pos
-        return screen_pos
+    def transform_cached(self, node):
+        px, py = self.get_node_screen()[self.node_row[node]]
+        return int(px), int(py)
 
-    def finish_frame(self):
-        self.last_scale = self.scale
-        self.last_offx = self.offset_x
-        self.last_offy = self.offset_y
+    def inverse_transform(self, px, py):
+        """Koordinat layar -> koordinat dunia"""
+        x = (px - self.offset_x) / self.scale + self.min_x
+        y = self.max_y - (py - self.offset_y) / self.scale
+        return x, y
+
+    def get_index_rows(self, index):
+        """Baris node_xy untuk setiap node index GraphIndex"""
+        if self._rows_index is not index:
+            self._rows_index = index
+            self._index_rows = np.array([self.node_row[n] for n in index.node_ids], dtype=np.int64)
+        return self._index_rows
+
+    def get_edge_grid(self):
+        index = self.shared.graph_index
+        if index is None:
+            return None
+        if self._edge_grid_index is not index:
+            rows = self.get_index_rows(index)
+            self.edge_grid = SpatialGrid(self.node_xy, rows[index.edge_src], rows[index.edge_dst])
+            self._edge_grid_index = index
+        return self.edge_grid
+
+    def get_vehicle_world(self, vehicles):
+        """Posisi dunia seluruh armada (V, 2) dalam satu interpolasi batch"""
+        if not vehicles:
+            return np.empty((0, 2), dtype=np.float64)
+
+        fleet = getattr(self.shared, "fleet", None)
+        if fleet is not None and fleet.index is self.shared.graph_index:
+            slots = np.fromiter((v.slot for v in vehicles), dtype=np.int64, count=len(vehicles))
+            return fleet.positions(self.node_xy[self.get_index_rows(fleet.index)], slots)
+
+        row = self.node_row
+        cur = np.fromiter((row[v.current] for v in vehicles), dtype=np.int64, count=len(vehicles))
+        tgt = np.fromiter((row[v.target_node] if v.target_node is not None else row[v.current] for v in vehicles),
+                          dtype=np.int64, count=len(vehicles))
+        progress = np.fromiter((v.progress if v.target_node is not None else 0.0 for v in vehicles),
+                               dtype=np.float64, count=len(vehicles))
+        p1 = self.node_xy[cur]
+        return p1 + (self.node_xy[tgt] - p1) * progress[:, None]
+
+    def get_vehicle_screen(self, vehicles):
+        return self.transform_array(self.get_vehicle_world(vehicles))
 
     def draw_arrow_fast(self, screen, color, x1, y1, x2, y2, width, draw_head=True):
         """
@@ -82,14 +145,35 @@ class GraphViewer:
         pygame.draw.polygon(screen, color, ( (int(p1[0]),int(p1[1])), (int(p2[0]),int(p2[1])), (int(p3[0]),int(p3[1])) ))
 
 
-    def draw_graph(self, screen, G, default_color, edge_color):
+    def draw_graph(self, screen, G, default_color, edge_color, bg_color=(20, 20, 20)):
+        layer_key = (self.scale, self.offset_x, self.offset_y,
+                     getattr(self.shared, "map_version", 0), edge_color, bg_color)
+
+        if self.road_layer is None or self.road_layer.get_size() != (self.WIDTH, self.HEIGHT):
+            self.road_layer = pygame.Surface((self.WIDTH, self.HEIGHT))
+            self._road_layer_key = None
+
+        if layer_key != self._road_layer_key:
+            self._render_road_layer(self.road_layer, G, edge_color, bg_color)
+            self._road_layer_key = layer_key
+
+        screen.blit(self.road_layer, (0, 0))
+
+    def _render_road_layer(self, screen, G, edge_color, bg_color):
+        screen.fill(bg_color)
 
-        # cache coords
-        if not hasattr(self, "_coord_cache"):
-            self._coord_cache = {}
-        self._coord_cache.clear()
-        for n in G.nodes():
-            self._coord_cache[n] = self.transform_cached(n)
+        index = self.shared.graph_index
+        screen_xy = self.get_node_screen()
+
+        node_xy = screen_xy[self.get_index_rows(index)]
+
+        # Culling vectorized: hanya edge yang (sebagian) terlihat yang digambar
+        p1 = node_xy[index.edge_src]
+        p2 = node_xy[index.edge_dst]
+        visible = ~((np.maximum(p1[:, 0], p2[:, 0]) < -15) | (np.minimum(p1[:, 0], p2[:, 0]) > self.WIDTH + 15) |
+                    (np.maximum(p1[:, 1], p2[:, 1]) < -15) | (np.minimum(p1[:, 1], p2[:, 1]) > self.HEIGHT + 15))
+        onscreen_len = np.hypot(*(p2 - p1).T)
+        is_slow = index.slowdown > 0
 
         scale = max(self.scale, 1e-9)
 
@@ -98,28 +182,16 @@ class GraphViewer:
         ARROW_MIN_LEN_PX = 150       # jarak layar minimal untuk munculkan arrow
 
 
-        for u, v in G.edges():
-            x1, y1 = self._coord_cache[u]
-            x2, y2 = self._coord_cache[v]
-
-            # skip if offscreen
-            if (max(x1, x2) < -15 or min(x1, x2) > self.WIDTH + 15 or
-                max(y1, y2) < -15 or min(y1, y2) > self.HEIGHT + 15):
-                continue
-
-            # edge length on screen
-            dx = x2 - x1
-            dy = y2 - y1
-            onscreen_len = (dx*dx + dy*dy) ** 0.5
+        for e in np.flatnonzero(visible).tolist():
+            x1, y1 = p1[e].tolist()
+            x2, y2 = p2[e].tolist()
+            slow = is_slow[e]
 
             # get edge style
-            edge_id = f"{u}-{v}"
-            e = self.shared.edge_type.get(edge_id)
-            is_slow = e and e.get("slowdown", 0) > 0
-            color = (255, 0, 0) if is_slow else edge_color
+            color = (255, 0, 0) if slow else edge_color
 
             # width scales with zoom
-            base_width = 1 if not is_slow else 2
+            base_width = 1 if not slow else 2
             width = max(1, int(base_width * min(1.0, scale * 1.4)))
 
             # -------------------------
@@ -127,20 +199,20 @@ class GraphViewer:
             # -------------------------
             draw_head = (
                 scale >= ARROW_MIN_SCALE and
-                onscreen_len >= ARROW_MIN_LEN_PX
+                onscreen_len[e] >= ARROW_MIN_LEN_PX
             )
 
             # always draw the line
             self.draw_arrow_fast(screen, color, x1, y1, x2, y2, width, draw_head=draw_head)
 
         # ----- draw important nodes only -----
-        for n in G.nodes():
-            x, y = self._coord_cache[n]
-            if not (-10 <= x <= self.WIDTH+10 and -10 <= y <= self.HEIGHT+10):
+        for n, flags in self.shared.node_type.items():
+            row = self.node_row.get(n)
+            if row is None or not flags:
                 continue
 
-            flags = self.shared.node_type.get(n)
-            if not flags:
+            x, y = screen_xy[row].tolist()
+            if not (-10 <= x <= self.WIDTH+10 and -10 <= y <= self.HEIGHT+10):
                 continue
 
             if flags.get("tps"):
@@ -152,28 +224,25 @@ class GraphViewer:
 
 
     def draw_dynamic_objects(self, screen, vehicles):
-        for vehicle in vehicles:
-            x, y = vehicle.get_pos(self.pos)
-            ax, ay = self.transform(x, y)
-            if -6 <= ax <= self.WIDTH + 6 and -6 <= ay <= self.HEIGHT + 6:
-                pygame.draw.circle(screen, (0,255,0), (ax, ay), 6)
+        screen_xy = self.get_vehicle_screen(vehicles)
+        visible = ((screen_xy[:, 0] >= -6) & (screen_xy[:, 0] <= self.WIDTH + 6) &
+                   (screen_xy[:, 1] >= -6) & (screen_xy[:, 1] <= self.HEIGHT + 6))
+        for ax, ay in screen_xy[visible].tolist():
+            pygame.draw.circle(screen, (0,255,0), (ax, ay), 6)
 
     def get_node_at_pos(self, mx, my):
-        for n in self.pos:
-            x, y = self.transform_cached(n)
-            r = 6
-            if abs(mx - x) <= r and abs(my - y) <= r:
-                return n
-        return None
+        r = 6
+        x, y = self.inverse_transform(mx, my)
+        row = self.node_grid.nearest_point(x, y, r / self.scale)
+        return self.node_ids[row] if row >= 0 else None
 
     def get_vehicle_at_pos(self, mx, my, vehicles):
-        for vehicle in vehicles:
-            x, y = vehicle.get_pos(self.pos)
-            ax, ay = self.transform(x, y)
-            r = 8
-            if abs(mx - ax) <= r and abs(my - ay) <= r:
-                return vehicle
-        return None
+        if not vehicles:
+            return None
+        screen_xy = self.get_vehicle_screen(vehicles)
+        r = 8
+        hits = np.flatnonzero((np.abs(screen_xy[:, 0] - mx) <= r) & (np.abs(screen_xy[:, 1] - my) <= r))
+        return vehicles[hits[0]] if len(hits) else None
 
     def get_edge_screen_pos(self, u, v):
         x1, y1 = self.transform_cached(u)
@@ -182,11 +251,17 @@ class GraphViewer:
 
     def get_edge_at_pos(self, mx, my):
         TOL = 5
-        for u, v in self.pos.keys():
-            x1, y1, x2, y2 = self.get_edge_screen_pos(u, v)
-            if self._point_near_line(mx, my, x1, y1, x2, y2, TOL):
-                return (u, v)
-        return None
+        grid = self.get_edge_grid()
+        if grid is None:
+            return None
+
+        x, y = self.inverse_transform(mx, my)
+        e = grid.nearest_segment(x, y, TOL / self.scale)
+        if e < 0:
+            return None
+
+        index = self.shared.graph_index
+        return index.node_of(index.edge_src[e]), index.node_of(index.edge_dst[e])
 
     def _point_near_line(self, px, py, x1, y1, x2, y2, tol):
         if x1 == x2 and y1 == y2:
@@ -281,14 +356,12 @@ class GraphViewer:
 
             return
 
-        if G is not None:
-            for u, v in G.edges():
-                x1, y1, x2, y2 = self.get_edge_screen_pos(u, v)
-                if self._point_near_line(mx, my, x1, y1, x2, y2, tol=5):
-                    print(f"[DEBUG] Edge diklik: {u}-{v}")
-                    edge_id = f"{u}-{v}"
-                    if edge_id not in shared.edge_type:
-                        shared.edge_type[edge_id] = {"slowdown": 0}
-                    if hasattr(shared, "edge_state_window") and shared.edge_state_window:
-                        shared.edge_state_window.set_edge(edge_id, shared.edge_type[edge_id])
-                    break
\ No newline at end of file
+        edge = self.get_edge_at_pos(mx, my)
+        if edge is not None:
+            u, v = edge
+            print(f"[DEBUG] Edge diklik: {u}-{v}")
+            edge_id = f"{u}-{v}"
+            if edge_id not in shared.edge_type:
+                shared.edge_type[edge_id] = {"slowdown": 0}
+            if hasattr(shared, "edge_state_window") and shared.edge_state_window:
+                shared.edge_state_window.set_edge(edge_id, shared.edge_type[edge_id])
\ No newline at end of file
@@ -118,9 +118,7 @@ class EdgeStateWindow:
 
         if self.shared is not None:
             edge_id = settings["edge_id"]
-            self.shared.edge_type[edge_id] = {
-                "slowdown": settings["efek_perlambatan"]
-            }
+            self.shared.set_edge_slowdown(edge_id, settings["efek_perlambatan"])
 
     # =======================
     # MAIN LOOP
@@ -74,6 +74,7 @@ class NodeStateWindow:
             "tpa": self.tpa_var.get(),
             "garage": self.gar_var.get()
         }
+        self.shared.mark_map_dirty()
 
         messagebox.showinfo("Saved", f"Node {node_id} updated")
 
@@ -1,5 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from src.utils.ui_channel import diff_snapshot
 
 
 class ProgramSummaryWindow:
@@ -175,6 +176,8 @@ class ProgramSummaryWindow:
 
     def attach_state(self, shared):
         self.shared = shared
+        self._shown = {}  # nilai yang sedang ditampilkan widget
+        self._shown_version = -1
         self.root.after(200, self.update_from_shared)
 
     def set_refresh_callback(self, callback):
@@ -184,13 +187,26 @@ class ProgramSummaryWindow:
         if not hasattr(self, "shared"): 
             return
 
-        self.set_fps(self.shared.fps)
+        # Poll murah: hanya cek version, widget disentuh jika snapshot baru
+        channel = self.shared.ui_channel
+        version, snapshot = channel.read()
+        if version != self._shown_version:
+            self._shown_version = version
+            self.apply_snapshot(snapshot)
 
-        self.set_simulation_time(
-            self.shared.sim_hour,
-            self.shared.sim_min,
-            self.shared.sim_day
-        )
+        self.root.after(channel.interval_ms, self.update_from_shared)
+
+    def apply_snapshot(self, snapshot):
+        """Update hanya widget yang nilainya berubah"""
+        changed = diff_snapshot(self._shown, snapshot)
+        if not changed:
+            return
+
+        if "fps" in changed:
+            self.set_fps(changed["fps"])
+
+        if changed.keys() & {"sim_hour", "sim_min", "sim_day"}:
+            self.set_simulation_time(snapshot["sim_hour"], snapshot["sim_min"], snapshot["sim_day"])
 
         speed_map = {
             0.25: "0.25x",
@@ -199,23 +215,15 @@ class ProgramSummaryWindow:
             2.0: "2x",
             4.0: "4x",
         }
-        if self.shared.speed in speed_map:
-            self.set_simulation_speed(speed_map[self.shared.speed])
-
-        self.set_pause_state(self.shared.paused)
-
-        if hasattr(self.shared, "node_count"):
-            self.set_stat("node", self.shared.node_count)
-        if hasattr(self.shared, "edge_count"):
-            self.set_stat("edge", self.shared.edge_count)
-        if hasattr(self.shared, "num_tps"):
-            self.set_stat("tps", self.shared.num_tps)
-        if hasattr(self.shared, "num_tpa"):
-            self.set_stat("tpa", self.shared.num_tpa)
-        if hasattr(self.shared, "get_num_vehicle"):
-            self.set_stat("truk", self.shared.total_vehicles)
-
-        self.root.after(1, self.update_from_shared)
+        if "speed" in changed and changed["speed"] in speed_map:
+            self.set_simulation_speed(speed_map[changed["speed"]])
+
+        if "paused" in changed:
+            self.set_pause_state(changed["paused"])
+
+        for key in self.stats_entries:
+            if key in changed:
+                self.set_stat(key, changed[key])
 
 
     def on_refresh(self):